@@ -0,0 +1,86 @@
+"""
+Text cleaning and sentence chunking used by DocumentProcessor.
+
+Kept self-contained and strictly typed so it can be compiled to a C
+extension with mypyc (see backend/scripts/compile_chunker.py). Python
+imports the compiled module automatically when it exists; otherwise this
+file runs as plain Python.
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+# Precompiled patterns/tables used by clean_text
+_WHITESPACE_RE = re.compile(r'\s+')
+_CONTROL_CHARS: Dict[int, Optional[int]] = dict.fromkeys([*range(0x00, 0x20), 0x7F])
+
+# Sentence ending (. ! ?) plus the whitespace after it. No lookbehind, so
+# the pattern also runs on RE2's linear-time DFA engine when installed.
+_SENTENCE_BREAK_RE: Any
+try:
+    import re2
+    _SENTENCE_BREAK_RE = re2.compile(r'[.!?]\s+')
+except ImportError:
+    _SENTENCE_BREAK_RE = re.compile(r'[.!?]\s+')
+
+
+def clean_text(text: str) -> str:
+    """Collapse whitespace and drop non-printable / non-ASCII characters."""
+    # Replace multiple spaces/newlines with single space
+    text = _WHITESPACE_RE.sub(' ', text)
+
+    # Remove non-printable characters but keep punctuation
+    # (skipped entirely for the common all-printable-ASCII case)
+    if not (text.isascii() and text.isprintable()):
+        text = text.encode('ascii', 'ignore').decode('ascii').translate(_CONTROL_CHARS)
+
+    return text.strip()
+
+
+def split_into_chunks(text: str, chunk_size: int) -> List[str]:
+    """Greedily group sentences into chunks of at most `chunk_size` chars."""
+    # If text is short enough, return as-is
+    if len(text) <= chunk_size:
+        return [text]
+
+    # Sentence boundaries as flat [start0, end0, start1, end1, ...] offsets;
+    # punctuation stays with its sentence
+    bounds: List[int] = [0]
+    for match in _SENTENCE_BREAK_RE.finditer(text):
+        bounds.append(match.start() + 1)
+        bounds.append(match.end())
+    bounds.append(len(text))
+
+    # Greedily group sentences, tracking offsets so each chunk is sliced
+    # once instead of being built up with +=
+    chunks: List[str] = []
+    chunk_start = 0
+    chunk_end = 0
+    chunk_len = 0  # length if the chunk's sentences were joined by one space
+
+    for i in range(0, len(bounds), 2):
+        sentence_start = bounds[i]
+        sentence_end = bounds[i + 1]
+        sentence_len = sentence_end - sentence_start
+
+        # Will adding this sentence exceed chunk size?
+        if chunk_len + sentence_len + 1 <= chunk_size:
+            # Add to current chunk
+            if chunk_len:
+                chunk_len += 1 + sentence_len
+            else:
+                chunk_start = sentence_start
+                chunk_len = sentence_len
+            chunk_end = sentence_end
+        else:
+            # Save current chunk and start new one
+            if chunk_len:
+                chunks.append(text[chunk_start:chunk_end].strip())
+            chunk_start = sentence_start
+            chunk_end = sentence_end
+            chunk_len = sentence_len
+
+    # Don't forget the last chunk!
+    if chunk_len:
+        chunks.append(text[chunk_start:chunk_end].strip())
+
+    return chunks
@@ -22,6 +22,9 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "LexiVoice"
+    LLM_DEBUG: bool = False  # Keep raw LLM output in answers
+    STT_SPECULATIVE_FALLBACK: bool = False  # Race every STT language hint (more API calls)
+    THREAD_POOL_WORKERS: int = 32  # asyncio.to_thread pool (retrieval, TTS, DB reads)
     
     # CORS Settings
     ALLOWED_ORIGINS: list = ["*"]  # Allow all for MVP
@@ -1,10 +1,139 @@
 """
 CRUD operations for MongoDB collections (MVP - No Auth).
+
+Read methods return raw documents (with `_id` as an ObjectId);
+main.py registers an ObjectId → str encoder for API responses.
 """
+from pymongo import DESCENDING
 from pymongo.database import Database
-from datetime import datetime
+from pymongo.write_concern import WriteConcern
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any
+from collections import deque
 from bson import ObjectId
+from backend.core.database import (
+    QUERY_LOG_SESSION_INDEX,
+    QUERY_LOG_COUNTRY_INDEX,
+    QUERY_LOG_HASH_INDEX,
+    FEEDBACK_RATING_INDEX,
+)
+import hashlib
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _LogBuffer:
+    """
+    Buffered writer for query logs.
+
+    Logs are appended to an in-memory deque and flushed by a daemon thread
+    with unordered `insert_many` calls (w=0), so the request path never
+    waits on a per-insert acknowledgement.
+
+    At most `max_pending` logs are held: if MongoDB stalls, the oldest
+    are dropped (and counted) rather than growing memory without bound.
+    """
+
+    def __init__(self, max_batch: int = 500, flush_interval: float = 0.25, max_pending: int = 10000):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._docs = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._db = None
+        self._thread = None
+
+    def append(self, db: Database, doc: Dict[str, Any]):
+        """Queue a log document and wake the flusher when a batch is full."""
+        with self._lock:
+            self._db = db
+            if len(self._docs) >= self.max_pending:
+                self._docs.popleft()
+                self.dropped += 1
+            self._docs.append(doc)
+            pending = len(self._docs)
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="query-log-flusher", daemon=True
+                )
+                self._thread.start()
+
+        if pending >= self.max_batch:
+            self._wakeup.set()
+
+    def find(self, oid: ObjectId) -> Optional[Dict]:
+        """Look up a log that is still waiting to be flushed."""
+        with self._lock:
+            for doc in self._docs:
+                if doc["_id"] == oid:
+                    return dict(doc)
+        return None
+
+    def flush(self):
+        """Write all pending logs to MongoDB."""
+        with self._lock:
+            dropped, self.dropped = self.dropped, 0
+            if not self._docs:
+                return
+            batch = list(self._docs)
+            self._docs.clear()
+            db = self._db
+
+        if dropped:
+            logger.warning(f"⚠️ Query log buffer full; dropped {dropped} oldest logs")
+
+        for start in range(0, len(batch), self.max_batch):
+            try:
+                collection = db.get_collection(
+                    "query_logs", write_concern=WriteConcern(w=0)
+                )
+                collection.insert_many(batch[start:start + self.max_batch], ordered=False)
+            except Exception as e:
+                logger.error(f"❌ Query log flush failed: {e}")
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+_log_buffer = _LogBuffer()
+
+
+# Fields returned by get_session_query_logs
+SESSION_LOG_PROJECTION = {
+    "query": 1,
+    "response.answer": 1,
+    "timestamp": 1,
+    "country": 1,
+    "user_language": 1,
+    "processing_time_ms": 1
+}
+
+
+# Stored responses are reused for this long (the retrieval cache's TTL, so
+# an index rebuild is picked up by both at the same time)
+RESPONSE_CACHE_TTL = 900
+
+# Responses logged before this are never served from the cache
+_response_cache_cleared_at = datetime.min.replace(tzinfo=timezone.utc)
+
+
+# Ratings accepted by FeedbackCreate (1-5 stars)
+VALID_RATINGS = [1, 2, 3, 4, 5]
+
+
+def _query_hash(query: str, country: str, user_language: str) -> str:
+    """Stable hash of a normalized query in its country/language context."""
+    normalized = " ".join(query.lower().split())
+    key = f"{country}|{user_language}|{normalized}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
 
 
 class QueryLogCRUD:
@@ -18,66 +147,159 @@ class QueryLogCRUD:
         user_language: str,
         query: str,
         response: Dict[str, Any],
-        processing_time_ms: Optional[float] = None
+        processing_time_ms: Optional[float] = None,
+        cacheable: bool = False
     ) -> str:
-        """Create a new query log."""
+        """
+        Create a new query log.
+
+        The document is queued on the background log buffer and its
+        pre-generated ID is returned immediately. The log reuses the
+        response's timestamp, so both record the same instant.
+
+        Only `cacheable` logs get a `query_hash`, which is what
+        find_cached_response() looks up; pass it for complete answers
+        (documents found, every translation succeeded).
+        """
+        log_id = ObjectId()
         log_doc = {
+            "_id": log_id,
             "session_id": session_id,
             "country": country,
             "user_language": user_language,
             "query": query,
+            "query_hash": _query_hash(query, country, user_language) if cacheable else None,
             "response": response,
-            "timestamp": datetime.utcnow(),
+            "timestamp": response.get("timestamp") or datetime.now(timezone.utc),
             "processing_time_ms": processing_time_ms
         }
         
-        result = db.query_logs.insert_one(log_doc)
-        return str(result.inserted_id)
+        _log_buffer.append(db, log_doc)
+        return str(log_id)
+    
+    @staticmethod
+    def flush():
+        """Flush buffered query logs (call on shutdown)."""
+        _log_buffer.flush()
     
     @staticmethod
     def get_query_log_by_id(db: Database, query_id: str) -> Optional[Dict]:
         """Get query log by ID."""
         try:
-            log = db.query_logs.find_one({"_id": ObjectId(query_id)})
-            if log:
-                log["id"] = str(log["_id"])
-                del log["_id"]
-            return log
+            oid = ObjectId(query_id)
+            # Freshly created logs may still be waiting in the buffer
+            return _log_buffer.find(oid) or db.query_logs.find_one({"_id": oid})
         except Exception as e:
             return None
     
+    @staticmethod
+    def find_cached_response(
+        db: Database,
+        query: str,
+        country: str,
+        user_language: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored response of an identical earlier query, if any.
+
+        Only the newest cacheable response from the last RESPONSE_CACHE_TTL
+        seconds (and since the last clear_response_cache()) is returned.
+        """
+        oldest = datetime.now(timezone.utc) - timedelta(seconds=RESPONSE_CACHE_TTL)
+        log = db.query_logs.find_one(
+            {
+                "query_hash": _query_hash(query, country, user_language),
+                "timestamp": {"$gte": max(oldest, _response_cache_cleared_at)}
+            },
+            projection={"response": 1},
+            sort=[("timestamp", DESCENDING)],
+            hint=QUERY_LOG_HASH_INDEX
+        )
+        return log["response"] if log else None
+    
+    @staticmethod
+    def clear_response_cache(db: Database) -> int:
+        """
+        Stop serving every response stored so far from the cache.
+
+        Returns:
+            Number of logs un-marked in MongoDB
+        """
+        global _response_cache_cleared_at
+        _response_cache_cleared_at = datetime.now(timezone.utc)
+        # The cutoff covers this process; un-marking the logs covers other
+        # workers and restarts (older logs are past the TTL already)
+        _log_buffer.flush()
+        result = db.query_logs.update_many(
+            {
+                "query_hash": {"$ne": None},
+                "timestamp": {"$gte": _response_cache_cleared_at - timedelta(seconds=RESPONSE_CACHE_TTL)}
+            },
+            {"$set": {"query_hash": None}}
+        )
+        return result.modified_count
+    
     @staticmethod
     def get_session_query_logs(
         db: Database,
         session_id: str,
         limit: int = 50
     ) -> List[Dict]:
-        """Get recent query logs for a session."""
+        """
+        Get recent query logs for a session.
+        
+        Only the fields needed for a history view are returned
+        (the full stored response can be several KB per log).
+        """
         cursor = db.query_logs.find(
-            {"session_id": session_id}
-        ).sort("timestamp", -1).limit(limit)
+            {"session_id": session_id},
+            projection=SESSION_LOG_PROJECTION,
+            batch_size=limit
+        ).sort("timestamp", -1).limit(limit).hint(QUERY_LOG_SESSION_INDEX)
+        
+        return list(cursor)
+    
+    @staticmethod
+    def get_query_stats(db: Database) -> Dict[str, Any]:
+        """Total query count and per-country breakdown."""
+        # One round-trip: the per-country counts also give the total, and
+        # projecting only `country` keeps this a covered country-index scan
+        pipeline = [
+            {"$project": {"_id": 0, "country": 1}},
+            {"$group": {"_id": "$country", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ]
         
-        logs = []
-        for log in cursor:
-            log["id"] = str(log["_id"])
-            del log["_id"]
-            logs.append(log)
+        country_stats = list(db.query_logs.aggregate(pipeline, hint=QUERY_LOG_COUNTRY_INDEX))
         
-        return logs
+        return {
+            "total_queries": sum(item["count"] for item in country_stats),
+            "queries_by_country": [
+                {"country": item["_id"], "count": item["count"]}
+                for item in country_stats
+            ]
+        }
     
     @staticmethod
     def get_country_stats(db: Database, country: str) -> Dict[str, Any]:
         """Get statistics for a specific country."""
-        total_queries = db.query_logs.count_documents({"country": country})
-        
-        # Average processing time
+        # Count + average processing time in one round-trip,
+        # sharing the (covered) country index scan
         pipeline = [
-            {"$match": {"country": country, "processing_time_ms": {"$exists": True}}},
-            {"$group": {"_id": None, "avg_time": {"$avg": "$processing_time_ms"}}}
+            {"$match": {"country": country}},
+            {"$facet": {
+                "total": [{"$count": "n"}],
+                "avg": [
+                    {"$match": {"processing_time_ms": {"$exists": True}}},
+                    {"$group": {"_id": None, "avg_time": {"$avg": "$processing_time_ms"}}}
+                ]
+            }}
         ]
         
-        avg_result = list(db.query_logs.aggregate(pipeline))
-        avg_time = avg_result[0]["avg_time"] if avg_result else 0
+        result = list(db.query_logs.aggregate(pipeline, hint=QUERY_LOG_COUNTRY_INDEX))
+        facets = result[0] if result else {}
+        total_queries = facets["total"][0]["n"] if facets.get("total") else 0
+        avg_time = facets["avg"][0]["avg_time"] if facets.get("avg") else 0
         
         return {
             "country": country,
@@ -105,7 +327,7 @@ class FeedbackCRUD:
             "user_language": user_language,
             "rating": rating,
             "comment": comment,
-            "created_at": datetime.utcnow()
+            "created_at": datetime.now(timezone.utc)
         }
         
         result = db.feedback.insert_one(feedback_doc)
@@ -114,11 +336,7 @@ class FeedbackCRUD:
     @staticmethod
     def get_feedback_by_query_id(db: Database, query_id: str) -> Optional[Dict]:
         """Get feedback for a specific query."""
-        feedback = db.feedback.find_one({"query_id": query_id})
-        if feedback:
-            feedback["id"] = str(feedback["_id"])
-            del feedback["_id"]
-        return feedback
+        return db.feedback.find_one({"query_id": query_id})
     
     @staticmethod
     def get_average_rating(db: Database) -> float:
@@ -133,17 +351,27 @@ class FeedbackCRUD:
     @staticmethod
     def get_feedback_stats(db: Database) -> Dict[str, Any]:
         """Get overall feedback statistics."""
-        total_feedback = db.feedback.count_documents({})
-        avg_rating = FeedbackCRUD.get_average_rating(db)
-        
-        # Rating distribution
+        # Count, average and rating distribution in one round-trip.
+        # The $match/$project before $facet make this a covered scan of
+        # the rating index ($facet sub-pipelines can't use indexes).
         pipeline = [
-            {"$group": {"_id": "$rating", "count": {"$sum": 1}}},
-            {"$sort": {"_id": 1}}
+            {"$match": {"rating": {"$in": VALID_RATINGS}}},
+            {"$project": {"_id": 0, "rating": 1}},
+            {"$facet": {
+                "total": [{"$count": "n"}],
+                "avg": [{"$group": {"_id": None, "avg_rating": {"$avg": "$rating"}}}],
+                "distribution": [{"$sortByCount": "$rating"}]
+            }}
         ]
         
-        distribution = list(db.feedback.aggregate(pipeline))
-        rating_dist = {item["_id"]: item["count"] for item in distribution}
+        result = list(db.feedback.aggregate(pipeline, hint=FEEDBACK_RATING_INDEX))
+        facets = result[0] if result else {}
+        total_feedback = facets["total"][0]["n"] if facets.get("total") else 0
+        avg_rating = round(facets["avg"][0]["avg_rating"], 2) if facets.get("avg") else 0.0
+        rating_dist = {
+            item["_id"]: item["count"]
+            for item in sorted(facets.get("distribution", []), key=lambda item: item["_id"])
+        }
         
         return {
             "total_feedback": total_feedback,
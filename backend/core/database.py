@@ -10,6 +10,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Index keys shared with crud.py so aggregations can `hint` them
+QUERY_LOG_SESSION_INDEX = [("session_id", ASCENDING), ("timestamp", DESCENDING)]
+QUERY_LOG_COUNTRY_INDEX = [("country", ASCENDING), ("processing_time_ms", ASCENDING)]
+QUERY_LOG_HASH_INDEX = [("query_hash", ASCENDING), ("timestamp", DESCENDING)]
+FEEDBACK_RATING_INDEX = [("rating", ASCENDING)]
+
 
 class Database:
     """MongoDB database manager using pymongo."""
@@ -21,10 +27,19 @@ class Database:
     def connect_db(cls):
         """Connect to MongoDB."""
         try:
+            # Pool sized for FastAPI concurrency; wire compression falls back
+            # to uncompressed if the zstd/snappy modules aren't installed
             cls.client = MongoClient(
                 settings.MONGODB_URI,
                 serverSelectionTimeoutMS=5000,
-                connectTimeoutMS=5000
+                connectTimeoutMS=5000,
+                maxPoolSize=200,
+                minPoolSize=10,
+                maxConnecting=8,
+                maxIdleTimeMS=60000,
+                retryWrites=True,
+                compressors="zstd,snappy",
+                appname=settings.PROJECT_NAME
             )
             
             # Test connection
@@ -55,14 +70,19 @@ class Database:
         """Create database indexes for performance."""
         try:
             # QueryLog collection indexes
-            cls.db.query_logs.create_index([("session_id", ASCENDING)])
-            cls.db.query_logs.create_index([("country", ASCENDING)])
+            # Compound indexes also serve queries on their leading field,
+            # so they replace the single-field session_id/country indexes
+            cls.db.query_logs.create_index(QUERY_LOG_SESSION_INDEX)
+            cls.db.query_logs.create_index(QUERY_LOG_COUNTRY_INDEX)
             cls.db.query_logs.create_index([("timestamp", DESCENDING)])
+            # Not unique: repeated queries are still logged individually
+            cls.db.query_logs.create_index(QUERY_LOG_HASH_INDEX)
             
             # Feedback collection indexes
             cls.db.feedback.create_index([("query_id", ASCENDING)])
             cls.db.feedback.create_index([("session_id", ASCENDING)])
             cls.db.feedback.create_index([("created_at", DESCENDING)])
+            cls.db.feedback.create_index(FEEDBACK_RATING_INDEX)
             
             logger.info("✅ Database indexes created")
         except Exception as e:
@@ -8,15 +8,28 @@ Key Concepts:
 - Metadata: Extra info about each chunk (title, source, country)
 """
 import json
-import re
+import os
 from typing import List, Dict
 from dataclasses import dataclass
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import logging
 
+from backend.core import chunker
+
 logger = logging.getLogger(__name__)
 
+# orjson parses the law files several times faster; fall back to stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Below this many documents a process pool costs more than it saves
+PARALLEL_MIN_DOCUMENTS = 1000
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocumentChunk:
     """
     A piece of a document with its metadata.
@@ -69,8 +82,12 @@ class DocumentProcessor:
         file_path = f"backend/data/laws/{country}.json"
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                documents = json.load(f)
+            if orjson is not None:
+                with open(file_path, 'rb') as f:
+                    documents = orjson.loads(f.read())
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    documents = json.load(f)
             
             logger.info(f"✅ Loaded {len(documents)} documents for {country}")
             return documents
@@ -78,7 +95,7 @@ class DocumentProcessor:
         except FileNotFoundError:
             logger.error(f"❌ File not found: {file_path}")
             raise
-        except json.JSONDecodeError as e:
+        except ValueError as e:  # json/orjson decode errors subclass ValueError
             logger.error(f"❌ Invalid JSON in {file_path}: {e}")
             raise
     
@@ -94,13 +111,7 @@ class DocumentProcessor:
         Example:
             "Hello    world  \n  test" → "Hello world test"
         """
-        # Replace multiple spaces/newlines with single space
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove non-printable characters but keep punctuation
-        text = re.sub(r'[^\x20-\x7E]', '', text)
-        
-        return text.strip()
+        return chunker.clean_text(text)
     
     def split_into_chunks(self, text: str) -> List[str]:
         """
@@ -121,32 +132,11 @@ class DocumentProcessor:
             chunks = split_into_chunks(text)
             # Might return: ["First sentence. Second sentence.", "Third sentence."]
         """
-        # If text is short enough, return as-is
-        if len(text) <= self.chunk_size:
-            return [text]
-        
-        # Split by sentence endings (. ! ?)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        
-        chunks = []
-        current_chunk = ""
-        
-        for sentence in sentences:
-            # Will adding this sentence exceed chunk size?
-            if len(current_chunk) + len(sentence) + 1 <= self.chunk_size:
-                # Add to current chunk
-                current_chunk += (" " + sentence if current_chunk else sentence)
-            else:
-                # Save current chunk and start new one
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence
-        
-        # Don't forget the last chunk!
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks
+        return chunker.split_into_chunks(text, self.chunk_size)
+    
+    def _clean_and_split(self, content: str) -> List[str]:
+        """Clean one document's content and split it into chunk texts."""
+        return self.split_into_chunks(self.clean_text(content))
     
     def process_documents(self, documents: List[Dict]) -> List[DocumentChunk]:
         """
@@ -163,28 +153,30 @@ class DocumentProcessor:
         Returns:
             List of DocumentChunk objects ready for embedding
         """
-        all_chunks = []
-        
-        for doc in documents:
-            # Clean the content
-            clean_content = self.clean_text(doc['content'])
-            
-            # Split into chunks
-            text_chunks = self.split_into_chunks(clean_content)
-            
-            # Create DocumentChunk objects with metadata
-            for idx, text in enumerate(text_chunks):
-                chunk = DocumentChunk(
-                    text=text,
-                    title=doc['title'],
-                    section=doc.get('section', ''),
-                    source_url=doc.get('source_url', ''),
-                    country=doc['country'],
-                    category=doc['category'],
-                    chunk_id=idx,
-                    total_chunks=len(text_chunks)
-                )
-                all_chunks.append(chunk)
+        contents = [doc['content'] for doc in documents]
+        
+        # Clean + split each document (across CPU cores for large corpora)
+        if len(documents) >= PARALLEL_MIN_DOCUMENTS and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+                chunked_contents = list(pool.map(self._clean_and_split, contents, chunksize=8))
+        else:
+            chunked_contents = [self._clean_and_split(content) for content in contents]
+        
+        # Create DocumentChunk objects with metadata
+        all_chunks = [
+            DocumentChunk(
+                text=text,
+                title=doc['title'],
+                section=doc.get('section', ''),
+                source_url=doc.get('source_url', ''),
+                country=doc['country'],
+                category=doc['category'],
+                chunk_id=idx,
+                total_chunks=len(text_chunks)
+            )
+            for doc, text_chunks in zip(documents, chunked_contents)
+            for idx, text in enumerate(text_chunks)
+        ]
         
         logger.info(f"✅ Created {len(all_chunks)} chunks from {len(documents)} documents")
         return all_chunks
@@ -201,28 +193,32 @@ class DocumentProcessor:
         if not chunks:
             return {}
         
-        chunk_lengths = [len(c.text) for c in chunks]
+        # Single pass over the chunks
+        total_length = 0
+        min_length = max_length = len(chunks[0].text)
+        titles = set()
+        country_counts = Counter()
+        category_counts = Counter()
+        
+        for chunk in chunks:
+            length = len(chunk.text)
+            total_length += length
+            if length < min_length:
+                min_length = length
+            elif length > max_length:
+                max_length = length
+            titles.add(chunk.title)
+            country_counts[chunk.country] += 1
+            category_counts[chunk.category] += 1
         
         stats = {
             'total_chunks': len(chunks),
-            'total_documents': len(set(c.title for c in chunks)),
-            'avg_chunk_length': sum(chunk_lengths) / len(chunk_lengths),
-            'min_chunk_length': min(chunk_lengths),
-            'max_chunk_length': max(chunk_lengths),
-            'chunks_by_country': {},
-            'chunks_by_category': {}
+            'total_documents': len(titles),
+            'avg_chunk_length': total_length / len(chunks),
+            'min_chunk_length': min_length,
+            'max_chunk_length': max_length,
+            'chunks_by_country': dict(country_counts),
+            'chunks_by_category': dict(category_counts)
         }
         
-        # Count chunks per country
-        for chunk in chunks:
-            country = chunk.country
-            stats['chunks_by_country'][country] = \
-                stats['chunks_by_country'].get(country, 0) + 1
-        
-        # Count chunks per category
-        for chunk in chunks:
-            category = chunk.category
-            stats['chunks_by_category'][category] = \
-                stats['chunks_by_category'].get(category, 0) + 1
-        
         return stats
\ No newline at end of file
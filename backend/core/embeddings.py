@@ -13,17 +13,45 @@ Model: all-MiniLM-L6-v2
 - Quality: Good for our use case
 """
 from sentence_transformers import SentenceTransformer
+from tqdm.auto import tqdm
 import numpy as np
-from typing import List
+from typing import Callable, List, Optional
+from functools import lru_cache
 import logging
+import threading
 import os  # added for local model loading
 
 logger = logging.getLogger(__name__)
 
+# Optional ONNX Runtime backend (int8 quantized). Falls back to the
+# PyTorch SentenceTransformer if optimum/onnxruntime aren't installed.
+try:
+    import onnxruntime as ort
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError as import_exc:
+    ONNX_AVAILABLE = False
+    logger.debug(f"ONNX Runtime backend unavailable: {import_exc}")
+
 # Local directory for storing the model (downloaded once)
 # NEW: This ensures the model is only downloaded the first time.
 LOCAL_MODEL_PATH = "backend/models/e5-large"
 
+# Dynamic batching: cap padded tokens per batch rather than texts per batch,
+# so short texts are encoded in large batches and long ones in small ones
+MAX_TOKENS_PER_BATCH = 4096
+MAX_BATCH_SIZE = 128
+MAX_SEQ_LENGTH = 512
+
+# Texts encoded per window when streaming results to a sink
+STREAM_WINDOW = 1024
+
+# Quantized ONNX export (created once from the HuggingFace model)
+ONNX_MODEL_PATH = os.path.join(LOCAL_MODEL_PATH, "onnx-int8")
+ONNX_MODEL_FILE = "model_quantized.onnx"
+
 
 class EmbeddingModel:
     """
@@ -43,6 +71,24 @@ class EmbeddingModel:
         
         First run will download ~500MB model (one-time only)
         """
+        self.model_name = model_name
+        self.model = None
+        self.session = None
+        self.tokenizer = None
+
+        # Prefer the int8 ONNX model on CPU (~3-4x faster encoding)
+        if ONNX_AVAILABLE:
+            try:
+                self._load_onnx_model(model_name)
+            except Exception as e:
+                logger.warning(f"⚠️ ONNX model unavailable, using PyTorch model: {e}")
+                self.session = None
+                self.tokenizer = None
+
+        if self.session is not None:
+            logger.info(f"   Embedding dimension: {self.dimension}")
+            logger.info(f"   Model ready for inference (ONNX int8).")
+            return
 
         # NEW LOGIC: Load from local folder if exists
         if os.path.exists(LOCAL_MODEL_PATH):
@@ -72,17 +118,85 @@ class EmbeddingModel:
         logger.info(f"   Embedding dimension: {self.dimension}")
         logger.info(f"   Model ready for inference.")
     
-    def encode_texts(self, texts: List[str], show_progress: bool = True) -> np.ndarray:
+    def _load_onnx_model(self, model_name: str):
+        """
+        Load the int8 ONNX model, exporting and quantizing it on first run.
+        
+        The quantized model is cached under ONNX_MODEL_PATH so the export
+        only happens once.
+        """
+        onnx_file = os.path.join(ONNX_MODEL_PATH, ONNX_MODEL_FILE)
+
+        if not os.path.exists(onnx_file):
+            logger.info(f"⚙️ Exporting {model_name} to ONNX + int8 (one-time)…")
+            export_dir = os.path.join(LOCAL_MODEL_PATH, "onnx-fp32")
+
+            ort_model = ORTModelForFeatureExtraction.from_pretrained(
+                model_name, export=True, cache_dir=LOCAL_MODEL_PATH
+            )
+            ort_model.save_pretrained(export_dir)
+
+            # Dynamic int8 quantization (VNNI dot-products on AVX-512 CPUs)
+            quantizer = ORTQuantizer.from_pretrained(export_dir)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=ONNX_MODEL_PATH, quantization_config=qconfig)
+
+            tokenizer = AutoTokenizer.from_pretrained(model_name, cache_dir=LOCAL_MODEL_PATH)
+            tokenizer.save_pretrained(ONNX_MODEL_PATH)
+            logger.info(f"✅ Quantized model saved: {onnx_file}")
+
+        logger.info(f"📦 Loading ONNX int8 embedding model: {onnx_file}")
+        self.tokenizer = AutoTokenizer.from_pretrained(ONNX_MODEL_PATH)
+        self.session = ort.InferenceSession(onnx_file, providers=["CPUExecutionProvider"])
+        self._session_inputs = {i.name for i in self.session.get_inputs()}
+
+        # Probe the output width once instead of parsing the model config
+        self.dimension = self._onnx_encode(["dimension probe"], batch_size=1).shape[1]
+
+    def _onnx_encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Encode texts with ONNX Runtime: tokenize → run → mean-pool → L2-normalize.
+        """
+        outputs = []
+
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            inputs = self.tokenizer(
+                batch, padding=True, truncation=True, max_length=512, return_tensors="np"
+            )
+            feed = {
+                name: inputs[name].astype(np.int64)
+                for name in self._session_inputs if name in inputs
+            }
+            hidden = self.session.run(None, feed)[0]
+
+            # Mean pooling over non-padding tokens (same as the e5 sentence-transformer)
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            outputs.append(pooled.astype(np.float32))
+
+        return np.vstack(outputs)
+    
+    def encode_texts(
+        self,
+        texts: List[str],
+        show_progress: bool = True,
+        sink: Optional[Callable[[np.ndarray, slice], None]] = None
+    ) -> Optional[np.ndarray]:
         """
         Convert multiple texts to embeddings.
         
         Args:
             texts: List of text strings
             show_progress: Show progress bar during encoding
+            sink: Optional callback receiving (embeddings, rows) for each
+                  consecutive window of texts. When given, results are
+                  streamed to it and the full array is never built.
             
         Returns:
             numpy array of shape (len(texts), 384)
-            Each row is one text's embedding
+            Each row is one text's embedding (None when streaming to `sink`)
         
         Example:
             texts = ["Hello world", "Legal document"]
@@ -91,17 +205,70 @@ class EmbeddingModel:
         """
         logger.info(f"🧠 Encoding {len(texts)} texts into embeddings...")
         
-        embeddings = self.model.encode(
-            texts,
-            batch_size=32,  # Process 32 texts at a time
-            show_progress_bar=show_progress,
-            convert_to_numpy=True,
-            normalize_embeddings=True  # Normalize for cosine similarity
-        )
+        if sink is None:
+            embeddings = self._encode_bucketed(texts, show_progress)
+            logger.info(f"✅ Encoded {len(texts)} texts → {embeddings.shape}")
+            return embeddings
+        
+        for start in tqdm(range(0, len(texts), STREAM_WINDOW), disable=not show_progress):
+            end = min(start + STREAM_WINDOW, len(texts))
+            sink(self._encode_bucketed(texts[start:end], show_progress=False), slice(start, end))
+        
+        logger.info(f"✅ Encoded {len(texts)} texts (streamed)")
+        return None
+    
+    def _encode_bucketed(self, texts: List[str], show_progress: bool) -> np.ndarray:
+        """Encode texts in length buckets and return them in input order."""
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        
+        # Encode similar-length texts together, then scatter back to input order
+        for bucket in tqdm(self._length_buckets(texts), disable=not show_progress):
+            batch = [texts[i] for i in bucket]
+            
+            if self.session is not None:
+                embeddings[bucket] = self._onnx_encode(batch, batch_size=len(batch))
+            else:
+                embeddings[bucket] = self.model.encode(
+                    batch,
+                    batch_size=len(batch),
+                    show_progress_bar=False,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True  # Normalize for cosine similarity
+                )
         
-        logger.info(f"✅ Encoded {len(texts)} texts → {embeddings.shape}")
         return embeddings
     
+    def _length_buckets(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Group text indices into batches of similar token length.
+        
+        Each batch holds at most MAX_BATCH_SIZE texts and at most
+        MAX_TOKENS_PER_BATCH tokens once padded to its longest text.
+        """
+        tokenizer = self.tokenizer if self.session is not None else self.model.tokenizer
+        token_counts = np.array(
+            [len(ids) for ids in tokenizer(texts, truncation=True, max_length=MAX_SEQ_LENGTH)["input_ids"]]
+        ) if texts else np.array([], dtype=int)
+        
+        buckets = []
+        current = []
+        
+        # Longest first, so each batch's first text sets its padded length
+        for idx in np.argsort(-token_counts, kind="stable"):
+            padded_len = token_counts[current[0]] if current else token_counts[idx]
+            if current and (
+                len(current) >= MAX_BATCH_SIZE
+                or (len(current) + 1) * padded_len > MAX_TOKENS_PER_BATCH
+            ):
+                buckets.append(np.array(current))
+                current = []
+            current.append(idx)
+        
+        if current:
+            buckets.append(np.array(current))
+        
+        return buckets
+    
     def encode_single(self, text: str) -> np.ndarray:
         """
         Convert a single text to embedding.
@@ -117,21 +284,39 @@ class EmbeddingModel:
             embedding = model.encode_single(text)
             # embedding.shape = (384,)
         """
-        embedding = self.model.encode(
-            [text],
-            convert_to_numpy=True,
-            normalize_embeddings=True
-        )[0]
+        # Repeated user queries hit the LRU instead of the model
+        return self._encode_single_cached(" ".join(text.split()))
+    
+    @lru_cache(maxsize=4096)
+    def _encode_single_cached(self, text: str) -> np.ndarray:
+        """Encode one (whitespace-normalized) text; results are cached."""
+        if self.session is not None:
+            embedding = self._onnx_encode([text], batch_size=1)[0]
+        else:
+            embedding = self.model.encode(
+                [text],
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )[0]
         
+        # Shared between callers, so guard against in-place edits
+        embedding.setflags(write=False)
         return embedding
     
     def get_dimension(self) -> int:
         """Get embedding dimension (384 for MiniLM)."""
         return self.dimension
+    
+    @property
+    def backend_id(self) -> str:
+        """Identifies the encoder (backend + model); vectors from different ones aren't interchangeable."""
+        backend = 'onnx-int8' if self.session is not None else 'st'
+        return f"{backend}:{self.model_name}"
 
 
 # Global model instance (lazy loading)
 _embedding_model_instance = None
+_embedding_model_lock = threading.Lock()
 
 
 def get_embedding_model() -> EmbeddingModel:
@@ -147,7 +332,23 @@ def get_embedding_model() -> EmbeddingModel:
     global _embedding_model_instance
     
     if _embedding_model_instance is None:
-        logger.info("🔄 Initializing global embedding model...")
-        _embedding_model_instance = EmbeddingModel()
+        # Double-checked so concurrent first requests load the model only once
+        with _embedding_model_lock:
+            if _embedding_model_instance is None:
+                logger.info("🔄 Initializing global embedding model...")
+                _embedding_model_instance = EmbeddingModel()
     
     return _embedding_model_instance
+
+
+def preload_embedding_model() -> EmbeddingModel:
+    """
+    Load the global embedding model and run a warmup encode.
+    
+    Called at app startup so the first user request doesn't pay
+    the model load or first-inference cost.
+    """
+    model = get_embedding_model()
+    model.encode_single("warmup")
+    logger.info("✅ Embedding model warmed up")
+    return model
@@ -0,0 +1,66 @@
+"""
+Process-wide pooled HTTP client.
+
+The Groq SDK clients (LLM and STT) and the translator send their requests
+through this one httpx.AsyncClient, so they share a single keep-alive pool:
+the LLM and Whisper calls reuse the same warm connections to the Groq API,
+and no handler holds idle sockets of its own.
+"""
+from typing import Optional
+import logging
+import threading
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 (needs the h2 package) multiplexes concurrent requests to one host
+# over a single connection instead of one connection per in-flight request
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+# Sized for the LLM batcher, the busiest user; callers pass their own
+# per-request timeouts (the Groq SDK always does)
+HTTP_MAX_CONNECTIONS = 1000
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 100
+HTTP_KEEPALIVE_EXPIRY = 60
+HTTP_DEFAULT_TIMEOUT = 60.0
+
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get or create the shared HTTP client.
+
+    Returns:
+        Singleton httpx.AsyncClient (closed by close_http_client() on shutdown)
+    """
+    global _http_client
+    if _http_client is None:
+        # Double-checked so concurrent first callers open one pool
+        with _http_client_lock:
+            if _http_client is None:
+                logger.info(f"🔄 Creating shared HTTP client (HTTP/2: {HTTP2_ENABLED})...")
+                _http_client = httpx.AsyncClient(
+                    http2=HTTP2_ENABLED,
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                    ),
+                    timeout=HTTP_DEFAULT_TIMEOUT
+                )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client's connections (app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -10,23 +10,312 @@ Key Features:
 
 Model: llama-3.1-70b-versatile (Groq's best for reasoning)
 """
-from groq import Groq
-from typing import List, Dict, Optional
+from groq import AsyncGroq
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from collections import OrderedDict
+import asyncio
 import json
 import logging
+import re
+import sys
+import threading
+import httpx
+import faiss
+import numpy as np
 from backend.core.config import settings
+from backend.core.embeddings import EmbeddingModel, get_embedding_model
+from backend.core.http_client import get_http_client
+
+# orjson parses LLM responses faster; fall back to stdlib json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Semantic answer cache: a paraphrased question is answered from cache only
+# if its embedding is this similar (cosine) and retrieval found the same
+# top document. Kept conservative since these are legal answers.
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_SIZE = 1024  # entries per country
+
+# Request coalescing: concurrent Groq calls arriving within this window are
+# dispatched together (up to BATCH_MAX_SIZE per batch)
+BATCH_WINDOW_SECONDS = 0.010
+BATCH_MAX_SIZE = 32
+
+# Model tiers: most questions go to the fast 8b model; long/multi-part
+# questions, and 8b answers that come back weak, use the 70b model
+MODEL_TIERS = {
+    'instant': "llama-3.1-8b-instant",
+    'balanced': "llama-3.3-70b-versatile",
+}
+COMPLEX_QUERY_MIN_CHARS = 200
+
+
+# System message sent with every request (byte-identical, so cacheable).
+# The role lives only here; the user prompt carries the country specifics.
+SYSTEM_PROMPT = "You are a legal information assistant. Provide accurate, well-sourced answers based on legal documents. Always respond in valid JSON format."
+_SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+
+_PREAMBLE_TEMPLATE = """JURISDICTION: {country} law. Provide accurate, helpful answers based ONLY on the provided legal documents.
+
+INSTRUCTIONS:
+1. Answer the USER QUESTION at the end using ONLY the information provided in the LEGAL CONTEXT below
+2. If the context doesn't contain enough information, say "I don't have enough information to answer this question based on the provided documents"
+3. Cite specific laws, sections, and acts when possible
+4. Be concise but thorough
+5. Use simple language that non-lawyers can understand
+
+IMPORTANT: You must respond in the following JSON format:
+{{
+    "answer": "Your clear, direct answer to the question",
+    "reasoning": "Explain which laws and sections support this answer",
+    "sources": ["List of specific law titles or sections cited"],
+    "confidence": "high/medium/low based on how well the context supports the answer"
+}}
+
+Respond ONLY with valid JSON, no additional text before or after."""
+
+
+def _build_preamble(country: str) -> str:
+    """Static (cacheable) prompt prefix for a country."""
+    # Interned: every prompt for a country starts from the same object
+    return sys.intern(_PREAMBLE_TEMPLATE.format(country=country.upper()))
+
+
+# Pre-built prefixes for the supported countries; any other country's
+# prefix is built once on first use and kept here too
+_STATIC_PREAMBLES = {country: _build_preamble(country) for country in ("india", "canada", "usa")}
+
+# Full prompt and per-document context layouts, filled with one format call
+_PROMPT_TEMPLATE = """{preamble}
+
+LEGAL CONTEXT:
+{context}
+
+USER QUESTION:
+{query}"""
+
+_DOC_TEMPLATE = """
+Document {i}:
+Title: {title}
+Section: {section}
+Category: {category}
+Content: {text}
+"""
+
+# Defaults for missing chunk fields
+UNKNOWN = "Unknown"
+NOT_AVAILABLE = "N/A"
+GENERAL = "general"
+NO_DOCUMENTS = "No relevant documents found."
+
+
+class _AnswerFieldExtractor:
+    """
+    Incrementally pulls the "answer" string out of a JSON object that
+    arrives in pieces (a streamed LLM response).
+    
+    feed() returns the newly decoded answer text, holding back any escape
+    sequence that is split across pieces until it is complete.
+    """
+    
+    _START_RE = re.compile(r'"answer"\s*:\s*"')
+    
+    def __init__(self):
+        self._buffer = ""
+        self._pos = None  # Buffer index of the next undecoded answer char
+        self._done = False
+    
+    def feed(self, piece: str) -> str:
+        if self._done:
+            return ""
+        
+        self._buffer += piece
+        if self._pos is None:
+            match = self._START_RE.search(self._buffer)
+            if match is None:
+                return ""
+            self._pos = match.end()
+        
+        buffer = self._buffer
+        start = end = self._pos
+        while end < len(buffer):
+            char = buffer[end]
+            if char == '"':
+                self._done = True
+                break
+            if char == '\\':
+                step = self._escape_length(buffer, end)
+                if step is None:
+                    break  # Rest of the escape hasn't arrived yet
+                end += step
+            else:
+                end += 1
+        
+        self._pos = end + 1 if self._done else end
+        if end == start:
+            return ""
+        return json.loads('"' + buffer[start:end] + '"')
+    
+    @staticmethod
+    def _escape_length(buffer: str, i: int) -> Optional[int]:
+        """Length of the escape sequence at buffer[i], or None if incomplete."""
+        if i + 1 >= len(buffer):
+            return None
+        if buffer[i + 1] != 'u':
+            return 2
+        if i + 6 > len(buffer):
+            return None
+        # A high surrogate must be decoded together with its low half
+        if 0xD800 <= int(buffer[i + 2:i + 6], 16) <= 0xDBFF:
+            return 12 if i + 12 <= len(buffer) else None
+        return 6
+
+
+class GroqBatcher:
+    """
+    DataLoader-style coalescing queue for Groq chat completions.
+    
+    Callers `await submit(**params)`; a background task collects requests
+    for a short window and dispatches each batch concurrently over the
+    client's shared connection pool.
+    """
+    
+    def __init__(self, client: AsyncGroq, window: float = BATCH_WINDOW_SECONDS,
+                 max_batch_size: int = BATCH_MAX_SIZE):
+        self.client = client
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # The loop only holds weak references to tasks: keep dispatches
+        # alive until done, or their callers' futures may never resolve
+        self._inflight: set = set()
+    
+    async def submit(self, **params):
+        """Queue one chat completion request and wait for its response."""
+        # The queue/worker belong to the running event loop; (re)start lazily
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((params, future))
+        return await future
+    
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            
+            # A lone request goes out at once; under load, collect whatever
+            # else arrives within the window
+            if not self._queue.empty():
+                await asyncio.sleep(self.window)
+                while len(batch) < self.max_batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+            
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _dispatch(self, batch: list):
+        results = await asyncio.gather(
+            *(self.client.chat.completions.create(**params) for params, _ in batch),
+            return_exceptions=True
+        )
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():  # caller was cancelled
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class _SemanticAnswerCache:
+    """
+    Per-country LRU cache of LLM answers keyed by query embedding.
+    
+    Each country has a FAISS inner-product index (cosine on normalized
+    vectors) with explicit IDs, so least-recently-used entries can be
+    evicted from both the index and the answer store.
+    """
+    
+    def __init__(self, dimension: int, max_size: int = SEMANTIC_CACHE_SIZE,
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        self.dimension = dimension
+        self.max_size = max_size
+        self.threshold = threshold
+        self._indexes: Dict[str, faiss.IndexIDMap2] = {}
+        self._entries: Dict[str, "OrderedDict[int, Tuple[tuple, Dict]]"] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+    
+    def get(self, country: str, query_embedding: np.ndarray, top_chunk: tuple) -> Optional[Dict]:
+        """Return a cached answer for a near-identical query, if any."""
+        with self._lock:
+            index = self._indexes.get(country)
+            if index is None or index.ntotal == 0:
+                return None
+            
+            scores, ids = index.search(query_embedding, 1)
+            entry_id = int(ids[0][0])
+            if entry_id < 0 or scores[0][0] < self.threshold:
+                return None
+            
+            entries = self._entries[country]
+            cached_top_chunk, answer = entries[entry_id]
+            if cached_top_chunk != top_chunk:
+                return None
+            
+            entries.move_to_end(entry_id)
+            return dict(answer)
+    
+    def put(self, country: str, query_embedding: np.ndarray, top_chunk: tuple, answer: Dict):
+        """Cache an answer, evicting the least recently used entry if full."""
+        with self._lock:
+            if country not in self._indexes:
+                self._indexes[country] = faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
+                self._entries[country] = OrderedDict()
+            index = self._indexes[country]
+            entries = self._entries[country]
+            
+            if len(entries) >= self.max_size:
+                oldest_id, _ = entries.popitem(last=False)
+                index.remove_ids(np.array([oldest_id], dtype='int64'))
+            
+            entry_id = self._next_id
+            self._next_id += 1
+            index.add_with_ids(query_embedding, np.array([entry_id], dtype='int64'))
+            entries[entry_id] = (top_chunk, dict(answer))
+
 
 class LLMHandler:
     """
     Handler for Groq LLM API.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        embedding_model: Optional[EmbeddingModel] = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         """
         Initialize LLM handler.
+        
+        Args:
+            api_key: Groq API key (defaults to settings.GROQ_API_KEY)
+            embedding_model: Model used for the semantic answer cache
+                             (defaults to the shared global model)
+            http_client: Shared client to send requests through (the caller
+                         keeps ownership and closes it); by default the
+                         handler creates and closes its own pool
         """
         self.api_key = api_key or settings.GROQ_API_KEY
 
@@ -36,13 +325,29 @@ class LLMHandler:
         if not self.api_key:
             raise ValueError("Groq API key not found. Set GROQ_API_KEY in .env")
 
-        # Initialize Groq client
-        self.client = Groq(api_key=self.api_key)
+        # Initialize async Groq client. One pooled keep-alive HTTP client is
+        # shared by all requests (the handler is a process-wide singleton),
+        # so concurrent requests don't each pay connection/TLS setup.
+        self._owns_client = http_client is None
+        self.client = AsyncGroq(
+            api_key=self.api_key,
+            http_client=http_client or httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100),
+                timeout=30.0
+            ),
+            timeout=30.0,
+            max_retries=2
+        )
+        self.batcher = GroqBatcher(self.client)
 
         # Model configuration
-        self.model = "llama-3.1-8b-instant" # Best for reasoning
+        self.model = MODEL_TIERS['instant']  # Default (fast) tier
         self.max_tokens = 1000  # Response length limit
-        self.temperature = 0.3  # Low = more focused/consistent
+        self.temperature = 0  # Deterministic; identical prompts give identical answers
+
+        # Semantic answer cache (shares the retriever's embedding model)
+        self.embedding_model = embedding_model or get_embedding_model()
+        self.answer_cache = _SemanticAnswerCache(self.embedding_model.get_dimension())
 
         logger.info(f"✅ LLM Handler initialized")
         logger.info(f"   Model: {self.model}")
@@ -64,36 +369,15 @@ class LLMHandler:
         Returns:
             Formatted prompt string
         """
-        # Format retrieved documents
+        # Static, per-country instructions come first so every request for a
+        # country shares the same prompt prefix (provider prefix caching);
+        # the retrieved context and question go last
+        preamble = _STATIC_PREAMBLES.get(country)
+        if preamble is None:
+            preamble = _STATIC_PREAMBLES[country] = _build_preamble(country)
         context = self._format_context(retrieved_chunks)
         
-        # Create the prompt with clear instructions
-        prompt = f"""You are a legal information assistant specializing in {country.upper()} law. Your role is to provide accurate, helpful answers based ONLY on the provided legal documents.
-
-LEGAL CONTEXT:
-{context}
-
-USER QUESTION:
-{query}
-
-INSTRUCTIONS:
-1. Answer the question using ONLY the information provided in the LEGAL CONTEXT above
-2. If the context doesn't contain enough information, say "I don't have enough information to answer this question based on the provided documents"
-3. Cite specific laws, sections, and acts when possible
-4. Be concise but thorough
-5. Use simple language that non-lawyers can understand
-
-IMPORTANT: You must respond in the following JSON format:
-{{
-    "answer": "Your clear, direct answer to the question",
-    "reasoning": "Explain which laws and sections support this answer",
-    "sources": ["List of specific law titles or sections cited"],
-    "confidence": "high/medium/low based on how well the context supports the answer"
-}}
-
-Respond ONLY with valid JSON, no additional text before or after."""
-
-        return prompt
+        return _PROMPT_TEMPLATE.format(preamble=preamble, context=context, query=query)
     
     def _format_context(self, chunks: List[Dict]) -> str:
         """
@@ -106,22 +390,20 @@ Respond ONLY with valid JSON, no additional text before or after."""
             Formatted context string
         """
         if not chunks:
-            return "No relevant documents found."
-        
-        context_parts = []
-        
-        for i, chunk in enumerate(chunks, 1):
-            context_parts.append(f"""
-Document {i}:
-Title: {chunk.get('title', 'Unknown')}
-Section: {chunk.get('section', 'N/A')}
-Category: {chunk.get('category', 'general')}
-Content: {chunk.get('text', '')}
-""")
+            return NO_DOCUMENTS
         
-        return "\n".join(context_parts)
+        return "\n".join(
+            _DOC_TEMPLATE.format(
+                i=i,
+                title=chunk.get('title', UNKNOWN),
+                section=chunk.get('section', NOT_AVAILABLE),
+                category=chunk.get('category', GENERAL),
+                text=chunk.get('text', '')
+            )
+            for i, chunk in enumerate(chunks, 1)
+        )
     
-    def generate_answer(
+    async def generate_answer(
         self, 
         query: str, 
         retrieved_chunks: List[Dict], 
@@ -145,6 +427,17 @@ Content: {chunk.get('text', '')}
             Dictionary with answer, reasoning, sources, confidence
         """
         try:
+            # Step 0: Answer paraphrases of recent questions from cache
+            # Encoding is CPU-bound; keep it off the event loop
+            query_embedding = await asyncio.to_thread(self._cache_key_embedding, query)
+            top_chunk = self._top_chunk_key(retrieved_chunks)
+            
+            cached = self.answer_cache.get(country, query_embedding, top_chunk)
+            if cached is not None:
+                logger.info(f"⚡ Semantic cache hit for query: '{query}'")
+                cached['cached'] = True
+                return cached
+            
             # Step 1: Create prompt
             prompt = self.create_prompt(query, retrieved_chunks, country)
             
@@ -152,38 +445,27 @@ Content: {chunk.get('text', '')}
             logger.info(f"   Country: {country}")
             logger.info(f"   Context chunks: {len(retrieved_chunks)}")
             
-            # Step 2: Call Groq API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a legal information assistant. Provide accurate, well-sourced answers based on legal documents. Always respond in valid JSON format."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                top_p=1,
-                stream=False
-            )
+            # Step 2-4: Call Groq API on the chosen tier and parse the JSON
+            model = self._select_model(query)
+            parsed_response, raw_response, tokens_used = await self._complete(prompt, model)
             
-            # Step 3: Extract response
-            raw_response = response.choices[0].message.content
+            # Escalate weak fast-tier answers to the larger model
+            if model == MODEL_TIERS['instant'] and self._needs_escalation(parsed_response):
+                logger.info(f"⬆️ Low-confidence answer; retrying on {MODEL_TIERS['balanced']}")
+                model = MODEL_TIERS['balanced']
+                parsed_response, raw_response, escalated_tokens = await self._complete(prompt, model)
+                tokens_used += escalated_tokens
             
-            logger.info(f"✅ Received response from Groq")
-            logger.info(f"   Tokens used: {response.usage.total_tokens}")
+            # Step 5: Add metadata (raw output only when debugging; it is
+            # otherwise unused and doubles the size of each cached answer)
+            if settings.LLM_DEBUG:
+                parsed_response['raw_response'] = raw_response
+            parsed_response['model'] = model
+            parsed_response['tokens_used'] = tokens_used
             
-            # Step 4: Parse JSON response
-            parsed_response = self._parse_response(raw_response)
-            
-            # Step 5: Add metadata
-            parsed_response['raw_response'] = raw_response
-            parsed_response['model'] = self.model
-            parsed_response['tokens_used'] = response.usage.total_tokens
+            # Step 6: Cache well-formed answers for similar future queries
+            if 'parse_error' not in parsed_response:
+                self.answer_cache.put(country, query_embedding, top_chunk, parsed_response)
             
             return parsed_response
             
@@ -191,6 +473,140 @@ Content: {chunk.get('text', '')}
             logger.error(f"❌ Error generating answer: {e}")
             return self._create_error_response(str(e))
     
+    async def generate_answer_stream(
+        self,
+        query: str,
+        retrieved_chunks: List[Dict],
+        country: str
+    ) -> AsyncIterator[Dict]:
+        """
+        Generate answer using Groq LLM, streaming the answer text as it arrives.
+        
+        Yields:
+            {'type': 'token', 'text': ...} for each new piece of the `answer`
+            field, then one {'type': 'final', 'answer': ...} whose value is the
+            same dictionary generate_answer() returns. Cached answers are
+            yielded as a single final event.
+        """
+        try:
+            # Encoding is CPU-bound; keep it off the event loop
+            query_embedding = await asyncio.to_thread(self._cache_key_embedding, query)
+            top_chunk = self._top_chunk_key(retrieved_chunks)
+            
+            cached = self.answer_cache.get(country, query_embedding, top_chunk)
+            if cached is not None:
+                logger.info(f"⚡ Semantic cache hit for query: '{query}'")
+                cached['cached'] = True
+                yield {'type': 'final', 'answer': cached}
+                return
+            
+            prompt = self.create_prompt(query, retrieved_chunks, country)
+            
+            logger.info(f"🤖 Streaming answer for query: '{query}'")
+            logger.info(f"   Country: {country}")
+            logger.info(f"   Context chunks: {len(retrieved_chunks)}")
+            
+            # Streams are per-request, so they bypass the batcher. Tokens are
+            # already sent, so there is no escalation to a second model.
+            model = self._select_model(query)
+            stream = await self.client.chat.completions.create(
+                **self._completion_params(prompt, model, stream=True)
+            )
+            
+            extractor = _AnswerFieldExtractor()
+            pieces = []
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                piece = chunk.choices[0].delta.content
+                pieces.append(piece)
+                
+                text = extractor.feed(piece)
+                if text:
+                    yield {'type': 'token', 'text': text}
+            
+            raw_response = "".join(pieces)
+            logger.info(f"✅ Received streamed response from Groq")
+            
+            parsed_response = self._parse_response(raw_response)
+            if settings.LLM_DEBUG:
+                parsed_response['raw_response'] = raw_response
+            parsed_response['model'] = model
+            
+            if 'parse_error' not in parsed_response:
+                self.answer_cache.put(country, query_embedding, top_chunk, parsed_response)
+            
+            yield {'type': 'final', 'answer': parsed_response}
+            
+        except Exception as e:
+            logger.error(f"❌ Error streaming answer: {e}")
+            yield {'type': 'final', 'answer': self._create_error_response(str(e))}
+    
+    async def _complete(self, prompt: str, model: str) -> Tuple[Dict, str, int]:
+        """Run one (batched) completion; returns (parsed, raw text, tokens used)."""
+        response = await self.batcher.submit(**self._completion_params(prompt, model, stream=False))
+        raw_response = response.choices[0].message.content
+        
+        logger.info(f"✅ Received response from Groq ({model})")
+        logger.info(f"   Tokens used: {response.usage.total_tokens}")
+        
+        return self._parse_response(raw_response), raw_response, response.usage.total_tokens
+    
+    @staticmethod
+    def _select_model(query: str) -> str:
+        """Pick the model tier from how complex the question looks."""
+        if len(query) >= COMPLEX_QUERY_MIN_CHARS or query.count('?') > 1:
+            return MODEL_TIERS['balanced']
+        return MODEL_TIERS['instant']
+    
+    @staticmethod
+    def _needs_escalation(parsed_response: Dict) -> bool:
+        """Whether a fast-tier answer is weak enough to retry on the larger model."""
+        return 'parse_error' in parsed_response or parsed_response.get('confidence') == 'low'
+    
+    def _completion_params(self, prompt: str, model: str, stream: bool) -> Dict:
+        """Keyword arguments for chat.completions.create."""
+        params = {
+            'model': model,
+            'messages': [
+                _SYSTEM_MSG,
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+            'top_p': 1,
+            'stream': stream
+        }
+        # JSON mode: the API guarantees a well-formed JSON object (sent as a
+        # raw body field; groq==0.4.0 has no typed param). Groq doesn't
+        # support it with streaming, so streamed replies rely on the prompt
+        # and _parse_response's text fallback.
+        if not stream:
+            params['extra_body'] = {"response_format": {"type": "json_object"}}
+        return params
+    
+    async def aclose(self):
+        """Close the pooled HTTP connections (unless the client was passed in)."""
+        if self._owns_client:
+            await self.client.close()
+    
+    def _cache_key_embedding(self, query: str) -> np.ndarray:
+        """L2-normalized (1, dim) float32 query embedding for the answer cache."""
+        embedding = np.array(self.embedding_model.encode_single(query), dtype='float32').reshape(1, -1)
+        faiss.normalize_L2(embedding)
+        return embedding
+    
+    @staticmethod
+    def _top_chunk_key(retrieved_chunks: List[Dict]) -> tuple:
+        """Identify the top retrieved chunk (cached answers must share it)."""
+        if not retrieved_chunks:
+            return ()
+        top = retrieved_chunks[0]
+        return (top.get('title'), top.get('section'), top.get('chunk_id'))
+    
     def _parse_response(self, raw_response: str) -> Dict:
         """
         Parse LLM response from JSON string.
@@ -203,7 +619,7 @@ Content: {chunk.get('text', '')}
         """
         try:
             # Try to parse JSON
-            parsed = json.loads(raw_response)
+            parsed = _json_loads(raw_response)
             
             # Validate required fields
             required_fields = ['answer', 'reasoning', 'sources']
@@ -223,7 +639,7 @@ Content: {chunk.get('text', '')}
             logger.info(f"✅ Successfully parsed JSON response")
             return parsed
             
-        except json.JSONDecodeError as e:
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
             logger.error(f"❌ Failed to parse JSON response: {e}")
             logger.error(f"   Raw response: {raw_response[:200]}...")
             
@@ -287,15 +703,16 @@ Content: {chunk.get('text', '')}
         if len(reasoning) < 30:
             warnings.append("Reasoning seems insufficient")
         
-        # Check if sources match retrieved documents
-        retrieved_titles = [chunk.get('title', '') for chunk in retrieved_chunks]
-        cited_sources = answer_dict.get('sources', [])
+        # Check if sources match retrieved documents (lowercase each title and
+        # source once; chunks of one document share a title, so dedupe)
+        retrieved_titles = list(dict.fromkeys(chunk.get('title', '').lower() for chunk in retrieved_chunks))
+        cited_sources = {source.lower() for source in answer_dict.get('sources', [])}
         
-        matches = sum(1 for source in cited_sources 
-                     if any(title.lower() in source.lower() or source.lower() in title.lower() 
-                            for title in retrieved_titles))
+        has_match = any(title in source or source in title
+                        for source in cited_sources
+                        for title in retrieved_titles)
         
-        if matches == 0 and len(retrieved_chunks) > 0:
+        if not has_match and len(retrieved_chunks) > 0:
             warnings.append("Sources don't match retrieved documents")
         
         return {
@@ -307,6 +724,7 @@ Content: {chunk.get('text', '')}
 
 # Global LLM handler instance
 _llm_handler_instance = None
+_llm_handler_lock = threading.Lock()
 
 
 def get_llm_handler() -> LLMHandler:
@@ -319,8 +737,16 @@ def get_llm_handler() -> LLMHandler:
     global _llm_handler_instance
     
     if _llm_handler_instance is None:
-        logger.info("🔄 Initializing global LLM handler...")
-        _llm_handler_instance = LLMHandler()
+        # Double-checked so concurrent first requests open one Groq client
+        with _llm_handler_lock:
+            if _llm_handler_instance is None:
+                logger.info("🔄 Initializing global LLM handler...")
+                _llm_handler_instance = LLMHandler(http_client=get_http_client())
     
     return _llm_handler_instance
 
+
+async def close_llm_handler():
+    """Close the global LLM handler's connections (app shutdown)."""
+    if _llm_handler_instance is not None:
+        await _llm_handler_instance.aclose()
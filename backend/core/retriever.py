@@ -12,22 +12,152 @@ Think of it like Google Search, but for legal documents!
 """
 import faiss
 import numpy as np
-import pickle
+import json
 import os
-from typing import List, Dict
+import glob
+import hashlib
+from abc import abstractmethod
+from collections.abc import Sequence
+from typing import List, Dict, Optional
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 import threading
 
 from backend.core.embeddings import get_embedding_model
 from backend.core.document_processor import DocumentProcessor
 
+# orjson encodes/decodes chunk records faster; fall back to stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyarrow stores chunk metadata column-wise in a memory-mappable file;
+# without it the row-wise _ChunkStore format is used
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 logger = logging.getLogger(__name__)
 
+# HNSW graph parameters: M = links per node, ef = candidate list sizes
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 64
+
+# Vectors added to the FAISS index per call when building
+ADD_BLOCK_SIZE = 4096
+
+# Max vectors used to train the int8 scalar quantizer (per-dim min/max)
+SQ_TRAIN_SAMPLE_SIZE = 65536
+
 # Module-level executor for background index operations
 _executor = ThreadPoolExecutor(max_workers=2)
 
+# Share the cores between worker processes instead of letting every worker's
+# FAISS/OpenMP pool claim all of them (requests already run concurrently)
+_WEB_CONCURRENCY = max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))
+faiss.omp_set_num_threads(max(1, (os.cpu_count() or 1) // _WEB_CONCURRENCY))
+
+def _dump_chunk(chunk: Dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(chunk)
+    return json.dumps(chunk, ensure_ascii=False).encode('utf-8')
+
 
+def _load_chunk(data: bytes) -> Dict:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _LazyChunks(Sequence):
+    """Read-only sequence of chunk dicts, each built only when accessed."""
+    
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        
+        i = int(i)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("chunk index out of range")
+        
+        return self._get(i)
+    
+    @abstractmethod
+    def _get(self, i: int) -> Dict:
+        """Build the chunk dict at (non-negative, in-range) index i."""
+
+
+class _ChunkStore(_LazyChunks):
+    """
+    Read-only chunk metadata backed by memory-mapped files.
+    
+    Records are JSON blobs laid end to end in one data file, located through
+    an offsets array; a dict is only decoded when its index is accessed, so
+    loading costs nothing and only the pages search touches get read.
+    """
+    
+    def __init__(self, data_path: str, offsets_path: str):
+        self._offsets = np.load(offsets_path, mmap_mode='r')
+        # np.memmap refuses empty files
+        if os.path.getsize(data_path) > 0:
+            self._data = np.memmap(data_path, dtype=np.uint8, mode='r')
+        else:
+            self._data = np.empty(0, dtype=np.uint8)
+    
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+    
+    def _get(self, i: int) -> Dict:
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return _load_chunk(self._data[start:end].tobytes())
+    
+    @staticmethod
+    def write(chunks: List[Dict], data_path: str, offsets_path: str):
+        """Write chunks in the layout read back by `_ChunkStore`."""
+        offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        
+        with open(data_path, 'wb') as f:
+            for i, chunk in enumerate(chunks):
+                record = _dump_chunk(chunk)
+                f.write(record)
+                offsets[i + 1] = offsets[i] + len(record)
+        
+        np.save(offsets_path, offsets)
+
+
+class _ArrowChunkStore(_LazyChunks):
+    """
+    Chunk metadata as a columnar (struct-of-arrays) Arrow table.
+    
+    Each field is one string/int column in a memory-mapped IPC file, so
+    loading is zero-copy and no per-chunk Python objects exist until a
+    search hit is materialized.
+    """
+    
+    def __init__(self, path: str):
+        self._table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        self._columns = [(name, self._table.column(name)) for name in self._table.column_names]
+    
+    def __len__(self) -> int:
+        return self._table.num_rows
+    
+    def _get(self, i: int) -> Dict:
+        return {name: column[i].as_py() for name, column in self._columns}
+    
+    @staticmethod
+    def write(chunks: List[Dict], path: str):
+        """Write chunks as an Arrow IPC file, one column per field."""
+        fields = list(chunks[0]) if chunks else []
+        table = pa.table({name: [chunk.get(name) for chunk in chunks] for name in fields})
+        
+        with pa.OSFile(path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
 
 
 class FAISSRetriever:
@@ -53,19 +183,22 @@ class FAISSRetriever:
         
         # Paths for saving/loading
         self.index_dir = "backend/data/faiss_indexes"
-        self.index_path = f"{self.index_dir}/{country}.faiss"
-        self.metadata_path = f"{self.index_dir}/{country}_metadata.pkl"
+        # `_hnsw` suffix: older flat-L2 indexes are not reused
+        self.index_path = f"{self.index_dir}/{country}_hnsw.faiss"
+        self.metadata_path = f"{self.index_dir}/{country}_chunks.bin"
+        self.offsets_path = f"{self.index_dir}/{country}_chunks.idx.npy"
+        self.arrow_path = f"{self.index_dir}/{country}_chunks.arrow"
         
         # Background loading support: do not block during initialization.
+        # search() waits on this future instead of polling.
         self._loading_future = None
-        self._loading_lock = threading.Lock()
 
         # Try to load existing index asynchronously so startup isn't blocked.
-        if os.path.exists(self.index_path) and os.path.exists(self.metadata_path):
+        if os.path.exists(self.index_path) and self._saved_chunks_path() is not None:
             logger.info(f"📂 Found existing index for {country}; scheduling background load")
             # Submit load to module-level executor
             try:
-                _executor.submit(self.load_index)
+                self._loading_future = _executor.submit(self.load_index)
                 # Caller may inspect `self.index` or call search() which will wait briefly if needed.
             except Exception:
                 # Fallback to synchronous load if executor isn't available
@@ -115,21 +248,42 @@ class FAISSRetriever:
         
         logger.info(f"📝 Prepared {len(texts)} text chunks")
         
-        # Step 3: Generate embeddings
-        logger.info(f"🧠 Generating embeddings...")
-        embeddings = self.embedding_model.encode_texts(texts, show_progress=True)
+        # Step 3: Generate embeddings (reusing the on-disk cache if the
+        # chunk texts haven't changed since the last build)
+        embeddings = self._load_cached_embeddings(texts)
+        
+        if embeddings is None:
+            logger.info(f"🧠 Generating embeddings...")
+            embeddings = self._encode_to_cache(texts)
         
         logger.info(f"✅ Generated embeddings: {embeddings.shape}")
         
         # Step 4: Create FAISS index
         dimension = embeddings.shape[1]  # Should be 384
         
-        # IndexFlatL2 = Simple brute-force search (perfect for small datasets)
-        # L2 = Euclidean distance (we normalized embeddings, so this works like cosine)
-        self.index = faiss.IndexFlatL2(dimension)
-        
-        # Add embeddings to index
-        self.index.add(embeddings.astype('float32'))
+        # HNSW graph = approximate search in ~O(log N) instead of a full scan
+        # Inner product = cosine similarity (vectors are L2-normalized below)
+        # int8 scalar-quantized storage: 1 byte/dim instead of 4
+        self.index = faiss.IndexHNSWSQ(
+            dimension, faiss.ScalarQuantizer.QT_8bit, HNSW_M, faiss.METRIC_INNER_PRODUCT
+        )
+        self.index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        self.index.hnsw.efSearch = HNSW_EF_SEARCH
+        
+        # Train the quantizer on an evenly strided sample of the vectors
+        step = max(1, len(embeddings) // SQ_TRAIN_SAMPLE_SIZE)
+        sample = np.array(embeddings[::step], dtype='float32')
+        faiss.normalize_L2(sample)
+        self.index.train(sample)
+        del sample
+        
+        # Add embeddings to index (in blocks, so the float16 cache is never
+        # fully expanded to float32 in memory). Re-normalize each block:
+        # the float16 round trip leaves norms slightly off 1.
+        for start in range(0, len(embeddings), ADD_BLOCK_SIZE):
+            block = np.array(embeddings[start:start + ADD_BLOCK_SIZE], dtype='float32')
+            faiss.normalize_L2(block)
+            self.index.add(block)
         
         logger.info(f"✅ FAISS index created with {self.index.ntotal} vectors")
         
@@ -140,13 +294,82 @@ class FAISSRetriever:
         logger.info(f"✅ Index building complete for {self.country}!")
         logger.info(f"{'='*60}\n")
     
+    def _embeddings_cache_path(self, texts: List[str]) -> str:
+        """Cache file path, keyed by a hash of the encoder and the chunk texts."""
+        digest = hashlib.blake2b(digest_size=8)
+        # The int8 ONNX and PyTorch backends give slightly different vectors
+        digest.update(self.embedding_model.backend_id.encode('utf-8'))
+        digest.update(b'\0')
+        for text in texts:
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\0')
+        return f"{self.index_dir}/{self.country}_embeddings_{digest.hexdigest()}.npy"
+    
+    def _load_cached_embeddings(self, texts: List[str]):
+        """
+        Memory-map previously computed embeddings for these texts.
+        
+        Returns:
+            float16 array of shape (len(texts), dim), or None if not cached
+        """
+        cache_path = self._embeddings_cache_path(texts)
+        if not os.path.exists(cache_path):
+            return None
+        
+        embeddings = np.load(cache_path, mmap_mode='r')
+        if embeddings.shape != (len(texts), self.embedding_model.get_dimension()):
+            return None
+        
+        logger.info(f"📦 Using cached embeddings: {cache_path}")
+        return embeddings
+    
+    def _encode_to_cache(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts straight into the on-disk float16 cache.
+        
+        Embeddings are streamed window by window into a memory-mapped
+        file, so the full float32 array is never held in RAM.
+        Float16 halves the size and is ample for cosine search.
+        
+        The file is written under a temporary name and renamed into place
+        once complete: its header is final from the first write, so an
+        interrupted build must never leave it at the cache path.
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        
+        # Drop caches (and interrupted writes) from earlier builds of this country
+        for old_path in glob.glob(f"{self.index_dir}/{self.country}_embeddings_*.npy*"):
+            os.remove(old_path)
+        
+        cache_path = self._embeddings_cache_path(texts)
+        tmp_path = f"{cache_path}.tmp"
+        cache = np.lib.format.open_memmap(
+            tmp_path,
+            mode='w+',
+            dtype=np.float16,
+            shape=(len(texts), self.embedding_model.get_dimension())
+        )
+        
+        def write_rows(batch: np.ndarray, rows: slice):
+            cache[rows] = batch
+        
+        self.embedding_model.encode_texts(texts, show_progress=True, sink=write_rows)
+        cache.flush()
+        del cache
+        os.replace(tmp_path, cache_path)
+        
+        logger.info(f"💾 Embeddings cached: {cache_path}")
+        return np.load(cache_path, mmap_mode='r')
+    
     def save_index(self):
         """
         Save FAISS index and metadata to disk.
         
-        Saves 2 files:
+        Saves:
         - .faiss file: The vector index (for fast search)
-        - _metadata.pkl: The chunk information (text, title, etc.)
+        - _chunks.arrow: The chunk information (text, title, etc.) as columns,
+          when pyarrow is installed; otherwise
+        - _chunks.bin + _chunks.idx.npy: The same, as JSON records + byte offsets
         """
         # Create directory if it doesn't exist
         os.makedirs(self.index_dir, exist_ok=True)
@@ -156,43 +379,61 @@ class FAISSRetriever:
         logger.info(f"💾 FAISS index saved: {self.index_path}")
         
         # Save metadata (chunks)
-        with open(self.metadata_path, 'wb') as f:
-            pickle.dump(self.chunks, f)
-        logger.info(f"💾 Metadata saved: {self.metadata_path}")
+        if pa is not None:
+            meta_path = self.arrow_path
+            _ArrowChunkStore.write(self.chunks, meta_path)
+        else:
+            meta_path = self.metadata_path
+            _ChunkStore.write(self.chunks, meta_path, self.offsets_path)
+        logger.info(f"💾 Metadata saved: {meta_path}")
         
         # Show file sizes
         index_size = os.path.getsize(self.index_path) / 1024  # KB
-        meta_size = os.path.getsize(self.metadata_path) / 1024  # KB
+        meta_size = os.path.getsize(meta_path) / 1024  # KB
         logger.info(f"📊 Index size: {index_size:.1f} KB")
         logger.info(f"📊 Metadata size: {meta_size:.1f} KB")
     
+    def _saved_chunks_path(self) -> Optional[str]:
+        """Path of the saved chunk metadata this environment can read, if any."""
+        if pa is not None and os.path.exists(self.arrow_path):
+            return self.arrow_path
+        if os.path.exists(self.metadata_path) and os.path.exists(self.offsets_path):
+            return self.metadata_path
+        return None
+    
     def load_index(self):
         """
         Load FAISS index and metadata from disk.
         
         Much faster than rebuilding every time!
         """
-        # Protect concurrent loads
-        with self._loading_lock:
-            try:
-                logger.info(f"⏳ Loading FAISS index for {self.country} from {self.index_path}")
-                # Load FAISS index (use faiss.read_index which may be expensive)
-                self.index = faiss.read_index(self.index_path)
-
-                # Load metadata
-                with open(self.metadata_path, 'rb') as f:
-                    self.chunks = pickle.load(f)
-
-                logger.info(f"✅ Loaded index for {self.country}")
-                logger.info(f"   Vectors: {self.index.ntotal}")
-                logger.info(f"   Chunks: {len(self.chunks)}")
-
-            except Exception as e:
-                logger.error(f"❌ Error loading index: {e}")
-                # Leave index as None so callers can decide to build or retry
-                self.index = None
-                self.chunks = []
-                return
+        try:
+            logger.info(f"⏳ Loading FAISS index for {self.country} from {self.index_path}")
+            # Read onto the heap: faiss can only memory-map IVF inverted
+            # lists, not an HNSW graph, before 1.10's IO_FLAG_MMAP_IFC
+            index = faiss.read_index(self.index_path)
+            index.hnsw.efSearch = HNSW_EF_SEARCH
+
+            # Load metadata lazily; dicts are decoded per search hit
+            if self._saved_chunks_path() == self.arrow_path:
+                chunks = _ArrowChunkStore(self.arrow_path)
+            else:
+                chunks = _ChunkStore(self.metadata_path, self.offsets_path)
+
+            # Publish chunks before the index: readers gate on `self.index`
+            self.chunks = chunks
+            self.index = index
+
+            logger.info(f"✅ Loaded index for {self.country}")
+            logger.info(f"   Vectors: {self.index.ntotal}")
+            logger.info(f"   Chunks: {len(self.chunks)}")
+
+        except Exception as e:
+            logger.error(f"❌ Error loading index: {e}")
+            # Leave index as None so callers can decide to build or retry
+            self.index = None
+            self.chunks = []
+            return
     
     def search(self, query: str, top_k: int = 3) -> List[Dict]:
         """
@@ -209,49 +450,91 @@ class FAISSRetriever:
             results = retriever.search("student visa work", top_k=3)
             # Returns top 3 most relevant chunks
         """
-        # If index is not yet loaded, wait briefly for background loader to finish.
-        if self.index is None:
-            # If a background load is in progress give it a chance to finish
-            logger.info(f"Index not ready for {self.country}; waiting briefly for load to complete")
-            # Simple blocking wait loop with timeout to avoid indefinite hang
-            waited = 0
-            wait_step = 0.2
-            max_wait = 5.0
-            while self.index is None and waited < max_wait:
-                threading.Event().wait(wait_step)
-                waited += wait_step
-
-            if self.index is None:
-                # Still not loaded
-                raise Exception(f"Index not loaded for {self.country}. Try again later or trigger build_index().")
+        self._wait_for_index()
         
         # Step 1: Convert query to embedding
         query_embedding = self.embedding_model.encode_single(query)
         query_embedding = query_embedding.reshape(1, -1).astype('float32')
+        faiss.normalize_L2(query_embedding)
         
         # Step 2: Search FAISS index
-        distances, indices = self.index.search(query_embedding, top_k)
+        scores, indices = self.index.search(query_embedding, top_k)
         
         # Step 3: Retrieve chunk metadata
+        results = self._collect_results(scores[0], indices[0])
+        
+        logger.info(f"🔍 Search query: '{query}'")
+        logger.info(f"   Found {len(results)} relevant chunks")
+        for i, result in enumerate(results):
+            logger.info(f"   {i+1}. {result['title'][:50]}... (score: {result['similarity_score']:.3f})")
+        
+        return results
+    
+    def search_batch(self, queries: List[str], top_k: int = 3) -> List[List[Dict]]:
+        """
+        Search for several queries with one embedding call and one index search.
+        
+        Useful for multi-query retrieval (e.g. reformulations of the same
+        question), where encoding each query separately underuses the model.
+        
+        Args:
+            queries: List of user questions
+            top_k: Number of results to return per query (default: 3)
+        
+        Returns:
+            One list of relevant chunks per query, in the same order as `queries`
+        """
+        if not queries:
+            return []
+        
+        self._wait_for_index()
+        
+        query_embeddings = self.embedding_model.encode_texts(queries, show_progress=False)
+        query_embeddings = np.ascontiguousarray(query_embeddings, dtype='float32')
+        faiss.normalize_L2(query_embeddings)
+        
+        scores, indices = self.index.search(query_embeddings, top_k)
+        
+        results = [
+            self._collect_results(row_scores, row_indices)
+            for row_scores, row_indices in zip(scores, indices)
+        ]
+        
+        logger.info(f"🔍 Batch search: {len(queries)} queries, "
+                    f"{sum(len(r) for r in results)} chunks found")
+        
+        return results
+    
+    def _wait_for_index(self):
+        """Wait briefly for a background index load, raising if it never arrives."""
+        # If index is not yet loaded, wait briefly for background loader to finish.
+        if self.index is None:
+            if self._loading_future is not None:
+                logger.info(f"Index not ready for {self.country}; waiting briefly for load to complete")
+                # Woken as soon as the load finishes; timeout avoids an indefinite hang
+                try:
+                    self._loading_future.result(timeout=5.0)
+                except FuturesTimeoutError:
+                    pass
+
+            if self.index is None:
+                # Still not loaded
+                raise Exception(f"Index not loaded for {self.country}. Try again later or trigger build_index().")
+    
+    def _collect_results(self, scores: np.ndarray, indices: np.ndarray) -> List[Dict]:
+        """Turn one row of FAISS search output into chunk dicts with scores."""
         results = []
         
-        for distance, idx in zip(distances[0], indices[0]):
-            if idx < len(self.chunks):
+        for score, idx in zip(scores, indices):
+            # HNSW pads with -1 when fewer than top_k results are found
+            if 0 <= idx < len(self.chunks):
                 chunk = self.chunks[idx].copy()
                 
-                # Convert distance to similarity score (0-1, higher = more similar)
-                # L2 distance: 0 = identical, higher = more different
-                # We convert to similarity: 1/(1+distance)
-                similarity = float(1 / (1 + distance))
-                chunk['similarity_score'] = similarity
+                # Inner product of normalized vectors = cosine similarity
+                chunk['similarity_score'] = float(score)
                 
                 results.append(chunk)
         
-        logger.info(f"🔍 Search query: '{query}'")
-        logger.info(f"   Found {len(results)} relevant chunks")
-        for i, result in enumerate(results):
-            logger.info(f"   {i+1}. {result['title'][:50]}... (score: {result['similarity_score']:.3f})")
-        
         return results
     
     def get_stats(self) -> Dict:
@@ -267,6 +550,7 @@ class FAISSRetriever:
 
 # Global retriever cache
 _retriever_cache = {}
+_retriever_cache_lock = threading.Lock()
 
 
 def preload_retrievers(countries: List[str] = None):
@@ -279,9 +563,10 @@ def preload_retrievers(countries: List[str] = None):
         countries = ["india", "canada", "usa"]
 
     for country in countries:
-        if country not in _retriever_cache:
-            logger.info(f"Preloading retriever for: {country}")
-            _retriever_cache[country] = FAISSRetriever(country)
+        with _retriever_cache_lock:
+            if country not in _retriever_cache:
+                logger.info(f"Preloading retriever for: {country}")
+                _retriever_cache[country] = FAISSRetriever(country)
 
     return _retriever_cache
 
@@ -298,8 +583,13 @@ def get_retriever(country: str) -> FAISSRetriever:
     Returns:
         FAISSRetriever instance
     """
-    if country not in _retriever_cache:
-        logger.info(f"🔄 Creating retriever for {country}")
-        _retriever_cache[country] = FAISSRetriever(country)
+    retriever = _retriever_cache.get(country)
+    if retriever is None:
+        # Double-checked so concurrent first requests create one retriever
+        with _retriever_cache_lock:
+            retriever = _retriever_cache.get(country)
+            if retriever is None:
+                logger.info(f"🔄 Creating retriever for {country}")
+                retriever = _retriever_cache[country] = FAISSRetriever(country)
     
-    return _retriever_cache[country]
\ No newline at end of file
+    return retriever
\ No newline at end of file
@@ -1,11 +1,13 @@
 """
 Pydantic models for request/response validation (MVP - No Auth).
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
+from backend.core.utils import normalize_language_code
+
 
 class CountryEnum(str, Enum):
     """Supported countries."""
@@ -28,6 +30,16 @@ class ChatRequest(BaseModel):
         default=False,
         description="Whether to generate and return TTS audio"
     )  # ← NEW
+    audio_inline: bool = Field(
+        default=False,
+        description="Embed the audio as base64 instead of returning an audio_url"
+    )
+
+    @field_validator("user_language")
+    @classmethod
+    def _normalize_language(cls, value: str) -> str:
+        # 'EN', 'en-US', 'en_GB' → 'en', so English checks and caches match
+        return normalize_language_code(value) or "en"
 
 
 class SourceDocument(BaseModel):
@@ -53,8 +65,12 @@ class ChatResponse(BaseModel):
     confidence_score: Optional[float] = None
     audio_base64: Optional[str] = Field(
         default=None,
-        description="Base64 encoded audio (if include_audio=True)"
+        description="Base64 encoded audio (if include_audio=True and audio_inline=True)"
     )  # ← NEW
+    audio_url: Optional[str] = Field(
+        default=None,
+        description="Path to stream the audio from (if include_audio=True)"
+    )
     audio_format: Optional[str] = Field(
         default=None,
         description="Audio format (e.g., mp3)"
@@ -89,7 +105,7 @@ class QueryLogDB(BaseModel):
     )
     query: str
     response: Dict[str, Any]
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     processing_time_ms: Optional[float] = None
 
 
@@ -103,4 +119,4 @@ class FeedbackDB(BaseModel):
     )
     rating: int
     comment: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -14,18 +14,90 @@ Why Groq Whisper?
 - Excellent accuracy
 - Same API you're already using for LLM
 """
-from groq import Groq
 import os
+import io
+import asyncio
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import re
 import logging
 import tempfile
+import hashlib
+import shutil
+import subprocess
+import threading
+import wave
+from array import array
 
 from backend.core.config import settings
 
+# xxh3 fingerprints audio faster; fall back to blake2b
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Optional voice-activity check: silent WAV uploads skip the API call
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
 logger = logging.getLogger(__name__)
 
+# Transcript cache: identical uploads (retries, "read that again") skip the
+# API. Audio is identified by its first 1 MB, last 64 KB and total size.
+TRANSCRIPT_CACHE_SIZE = 512
+FINGERPRINT_HEAD_BYTES = 1024 * 1024
+FINGERPRINT_TAIL_BYTES = 64 * 1024
+
+# VAD preflight (WAV only): 30 ms frames, most aggressive mode, and at least
+# this many voiced frames before the audio is worth sending
+VAD_AGGRESSIVENESS = 3
+VAD_FRAME_MS = 30
+VAD_MIN_VOICED_FRAMES = 3
+VAD_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+
+# Uploads over the API limit are cut with ffmpeg (stream copy, no re-encode)
+# into ~20 MB segments that are transcribed concurrently. Needs ffmpeg and
+# ffprobe on PATH; without them large files are rejected as before.
+CHUNK_TARGET_BYTES = 20 * 1024 * 1024
+MAX_CHUNKED_FILE_SIZE = 200 * 1024 * 1024
+# Segment muxer output for formats ffmpeg can't pick from the extension
+_SEGMENT_EXTENSIONS = {'mpga': 'mp3', 'mpeg': 'mp3', 'mp4': 'm4a'}
+
+# A usable transcription has at least one letter/digit (Latin, accented
+# Latin or Devanagari), not just punctuation
+_RE_ALNUM = re.compile(r"[A-Za-z0-9\u00C0-\u024F\u0900-\u097F]")
+
+
+class _LFUCache:
+    """Small thread-safe least-frequently-used cache (ties evict the oldest)."""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: Dict = {}  # key -> [value, hits], in insertion order
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry[1] += 1
+            return entry[0]
+    
+    def put(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self._entries[key][0] = value
+                return
+            if len(self._entries) >= self.max_size:
+                # min() keeps the first (oldest) of equally-used entries
+                victim = min(self._entries, key=lambda k: self._entries[k][1])
+                del self._entries[victim]
+            self._entries[key] = [value, 0]
+
 
 class SpeechToTextHandler:
     """
@@ -39,42 +111,79 @@ class SpeechToTextHandler:
     """
     
     # Supported audio formats (Groq Whisper supports same as OpenAI)
-    SUPPORTED_FORMATS = [
+    SUPPORTED_FORMATS = (
         'mp3', 'mp4', 'mpeg', 'mpga', 
         'm4a', 'wav', 'webm', 'ogg', 'flac'
-    ]
+    )
+    _SUPPORTED_SET = frozenset(SUPPORTED_FORMATS)  # For membership checks
     
     # Max file size (25 MB - Groq limit)
     MAX_FILE_SIZE = 25 * 1024 * 1024  # 25 MB in bytes
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, http_client=None):
         """
         Initialize STT handler with Groq.
         
         Args:
             api_key: Groq API key (defaults to settings.GROQ_API_KEY)
+            http_client: Shared httpx.AsyncClient to send requests through
+                         (the caller keeps ownership and closes it); by
+                         default the handler creates and closes its own pool
         """
         self.api_key = api_key or settings.GROQ_API_KEY
         
         if not self.api_key:
             raise ValueError("Groq API key not found. Set GROQ_API_KEY in .env")
         
-        # Initialize Groq client (same as LLM!)
-        self.client = Groq(api_key=self.api_key)
+        # Async Groq client (same as LLM!) so transcription doesn't block
+        # the event loop during the API round-trip
+        # (imported here so importing this module stays cheap).
+        # One pooled keep-alive HTTP client is shared by every transcription,
+        # so back-to-back and concurrent fallback calls reuse warm TLS
+        # connections instead of each paying a new handshake.
+        import httpx
+        from groq import AsyncGroq
+        self._owns_client = http_client is None
+        self.client = AsyncGroq(
+            api_key=self.api_key,
+            http_client=http_client or httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=32,
+                    keepalive_expiry=60
+                ),
+                timeout=60.0
+            ),
+            timeout=60.0
+        )
         
         # Groq Whisper model - FREE and FAST!
         self.model = "whisper-large-v3-turbo"  # Latest & fastest model
         
+        # Recent transcripts by (audio fingerprint, language, prompt)
+        self._transcript_cache = _LFUCache(TRANSCRIPT_CACHE_SIZE)
+        
+        # Voice activity detector (None when webrtcvad isn't installed)
+        self._vad = webrtcvad.Vad(VAD_AGGRESSIVENESS) if webrtcvad is not None else None
+        
+        # ffmpeg/ffprobe for splitting oversized uploads (None when missing)
+        self._ffmpeg = shutil.which('ffmpeg')
+        self._ffprobe = shutil.which('ffprobe')
+        self.chunking_available = bool(self._ffmpeg and self._ffprobe)
+        
         logger.info(f"🎤 STT Handler initialized (Groq Whisper)")
         logger.info(f"   Model: {self.model}")
         logger.info(f"   Provider: Groq (FREE!)")
         logger.info(f"   Supported formats: {', '.join(self.SUPPORTED_FORMATS)}")
+        if not self.chunking_available:
+            logger.info("   ffmpeg not found: files over 25 MB will be rejected")
     
-    def transcribe_audio(
+    async def transcribe_audio(
         self,
         audio_file,
         language: Optional[str] = None,
-        prompt: Optional[str] = None
+        prompt: Optional[str] = None,
+        enable_chunking: bool = True
     ) -> Dict:
         """
         Transcribe audio file to text using Groq Whisper.
@@ -83,19 +192,24 @@ class SpeechToTextHandler:
             audio_file: File object or file path
             language: Language code (e.g., 'en', 'hi', 'fr') - optional
             prompt: Optional text to guide transcription
+            enable_chunking: Split files over the 25 MB API limit into
+                segments (needs ffmpeg) instead of rejecting them
             
         Returns:
             Dictionary with transcription and metadata
             
         Example:
-            result = handler.transcribe_audio(audio_file)
+            result = await handler.transcribe_audio(audio_file)
             # Returns: {'text': '...', 'language': 'en', 'duration': 5.2}
         """
         try:
             logger.info(f"🎤 Transcribing audio with Groq Whisper...")
             
             # Step 1: Validate file
-            file_info = self._validate_audio_file(audio_file)
+            file_info = self._validate_audio_file(
+                audio_file,
+                allow_chunking=enable_chunking and self.chunking_available
+            )
             
             if file_info['error']:
                 return {
@@ -107,12 +221,42 @@ class SpeechToTextHandler:
             logger.info(f"   File format: {file_info['format']}")
             logger.info(f"   File size: {file_info['size_mb']:.2f} MB")
             
-            # Step 2: Call Groq Whisper API
-            transcription = self._call_groq_whisper_api(
-                audio_file,
-                language=language,
-                prompt=prompt
+            # Step 1.5: One pass over the upload - skip the API call for
+            # silent recordings, and fingerprint it for the transcript cache
+            has_speech, fingerprint = await asyncio.to_thread(
+                self._inspect_upload, audio_file, file_info
             )
+            if not has_speech:
+                logger.warning("⚠️ No speech detected in audio; skipping transcription")
+                return {
+                    'text': '',
+                    'error': 'No speech detected in the audio (silence)',
+                    'success': False
+                }
+            
+            # Step 2: Reuse the transcript of identical audio, else call Groq Whisper API
+            cache_key = (fingerprint, language, prompt) if fingerprint else None
+            transcription = self._transcript_cache.get(cache_key) if cache_key else None
+            
+            if transcription is not None:
+                logger.info("⚡ Using cached transcription for identical audio")
+            elif file_info['needs_chunking']:
+                transcription = await self._transcribe_in_chunks(
+                    audio_file,
+                    file_info,
+                    language=language,
+                    prompt=prompt
+                )
+                if transcription and cache_key:
+                    self._transcript_cache.put(cache_key, transcription)
+            else:
+                transcription = await self._call_groq_whisper_api(
+                    audio_file,
+                    language=language,
+                    prompt=prompt
+                )
+                if transcription and cache_key:
+                    self._transcript_cache.put(cache_key, transcription)
             
             if not transcription:
                 return {
@@ -128,7 +272,7 @@ class SpeechToTextHandler:
             # Validate transcription content: ensure it's not punctuation-only or empty
             # We consider transcription valid if it contains at least one alphanumeric or script character
             # Pattern allows Latin letters, numbers, accented letters, and common unicode ranges for other scripts
-            has_alpha_num = re.search(r"[A-Za-z0-9\u00C0-\u024F\u0900-\u097F]", transcription)
+            has_alpha_num = _RE_ALNUM.search(transcription)
             if not transcription or not has_alpha_num or len(transcription.strip()) < 2:
                 logger.warning("⚠️ Transcription seems to be empty or punctuation-only; marking as unsuccessful")
                 return {
@@ -158,12 +302,14 @@ class SpeechToTextHandler:
                 'success': False
             }
     
-    def _validate_audio_file(self, audio_file) -> Dict:
+    def _validate_audio_file(self, audio_file, allow_chunking: bool = False) -> Dict:
         """
         Validate audio file format and size.
         
         Args:
             audio_file: File object or path
+            allow_chunking: Accept files over the API limit (up to
+                MAX_CHUNKED_FILE_SIZE) so they can be split into segments
             
         Returns:
             Dictionary with validation results
@@ -175,10 +321,10 @@ class SpeechToTextHandler:
                 filename = audio_file.filename
                 file_ext = Path(filename).suffix.lower().lstrip('.')
                 
-                # Get file size
-                audio_file.file.seek(0, 2)  # Seek to end
-                file_size = audio_file.file.tell()
-                audio_file.file.seek(0)  # Reset to start
+                # Get file size (FastAPI already counted it while spooling)
+                file_size = getattr(audio_file, 'size', None)
+                if file_size is None:
+                    file_size = self._fast_size(audio_file.file)
                 
             elif isinstance(audio_file, str):
                 # File path
@@ -188,10 +334,7 @@ class SpeechToTextHandler:
             else:
                 # File object (BytesIO or similar) - try to get size and assume audio format
                 try:
-                    # Seek to end to get size
-                    audio_file.seek(0, 2)
-                    file_size = audio_file.tell()
-                    audio_file.seek(0)  # Reset to start
+                    file_size = self._fast_size(audio_file)
                     
                     # Try to get filename or default to 'audio'
                     filename = getattr(audio_file, 'name', 'audio.wav')
@@ -210,7 +353,7 @@ class SpeechToTextHandler:
                     }
             
             # Check format
-            if file_ext not in self.SUPPORTED_FORMATS:
+            if file_ext not in self._SUPPORTED_SET:
                 return {
                     'error': f'Unsupported format: {file_ext}. Supported: {", ".join(self.SUPPORTED_FORMATS)}',
                     'format': file_ext,
@@ -218,9 +361,11 @@ class SpeechToTextHandler:
                 }
             
             # Check size
-            if file_size > self.MAX_FILE_SIZE:
+            max_size = MAX_CHUNKED_FILE_SIZE if allow_chunking else self.MAX_FILE_SIZE
+            if file_size > max_size:
                 return {
-                    'error': f'File too large: {file_size / (1024 * 1024):.2f} MB. Max: 25 MB',
+                    'error': f'File too large: {file_size / (1024 * 1024):.2f} MB. '
+                             f'Max: {max_size / (1024 * 1024):.0f} MB',
                     'format': file_ext,
                     'size_mb': file_size / (1024 * 1024)
                 }
@@ -228,7 +373,9 @@ class SpeechToTextHandler:
             return {
                 'error': None,
                 'format': file_ext,
-                'size_mb': file_size / (1024 * 1024)
+                'size_mb': file_size / (1024 * 1024),
+                'size_bytes': file_size,
+                'needs_chunking': file_size > self.MAX_FILE_SIZE
             }
             
         except Exception as e:
@@ -238,7 +385,23 @@ class SpeechToTextHandler:
                 'size_mb': 0
             }
     
-    def _call_groq_whisper_api(
+    @staticmethod
+    def _fast_size(f) -> int:
+        """Size of a file object: one fstat when it has a real descriptor."""
+        # fileno() would force an in-memory spool to roll over to disk
+        if not isinstance(f, tempfile.SpooledTemporaryFile):
+            try:
+                return os.fstat(f.fileno()).st_size
+            except (AttributeError, OSError, ValueError):
+                pass
+        
+        # No descriptor (BytesIO, spooled upload): seek/tell instead
+        f.seek(0, 2)  # Seek to end
+        size = f.tell()
+        f.seek(0)  # Reset to start
+        return size
+    
+    async def _call_groq_whisper_api(
         self,
         audio_file,
         language: Optional[str] = None,
@@ -256,36 +419,13 @@ class SpeechToTextHandler:
             Transcribed text
         """
         try:
-            # Need to handle file properly for Groq API
-            if isinstance(audio_file, str):
-                # File path - open it
-                with open(audio_file, 'rb') as f:
-                    file_content = f.read()
-                filename = os.path.basename(audio_file)
-            elif hasattr(audio_file, 'file'):
-                # UploadFile object (FastAPI)
-                audio_file.file.seek(0)
-                file_content = audio_file.file.read()
-                filename = audio_file.filename
-                audio_file.file.seek(0)  # Reset for potential reuse
-            elif hasattr(audio_file, 'seek'):
-                # File-like object (BytesIO, etc.)
-                audio_file.seek(0)
-                file_content = audio_file.read()
-                filename = getattr(audio_file, 'name', 'audio.wav')
-                audio_file.seek(0)  # Reset for potential reuse
-            else:
-                # Try to read as bytes
-                if isinstance(audio_file, bytes):
-                    file_content = audio_file
-                    filename = 'audio.wav'
-                else:
-                    file_content = audio_file.read()
-                    filename = getattr(audio_file, 'name', 'audio.wav')
+            # Hand the SDK a file object rather than bytes so httpx streams
+            # the multipart upload instead of holding another full copy
+            filename, stream, owned = self._open_audio(audio_file)
             
             # Prepare file tuple for Groq API
-            # Format: (filename, file_content, content_type)
-            file_tuple = (filename, file_content)
+            # Format: (filename, file_object)
+            file_tuple = (filename, stream)
             
             # Prepare API parameters
             api_params = {
@@ -303,7 +443,11 @@ class SpeechToTextHandler:
             
             # Call Groq Whisper API
             logger.info(f"📡 Calling Groq Whisper API...")
-            transcription = self.client.audio.transcriptions.create(**api_params)
+            try:
+                transcription = await self.client.audio.transcriptions.create(**api_params)
+            finally:
+                if owned:
+                    stream.close()
             
             # Groq returns text directly when response_format='text'
             if isinstance(transcription, str):
@@ -320,11 +464,310 @@ class SpeechToTextHandler:
             logger.error(f"❌ Groq Whisper API call failed: {e}")
             raise
     
-    def transcribe_with_fallback(
+    async def _transcribe_in_chunks(
+        self,
+        audio_file,
+        file_info: Dict,
+        language: Optional[str] = None,
+        prompt: Optional[str] = None
+    ) -> str:
+        """
+        Transcribe a file over the API limit segment by segment.
+        
+        The segments are sent concurrently and their texts joined in order.
+        They don't overlap (stream-copy cuts), so nothing needs deduplicating.
+        """
+        workdir = await asyncio.to_thread(tempfile.mkdtemp, prefix='lexivoice_stt_')
+        try:
+            segments = await asyncio.to_thread(
+                self._split_audio,
+                audio_file,
+                workdir,
+                file_info['format'],
+                file_info['size_bytes']
+            )
+            logger.info(f"✂️ Split {file_info['size_mb']:.1f} MB audio into {len(segments)} segments")
+            
+            texts = await asyncio.gather(*[
+                self._call_groq_whisper_api(segment, language=language, prompt=prompt)
+                for segment in segments
+            ])
+            return ' '.join(text for text in texts if text)
+        finally:
+            await asyncio.to_thread(shutil.rmtree, workdir, True)
+    
+    def _split_audio(
+        self,
+        audio_file,
+        workdir: str,
+        file_ext: str,
+        file_size: int,
+        max_bytes: int = CHUNK_TARGET_BYTES
+    ) -> List[str]:
+        """
+        Cut audio into segments of about `max_bytes` each with ffmpeg.
+        
+        Segment length is the file's duration scaled by max_bytes/file_size,
+        so each segment lands near the target at the file's average bitrate.
+        
+        Returns:
+            Segment file paths, in playback order
+        """
+        if isinstance(audio_file, str):
+            source = audio_file
+        else:
+            # ffmpeg needs a real file: spill the upload into the workdir
+            source = os.path.join(workdir, f'input.{file_ext}')
+            filename, stream, owned = self._open_audio(audio_file)
+            try:
+                with open(source, 'wb') as out:
+                    shutil.copyfileobj(stream, out, 1024 * 1024)
+            finally:
+                if owned:
+                    stream.close()
+                elif hasattr(stream, 'seek'):
+                    stream.seek(0)
+        
+        probe = self._run_tool(
+            self._ffprobe, '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            source
+        )
+        duration = float(probe.strip())
+        segment_seconds = max(1, int(duration * max_bytes / file_size))
+        
+        out_ext = _SEGMENT_EXTENSIONS.get(file_ext, file_ext)
+        self._run_tool(
+            self._ffmpeg, '-hide_banner', '-loglevel', 'error',
+            '-i', source,
+            '-vn',  # audio only (mp4/webm uploads may carry video)
+            '-f', 'segment',
+            '-segment_time', str(segment_seconds),
+            '-c', 'copy',
+            os.path.join(workdir, f'segment_%03d.{out_ext}')
+        )
+        
+        segments = sorted(
+            os.path.join(workdir, name)
+            for name in os.listdir(workdir)
+            if name.startswith('segment_')
+        )
+        if not segments:
+            raise RuntimeError("ffmpeg produced no audio segments")
+        return segments
+    
+    @staticmethod
+    def _run_tool(*args: str) -> str:
+        """Run an external tool; returns its stdout, raises on failure."""
+        completed = subprocess.run(args, capture_output=True, text=True)
+        if completed.returncode != 0:
+            tool = os.path.basename(args[0])
+            raise RuntimeError(f"{tool} failed: {completed.stderr.strip()[-500:]}")
+        return completed.stdout
+    
+    def _has_speech(self, audio_file) -> bool:
+        """
+        Run the VAD over a WAV file's 16-bit PCM.
+        
+        Returns False only when the audio was read and has fewer than
+        VAD_MIN_VOICED_FRAMES voiced frames; anything the VAD can't handle
+        (other sample rates/widths, unreadable files) counts as speech.
+        """
+        try:
+            if isinstance(audio_file, str):
+                source = audio_file
+            elif hasattr(audio_file, 'file'):
+                source = audio_file.file
+            else:
+                source = audio_file
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            
+            with wave.open(source, 'rb') as wav:
+                channels = wav.getnchannels()
+                rate = wav.getframerate()
+                if wav.getsampwidth() != 2 or rate not in VAD_SAMPLE_RATES:
+                    return True
+                
+                frame_samples = rate * VAD_FRAME_MS // 1000
+                voiced = 0
+                while voiced < VAD_MIN_VOICED_FRAMES:
+                    frames = wav.readframes(frame_samples)
+                    if len(frames) < frame_samples * channels * 2:
+                        break
+                    if channels > 1:
+                        # The VAD wants mono; use the first channel
+                        frames = array('h', frames)[::channels].tobytes()
+                    if self._vad.is_speech(frames, rate):
+                        voiced += 1
+            
+            return voiced >= VAD_MIN_VOICED_FRAMES
+        
+        except (wave.Error, EOFError, OSError, ValueError, TypeError) as e:
+            logger.warning(f"⚠️ VAD preflight skipped: {e}")
+            return True
+        finally:
+            if hasattr(audio_file, 'file'):
+                audio_file.file.seek(0)
+            elif hasattr(audio_file, 'seek'):
+                audio_file.seek(0)
+    
+    def _inspect_upload(self, audio_file, file_info: Dict) -> Tuple[bool, Optional[str]]:
+        """
+        Pre-API checks in a single worker-thread pass.
+        
+        Returns:
+            (whether the audio may contain speech - the VAD only runs on
+            WAV - and its cache fingerprint, None when silent or unreadable)
+        """
+        if self._vad is not None and file_info['format'] == 'wav':
+            if not self._has_speech(audio_file):
+                return False, None
+        return True, self._audio_fingerprint(audio_file, file_info['size_bytes'])
+    
+    @staticmethod
+    def _audio_fingerprint(audio_file, size: Optional[int] = None) -> Optional[str]:
+        """
+        Hash of the audio's first 1 MB, last 64 KB and size (None if unreadable).
+        
+        Pass the size when it's already known (validation measured it) to
+        skip the seek-to-end.
+        """
+        try:
+            if isinstance(audio_file, str):
+                f = open(audio_file, 'rb')
+            elif hasattr(audio_file, 'file'):
+                f = audio_file.file
+            elif isinstance(audio_file, bytes):
+                f = io.BytesIO(audio_file)
+            else:
+                f = audio_file
+            
+            try:
+                if size is None:
+                    f.seek(0, 2)
+                    size = f.tell()
+                f.seek(0)
+                head = f.read(FINGERPRINT_HEAD_BYTES)
+                f.seek(max(size - FINGERPRINT_TAIL_BYTES, 0))
+                tail = f.read(FINGERPRINT_TAIL_BYTES)
+                f.seek(0)
+            finally:
+                if isinstance(audio_file, str):
+                    f.close()
+        except (AttributeError, OSError):
+            return None
+        
+        data = head + tail + size.to_bytes(8, 'little')
+        if xxhash is not None:
+            return xxhash.xxh3_64_hexdigest(data)
+        return hashlib.blake2b(data, digest_size=8).hexdigest()
+    
+    @staticmethod
+    def _open_audio(audio_file) -> Tuple[str, object, bool]:
+        """
+        Open an audio source for upload without reading it into memory.
+        
+        Returns:
+            (filename, file object positioned at the start, whether the
+            caller owns the object and must close it)
+        """
+        if isinstance(audio_file, str):
+            # File path - open a handle; the SDK would read a path fully
+            return os.path.basename(audio_file), open(audio_file, 'rb'), True
+        if hasattr(audio_file, 'file'):
+            # UploadFile object (FastAPI)
+            audio_file.file.seek(0)
+            return audio_file.filename, audio_file.file, False
+        if isinstance(audio_file, bytes):
+            return 'audio.wav', io.BytesIO(audio_file), True
+        if hasattr(audio_file, 'seek'):
+            # File-like object (BytesIO, etc.)
+            audio_file.seek(0)
+        return getattr(audio_file, 'name', 'audio.wav'), audio_file, False
+    
+    @staticmethod
+    def _read_audio(audio_file) -> Tuple[str, bytes]:
+        """Read an audio source fully into (filename, bytes)."""
+        # Need to handle file properly for Groq API
+        if isinstance(audio_file, str):
+            # File path - open it
+            with open(audio_file, 'rb') as f:
+                file_content = f.read()
+            filename = os.path.basename(audio_file)
+        elif hasattr(audio_file, 'file'):
+            # UploadFile object (FastAPI)
+            audio_file.file.seek(0)
+            file_content = audio_file.file.read()
+            filename = audio_file.filename
+            audio_file.file.seek(0)  # Reset for potential reuse
+        elif hasattr(audio_file, 'seek'):
+            # File-like object (BytesIO, etc.)
+            audio_file.seek(0)
+            file_content = audio_file.read()
+            filename = getattr(audio_file, 'name', 'audio.wav')
+            audio_file.seek(0)  # Reset for potential reuse
+        else:
+            # Try to read as bytes
+            if isinstance(audio_file, bytes):
+                file_content = audio_file
+                filename = 'audio.wav'
+            else:
+                file_content = audio_file.read()
+                filename = getattr(audio_file, 'name', 'audio.wav')
+        
+        return filename, file_content
+    
+    async def _independent_copies(self, audio_file, n: int) -> List:
+        """
+        Give each of `n` concurrent transcription attempts its own reader.
+        
+        Paths are opened separately by each attempt; anything else is read
+        once and wrapped in separate in-memory buffers (sharing the bytes)
+        that keep the original filename, so seeks and reads don't interleave.
+        """
+        if isinstance(audio_file, str):
+            return [audio_file] * n
+        
+        filename, file_content = await asyncio.to_thread(self._read_audio, audio_file)
+        copies = []
+        for _ in range(n):
+            buffer = io.BytesIO(file_content)
+            buffer.name = filename
+            copies.append(buffer)
+        return copies
+    
+    async def _race_transcriptions(self, audio_file, languages: List[Optional[str]]) -> Dict:
+        """
+        Run one transcription per language hint concurrently.
+        
+        Returns the first successful, non-empty result and cancels the rest;
+        if none succeed, returns the last attempt's (auto-detect) result.
+        """
+        copies = await self._independent_copies(audio_file, len(languages))
+        tasks = [
+            asyncio.create_task(self.transcribe_audio(copy, language=language))
+            for copy, language in zip(copies, languages)
+        ]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result['success'] and result.get('text', '').strip():
+                    return result
+            return tasks[-1].result()
+        finally:
+            # No-op for finished attempts; drops the ones still in flight
+            for task in tasks:
+                task.cancel()
+    
+    async def transcribe_with_fallback(
         self,
         audio_file,
         country: str = 'usa',
-        user_language: Optional[str] = None
+        user_language: Optional[str] = None,
+        speculative: Optional[bool] = None
     ) -> Dict:
         """
         Transcribe with language hinting and fallback.
@@ -338,6 +781,8 @@ class SpeechToTextHandler:
             audio_file: Audio file
             country: Country code for language hint
             user_language: Optional user preferred language (ISO 639-1)
+            speculative: Fire all attempts at once and keep the first
+                success (defaults to settings.STT_SPECULATIVE_FALLBACK)
 
         Returns:
             Transcription result
@@ -349,33 +794,73 @@ class SpeechToTextHandler:
             'usa': 'en'         # English (US)
         }
 
-        # 1) Use explicit user_language if provided
-        if user_language:
-            language = user_language
-            logger.info(f"🎤 Attempting transcription with user language hint: {language}")
-            result = self.transcribe_audio(audio_file, language=language)
+        country_language = language_hints.get(country, None)
 
-            # If transcription failed for explicit user_language, fall through to country hint
-            if result['success']:
-                return result
-            logger.info(f"🔄 Transcription with user language '{language}' failed, falling back...")
+        if speculative is None:
+            speculative = settings.STT_SPECULATIVE_FALLBACK
+        
+        # Oversized uploads are split and uploaded segment by segment; running
+        # hint attempts side by side would read the whole file into memory
+        # and split and upload it once per attempt, so try hints in turn
+        concurrent = not self._validate_audio_file(audio_file, allow_chunking=True).get('needs_chunking')
+        if not concurrent:
+            logger.info("🎤 Large upload: trying language hints one at a time")
+            speculative = False
+        
+        if speculative:
+            # Speculative: one call per distinct hint plus auto-detect, all at
+            # once, so a failing hint costs no extra latency
+            languages = list(dict.fromkeys(
+                language for language in (user_language, country_language) if language
+            ))
+            languages.append(None)
+            logger.info(f"🎤 Speculative transcription with hints: {languages}")
+            return await self._race_transcriptions(audio_file, languages)
+
+        if concurrent and user_language and country_language and user_language != country_language:
+            # 1+2) Run the user-language and country-hint attempts concurrently;
+            # the user's language still takes priority when both succeed
+            user_copy, country_copy = await self._independent_copies(audio_file, 2)
+            logger.info(f"🎤 Attempting transcription with user language hint: {user_language} "
+                        f"(country hint {country_language} in parallel)")
+            user_task = asyncio.create_task(self.transcribe_audio(user_copy, language=user_language))
+            country_task = asyncio.create_task(self.transcribe_audio(country_copy, language=country_language))
+
+            try:
+                result = await user_task
+                if result['success']:
+                    return result
+                logger.info(f"🔄 Transcription with user language '{user_language}' failed, falling back...")
 
-        # 2) Try country-specific hint
-        language = language_hints.get(country, None)
-        if language:
-            logger.info(f"🎤 Attempting transcription with country hint: {language} (country: {country})")
-            result = self.transcribe_audio(audio_file, language=language)
-            if result['success']:
-                return result
-            logger.info("🔄 Transcription with country hint failed, retrying without hint...")
+                result = await country_task
+                if result['success']:
+                    return result
+                logger.info("🔄 Transcription with country hint failed, retrying without hint...")
+            finally:
+                # No-op when already finished; otherwise drop the unneeded call
+                country_task.cancel()
+        else:
+            # 1) Use explicit user_language if provided, 2) then the country hint
+            for language in dict.fromkeys(language for language in (user_language, country_language) if language):
+                source = "user language" if language == user_language else f"country ({country})"
+                logger.info(f"🎤 Attempting transcription with {source} hint: {language}")
+                result = await self.transcribe_audio(audio_file, language=language)
+                if result['success']:
+                    return result
+                logger.info(f"🔄 Transcription with hint '{language}' failed, falling back...")
 
         # 3) Final attempt without any language hint (let model auto-detect)
-        result = self.transcribe_audio(audio_file, language=None)
+        result = await self.transcribe_audio(audio_file, language=None)
         return result
     
+    async def aclose(self):
+        """Close the pooled HTTP connections (unless the client was passed in)."""
+        if self._owns_client:
+            await self.client.close()
+    
     def get_supported_formats(self) -> list:
         """Get list of supported audio formats."""
-        return self.SUPPORTED_FORMATS.copy()
+        return list(self.SUPPORTED_FORMATS)
     
     def get_max_file_size(self) -> Dict:
         """Get maximum file size information."""
@@ -411,6 +896,13 @@ def get_stt_handler() -> SpeechToTextHandler:
     
     if _stt_handler_instance is None:
         logger.info("🔄 Initializing global STT handler (Groq Whisper)...")
-        _stt_handler_instance = SpeechToTextHandler()
+        from backend.core.http_client import get_http_client
+        _stt_handler_instance = SpeechToTextHandler(http_client=get_http_client())
     
-    return _stt_handler_instance
\ No newline at end of file
+    return _stt_handler_instance
+
+
+async def close_stt_handler():
+    """Close the global STT handler's connections (app shutdown)."""
+    if _stt_handler_instance is not None:
+        await _stt_handler_instance.aclose()
@@ -13,16 +13,136 @@ Why gTTS?
 - Good quality
 - Easy to use
 """
-from gtts import gTTS
 import os
+import io
+import asyncio
 import base64
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 import logging
+import re
+import threading
+
+# xxh3 hashes long answers much faster for cache keys; fall back to blake2b
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# pybase64 encodes with SIMD kernels; fall back to the stdlib encoder
+try:
+    import pybase64
+
+    def _b64encode_str(data: bytes) -> str:
+        return pybase64.b64encode_as_string(data)
+except ImportError:
+    def _b64encode_str(data: bytes) -> str:
+        return base64.b64encode(data).decode('ascii')
 
 logger = logging.getLogger(__name__)
 
+# In-memory cap for base64 audio kept by _Base64AudioCache
+BASE64_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# On-disk cap for cached audio files; least-frequently-used files go first
+AUDIO_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Once over the cap, evict down to this fraction of it, so a full cache
+# doesn't run an eviction pass on every new file
+AUDIO_CACHE_EVICT_TO = 0.9
+
+# Patterns used by _clean_text_for_speech (compiled once)
+_RE_BOLD = re.compile(r'\*\*([^*]+)\*\*')
+_RE_ITALIC = re.compile(r'\*([^*]+)\*')
+_RE_URL = re.compile(r'http[s]?://\S+')
+_RE_WS = re.compile(r'\s+')
+
+# gTTS makes one HTTPS request per ~100 chars, one after another. Long
+# answers are split into parts of this size that are fetched in parallel.
+TTS_PART_CHARS = 100
+TTS_MAX_WORKERS = 8
+_RE_PART_BREAK = re.compile(r'(?<=[.!?;:,])\s+')
+
+# Module-level pool for parallel part fetches
+_tts_executor = ThreadPoolExecutor(max_workers=TTS_MAX_WORKERS)
+
+
+def _split_for_tts(text: str, max_chars: int = TTS_PART_CHARS) -> List[str]:
+    """Split text into ordered parts of at most `max_chars`, at punctuation where possible."""
+    parts = []
+    current = ""
+    
+    for piece in _RE_PART_BREAK.split(text):
+        # Clauses longer than a part are cut at the last space that fits
+        while len(piece) > max_chars:
+            cut = piece.rfind(' ', 0, max_chars + 1)
+            if cut <= 0:
+                cut = max_chars
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(piece[:cut])
+            piece = piece[cut:].lstrip()
+        
+        if not current:
+            current = piece
+        elif len(current) + 1 + len(piece) <= max_chars:
+            current = f"{current} {piece}"
+        else:
+            parts.append(current)
+            current = piece
+    
+    if current:
+        parts.append(current)
+    return [part for part in parts if part.strip()]
+
+
+def _text_hash(text: str) -> str:
+    """Stable 96-bit hash of the text for audio cache filenames."""
+    # 24 hex chars: wide enough that a growing cache won't collide
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(text)[:24]
+    return hashlib.blake2b(text.encode(), digest_size=12).hexdigest()
+
+
+class _Base64AudioCache:
+    """
+    LRU of base64-encoded audio files, bounded by total encoded size.
+    
+    Keyed by (path, mtime) so a regenerated file is never served stale.
+    Repeated answers (greetings, fallbacks) then skip the disk read and
+    base64 encode.
+    """
+    
+    def __init__(self, max_bytes: int = BASE64_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, float], str]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple[str, float]) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key: Tuple[str, float], value: str):
+        if len(value) > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = value
+            self._total_bytes += len(value)
+            
+            while self._total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
+
 
 class TextToSpeechHandler:
     """
@@ -34,18 +154,36 @@ class TextToSpeechHandler:
     - Returns file path or base64 encoded audio
     """
     
-    def __init__(self, audio_dir: str = "backend/data/audio"):
+    def __init__(self, audio_dir: str = "backend/data/audio", max_cache_bytes: int = AUDIO_CACHE_MAX_BYTES):
         """
         Initialize TTS handler.
         
         Args:
             audio_dir: Directory to store audio files
+            max_cache_bytes: Total size of cached audio files to keep
         """
         self.audio_dir = audio_dir
+        self.max_cache_bytes = max_cache_bytes
         
         # Create audio directory if it doesn't exist
         os.makedirs(audio_dir, exist_ok=True)
         
+        # In-memory index of cached audio files (path → stat), scanned once
+        # here and kept current by _generate_audio/clear_cache, so cache
+        # lookups don't stat the disk. Assumes this handler owns audio_dir.
+        self._index: Dict[str, os.stat_result] = {
+            entry.path: entry.stat()
+            for entry in os.scandir(audio_dir)
+            if entry.is_file() and entry.name.endswith('.mp3')
+        }
+        # Cache hits per file (LFU eviction) and total cached bytes
+        self._hits: Dict[str, int] = {}
+        self._cache_bytes = sum(stat.st_size for stat in self._index.values())
+        self._index_lock = threading.Lock()
+        
+        # Recently served audio, already base64-encoded
+        self._base64_cache = _Base64AudioCache()
+        
         # Language mapping (ISO 639-1 code → gTTS language code)
         # gTTS supports 100+ languages
         self.language_map = {
@@ -110,13 +248,15 @@ class TextToSpeechHandler:
             lang_code = self._get_language_code(language, country)
             
             # Step 1: Check cache (avoid regenerating same audio)
-            audio_path = self._get_cached_audio(text, language, country)
+            audio_path = self._cache_path(text, language, country)
+            cached = audio_path in self._index
             
-            if audio_path and os.path.exists(audio_path):
+            if cached:
+                self._hits[audio_path] = self._hits.get(audio_path, 0) + 1
                 logger.info(f"✅ Using cached audio: {audio_path}")
             else:
                 # Step 2: Generate new audio
-                audio_path = self._generate_audio(text, lang_code, language, country)
+                self._generate_audio(text, lang_code, audio_path)
                 logger.info(f"✅ Generated new audio: {audio_path}")
             
             # Step 3: Return in requested format
@@ -125,14 +265,15 @@ class TextToSpeechHandler:
                 return {
                     'audio_base64': audio_data,
                     'format': 'mp3',
-                    'cached': os.path.exists(audio_path),
+                    'cached': cached,
                     'language': language
                 }
             else:
                 return {
                     'audio_path': audio_path,
+                    'audio_id': os.path.basename(audio_path),
                     'format': 'mp3',
-                    'cached': os.path.exists(audio_path),
+                    'cached': cached,
                     'language': language
                 }
                 
@@ -144,15 +285,14 @@ class TextToSpeechHandler:
                 'audio_base64': None
             }
     
-    def _generate_audio(self, text: str, lang_code: str, language: str, country: str) -> str:
+    def _generate_audio(self, text: str, lang_code: str, audio_path: str) -> str:
         """
         Generate audio file from text.
         
         Args:
             text: Text to convert
             lang_code: gTTS language code
-            language: ISO 639-1 language code
-            country: Country code
+            audio_path: Where to save the audio (from `_cache_path`)
             
         Returns:
             Path to generated audio file
@@ -163,18 +303,37 @@ class TextToSpeechHandler:
             text = text[:max_chars] + "..."
             logger.warning(f"⚠️ Text truncated to {max_chars} chars")
         
-        # Generate unique filename based on language, country, and text hash
-        text_hash = hashlib.md5(text.encode()).hexdigest()[:12]
-        filename = f"{language}_{country}_{text_hash}.mp3"
-        audio_path = os.path.join(self.audio_dir, filename)
+        # Imported on first use: workers that never synthesize don't pay for it
+        from gtts import gTTS
         
-        # Generate audio with gTTS
+        # Generate audio with gTTS: each part in parallel, MP3 frames
+        # concatenated in order (as gTTS itself does across its requests)
         logger.info(f"   Using gTTS language code: {lang_code}")
-        tts = gTTS(text=text, lang=lang_code, slow=False)
-        tts.save(audio_path)
+        parts = _split_for_tts(text)
+        
+        def synthesize(part: str) -> bytes:
+            buffer = io.BytesIO()
+            gTTS(text=part, lang=lang_code, slow=False).write_to_fp(buffer)
+            return buffer.getvalue()
+        
+        audio_parts = list(_tts_executor.map(synthesize, parts))
+        
+        # Write then rename, so a concurrent cache hit never reads a partial file
+        tmp_path = f"{audio_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            for audio in audio_parts:
+                f.write(audio)
+        os.replace(tmp_path, audio_path)
+        
+        stat = os.stat(audio_path)
+        with self._index_lock:
+            previous = self._index.get(audio_path)
+            self._cache_bytes += stat.st_size - (previous.st_size if previous else 0)
+            self._index[audio_path] = stat
+            self._evict_to_cap(keep=audio_path)
         
         # Get file size for logging
-        file_size = os.path.getsize(audio_path) / 1024  # KB
+        file_size = stat.st_size / 1024  # KB
         logger.info(f"   Audio file size: {file_size:.1f} KB")
         
         return audio_path
@@ -202,25 +361,32 @@ class TextToSpeechHandler:
         logger.warning(f"⚠️ Language '{language}' or country '{country}' not supported, using English")
         return 'en'
     
-    def _get_cached_audio(self, text: str, language: str, country: str) -> Optional[str]:
+    def _cache_path(self, text: str, language: str, country: str) -> str:
         """
-        Check if audio file already exists in cache.
+        Audio cache file path for a text (hashed once per request).
         
         Args:
-            text: Text to check
+            text: Text to convert (before any truncation)
             language: Language code
             country: Country code
             
         Returns:
-            Path to cached audio if exists, None otherwise
+            Path the audio is (or will be) cached at
         """
-        text_hash = hashlib.md5(text.encode()).hexdigest()[:12]
-        filename = f"{language}_{country}_{text_hash}.mp3"
-        audio_path = os.path.join(self.audio_dir, filename)
+        filename = f"{language}_{country}_{_text_hash(text)}.mp3"
+        return os.path.join(self.audio_dir, filename)
+    
+    def get_cached_audio_path(self, audio_id: str) -> Optional[str]:
+        """
+        Path of a cached audio file by its `audio_id` (file name).
         
-        if os.path.exists(audio_path):
-            return audio_path
-        return None
+        Returns:
+            The file path, or None if it isn't (or is no longer) cached
+        """
+        audio_path = os.path.join(self.audio_dir, audio_id)
+        if os.path.basename(audio_id) != audio_id or audio_path not in self._index:
+            return None
+        return audio_path
     
     def _audio_to_base64(self, audio_path: str) -> str:
         """
@@ -234,10 +400,17 @@ class TextToSpeechHandler:
         Returns:
             Base64 encoded audio string
         """
+        stat = self._index.get(audio_path)
+        key = (audio_path, stat.st_mtime if stat else os.path.getmtime(audio_path))
+        audio_base64 = self._base64_cache.get(key)
+        if audio_base64 is not None:
+            return audio_base64
+        
         with open(audio_path, 'rb') as audio_file:
             audio_bytes = audio_file.read()
-            audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
+        audio_base64 = _b64encode_str(audio_bytes)
         
+        self._base64_cache.put(key, audio_base64)
         return audio_base64
     
     def convert_answer_to_audio(
@@ -246,7 +419,8 @@ class TextToSpeechHandler:
         country: str,
         language: str = 'en',
         include_reasoning: bool = False,
-        reasoning_text: str = ""
+        reasoning_text: str = "",
+        return_format: str = 'base64'
     ) -> Dict:
         """
         Convert chat answer to audio.
@@ -259,6 +433,7 @@ class TextToSpeechHandler:
             language: Language code (ISO 639-1, e.g., 'en', 'hi', 'es')
             include_reasoning: Whether to include reasoning
             reasoning_text: Reasoning text
+            return_format: 'base64' or 'path'
             
         Returns:
             Audio info dictionary
@@ -273,7 +448,22 @@ class TextToSpeechHandler:
         full_text = self._clean_text_for_speech(full_text)
         
         # Generate audio
-        return self.text_to_speech(full_text, country=country, language=language, return_format='base64')
+        return self.text_to_speech(full_text, country=country, language=language, return_format=return_format)
+    
+    # Async entry points for the API: the whole sync path (gTTS requests,
+    # audio file write, cache read + base64 encode) runs in a worker thread
+    
+    async def atext_to_speech(self, *args, **kwargs) -> Dict:
+        """Async text_to_speech(): generation and disk I/O run off the event loop."""
+        return await asyncio.to_thread(self.text_to_speech, *args, **kwargs)
+    
+    async def aconvert_answer_to_audio(self, *args, **kwargs) -> Dict:
+        """Async convert_answer_to_audio(): generation and disk I/O run off the event loop."""
+        return await asyncio.to_thread(self.convert_answer_to_audio, *args, **kwargs)
+    
+    async def aclear_cache(self, older_than_days: int = 7) -> int:
+        """Async clear_cache(): file removal runs off the event loop."""
+        return await asyncio.to_thread(self.clear_cache, older_than_days)
     
     def _clean_text_for_speech(self, text: str) -> str:
         """
@@ -290,17 +480,15 @@ class TextToSpeechHandler:
         Returns:
             Cleaned text
         """
-        import re
-        
         # Remove markdown bold/italics
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)
+        text = _RE_BOLD.sub(r'\1', text)
+        text = _RE_ITALIC.sub(r'\1', text)
         
         # Remove URLs (or replace with "link")
-        text = re.sub(r'http[s]?://\S+', 'link', text)
+        text = _RE_URL.sub('link', text)
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _RE_WS.sub(' ', text).strip()
         
         return text
     
@@ -328,20 +516,53 @@ class TextToSpeechHandler:
         removed_count = 0
         current_time = time.time()
         
-        for filename in os.listdir(self.audio_dir):
-            file_path = os.path.join(self.audio_dir, filename)
-            
-            if os.path.isfile(file_path):
-                file_age_days = (current_time - os.path.getmtime(file_path)) / 86400
+        # Walk the in-memory index instead of listing/stat-ing the directory
+        with self._index_lock:
+            for file_path, stat in list(self._index.items()):
+                file_age_days = (current_time - stat.st_mtime) / 86400
                 
                 if file_age_days > older_than_days:
-                    os.remove(file_path)
+                    self._remove_cached(file_path)
                     removed_count += 1
         
         logger.info(f"🗑️ Cleared {removed_count} cached audio files older than {older_than_days} days")
         return removed_count
 
 
+    def _evict_to_cap(self, keep: str):
+        """
+        Delete cached files until the cache fits max_cache_bytes.
+        
+        Least-frequently-used files go first (ties: the oldest), down to
+        AUDIO_CACHE_EVICT_TO of the cap. Caller holds _index_lock.
+        """
+        if self._cache_bytes <= self.max_cache_bytes:
+            return
+        
+        # Rank once per eviction pass rather than once per victim
+        target_bytes = int(self.max_cache_bytes * AUDIO_CACHE_EVICT_TO)
+        victims = sorted(
+            (path for path in self._index if path != keep),
+            key=lambda path: (self._hits.get(path, 0), self._index[path].st_mtime)
+        )
+        for victim in victims:
+            if self._cache_bytes <= target_bytes:
+                break
+            logger.info(f"🗑️ Evicting cached audio: {victim}")
+            self._remove_cached(victim)
+    
+    def _remove_cached(self, file_path: str):
+        """Drop a cached file from disk and the index. Caller holds _index_lock."""
+        stat = self._index.pop(file_path, None)
+        self._hits.pop(file_path, None)
+        if stat is not None:
+            self._cache_bytes -= stat.st_size
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+
 # Global TTS handler instance
 _tts_handler_instance = None
 
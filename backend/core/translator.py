@@ -1,32 +1,317 @@
 """
-Translation module using googletrans (community package).
+Translation module using the public Google Translate endpoint.
 
-This implementation uses `googletrans` (free, unofficial). It includes a
-safe fallback so the backend won't crash if `googletrans` is not installed.
+Requests go straight to translate.googleapis.com over the process-wide
+pooled httpx.AsyncClient (httpx already ships with the Groq SDK), so translations
+never block the event loop and need no extra translation package. A
+semaphore caps how many run at once.
 
-If you prefer the paid Google Cloud Translation API, revert to the
-`google-cloud-translate` client implementation.
+If you prefer the paid Google Cloud Translation API, swap `_request` for
+the `google-cloud-translate` client.
 """
 
-from typing import Dict, Optional
+import asyncio
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Hashable, List, Mapping, Optional, Tuple, Union
+import hashlib
+import json
 import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import httpx
+
+from backend.core.http_client import HTTP2_ENABLED, get_http_client
+from backend.core.utils import normalize_language_code
 
 logger = logging.getLogger(__name__)
 
-# Try a best-effort top-level import; if it fails, we'll attempt a dynamic import
-# inside the handler so we can capture and log detailed exceptions at runtime.
+# Optional local language ID (fastText lid.176): detection without a request
 try:
-    from googletrans import Translator as GT_Translator, LANGUAGES as GT_LANGUAGES
-except Exception as import_exc:
-    GT_Translator = None
-    GT_LANGUAGES = {}
-    logger.debug(f"googletrans top-level import failed: {import_exc}")
+    import fasttext
+except ImportError:
+    fasttext = None
+
+# Free "gtx" web endpoint: one POST translates (and auto-detects) a text
+TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+TRANSLATE_TIMEOUT = 10.0
+# Concurrent translation requests (extra callers wait for a slot)
+TRANSLATE_MAX_CONCURRENCY = 32
+# Request rate kept under the endpoint's ~5 req/s limit (short bursts
+# allowed), so load queues briefly instead of tripping 429s
+TRANSLATE_RATE_PER_SEC = 5.0
+TRANSLATE_BURST = 5
+
+# Successful translations/detections are cached in-process: the same query
+# text (UI re-sends, common legal questions) skips the network round-trip.
+# Texts longer than CACHE_KEY_MAX_CHARS are keyed by a 128-bit digest.
+TRANSLATION_CACHE_SIZE = 4096
+DETECTION_CACHE_SIZE = 4096
+CACHE_KEY_MAX_CHARS = 256
+
+# Translations also persist in SQLite (WAL), so restarts and other workers
+# reuse them; the oldest rows are pruned past TRANSLATION_DB_MAX_ROWS
+TRANSLATION_DB_PATH = "backend/data/cache/translations.sqlite3"
+TRANSLATION_DB_MAX_ROWS = 200_000
+TRANSLATION_DB_PRUNE_EVERY = 1000
+
+# translate_batch packs texts into one request around a separator token the
+# translator leaves alone; packed requests stay under Google's ~5000-char cap
+BATCH_SEPARATOR = "\n@@@SEP@@@\n"
+BATCH_MAX_CHARS = 4500
+
+# Longer texts are split on sentence boundaries into chunks of at most this
+# many characters, translated concurrently and rejoined
+REQUEST_MAX_CHARS = 4500
+# Sentence end (Latin and CJK punctuation, Devanagari danda) plus the
+# whitespace after it; the capture group keeps the whitespace for rejoining
+_RE_SENTENCE_BREAK = re.compile(r'((?<=[.!?\u3002\uff01\uff1f\u0964])\s+)')
+
+# fastText language-ID model (download lid.176.ftz, ~1 MB, from
+# https://fasttext.cc/docs/en/language-identification.html). Local
+# detections below LID_MIN_CONFIDENCE defer to the translate endpoint.
+LID_MODEL_PATH = "backend/data/models/lid.176.ftz"
+LID_MIN_CONFIDENCE = 0.5
+
+
+# Text that is mostly non-linguistic (URLs, numbers, citations, code) is
+# returned as-is instead of spending a request on it
+_RE_URL_ONLY = re.compile(r'(?:https?://|www\.)\S+')
+_RE_ASCII_WORD = re.compile(r'[A-Za-z]{2,}')
+_RE_NON_WORD = re.compile(r'[\W\d_]')
+NON_LINGUISTIC_MAX_RATIO = 0.8
+
+
+def _is_translatable(text: str) -> bool:
+    """False for text with nothing worth translating (URL, numbers, symbols)."""
+    stripped = text.strip()
+    if stripped.isascii() and (len(stripped) < 3 or not _RE_ASCII_WORD.search(stripped)):
+        # Short non-ASCII words (CJK, Devanagari) still count as language
+        return False
+    if _RE_URL_ONLY.fullmatch(stripped):
+        return False
+    return len(_RE_NON_WORD.findall(stripped)) <= NON_LINGUISTIC_MAX_RATIO * len(stripped)
+
+
+# Plain-ASCII text using at least EN_MIN_STOPWORDS different ones of these
+# is taken as English without asking a model or the endpoint
+_EN_STOPWORDS = frozenset({
+    'the', 'and', 'is', 'of', 'a', 'to', 'in', 'that', 'it', 'for', 'on',
+})
+EN_MIN_STOPWORDS = 2
+EN_STOPWORD_CONFIDENCE = 0.95
+_RE_ASCII_TOKEN = re.compile(r"[a-z]+")
+
+
+def _looks_english(text: str) -> bool:
+    """Cheap check: ASCII text containing several distinct English function words."""
+    if not text.isascii():
+        return False
+    # Distinct words, so a repeated 'a' or 'in' (common in Spanish or
+    # Portuguese too) can't pass on its own
+    return len(_EN_STOPWORDS.intersection(_RE_ASCII_TOKEN.findall(text.lower()))) >= EN_MIN_STOPWORDS
+
+
+def _chunk_text(text: str, max_chars: int = REQUEST_MAX_CHARS) -> List[Tuple[str, str]]:
+    """
+    Split text into chunks of at most `max_chars`, on sentence breaks where
+    possible (a longer sentence is cut at its last space that fits).
+
+    Returns:
+        (chunk, whitespace that followed it) pairs; joining each chunk with
+        its whitespace reproduces the text
+    """
+    parts = _RE_SENTENCE_BREAK.split(text)
+    sentences = list(zip(parts[0::2], parts[1::2] + ['']))
+
+    chunks = []
+    current, current_sep = '', ''
+    for sentence, sep in sentences:
+        while len(sentence) > max_chars:
+            # Oversized sentence: flush, then cut it at a space
+            if current:
+                chunks.append((current, current_sep))
+                current, current_sep = '', ''
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            rest = sentence[cut:].lstrip(' ')
+            chunks.append((sentence[:cut], sentence[cut:len(sentence) - len(rest)]))
+            sentence = rest
+        if not sentence:
+            # Nothing left to place (text ends here, or an oversized
+            # sentence ended in spaces): keep its whitespace
+            if current:
+                current_sep += sep
+            elif chunks:
+                chunks[-1] = (chunks[-1][0], chunks[-1][1] + sep)
+            continue
+        if current and len(current) + len(current_sep) + len(sentence) > max_chars:
+            chunks.append((current, current_sep))
+            current, current_sep = '', ''
+        if current:
+            current += current_sep + sentence
+        else:
+            current = sentence
+        current_sep = sep
+    if current or not chunks:
+        chunks.append((current, current_sep))
+    return chunks
+
+
+def _text_key(text: str) -> str:
+    """Cache key for a text: the text itself when short, else its digest."""
+    if len(text) <= CACHE_KEY_MAX_CHARS:
+        return text
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class _LRUCache:
+    """Small thread-safe LRU cache with hit/miss counters."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def cache_info(self) -> Dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'max_size': self.max_size}
+
+
+_lid_model = None
+_lid_model_loaded = False
+_lid_model_lock = threading.Lock()
+
+
+def _get_lid_model():
+    """The fastText language-ID model, loaded once per process (None if unavailable)."""
+    global _lid_model, _lid_model_loaded
+    if not _lid_model_loaded:
+        with _lid_model_lock:
+            if not _lid_model_loaded:
+                if fasttext is not None and os.path.exists(LID_MODEL_PATH):
+                    try:
+                        _lid_model = fasttext.load_model(LID_MODEL_PATH)
+                        logger.info(f"🌍 fastText language ID loaded: {LID_MODEL_PATH}")
+                    except Exception as e:
+                        logger.warning(f"⚠️ Failed to load fastText language ID model: {e}")
+                _lid_model_loaded = True
+    return _lid_model
+
+
+class _AsyncTokenBucket:
+    """Async token bucket: `rate` acquisitions per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        # Waiters queue on the lock, so they're released in arrival order
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            # Sleep until one token has accrued, then spend it
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+
+
+class _DiskTranslationCache:
+    """
+    SQLite-backed translation cache shared across restarts and processes.
+
+    Rows are keyed by sha256 of (source, target, text key) and hold the
+    result dict as JSON. One connection per thread; calls block, so async
+    code runs them in a worker thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        self._puts = 0
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations "
+                "(key BLOB PRIMARY KEY, result TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS translations_created ON translations (created)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(cache_key: Tuple[str, str, str]) -> bytes:
+        text_key, source, target = cache_key
+        return hashlib.sha256(f"{source}\0{target}\0{text_key}".encode('utf-8')).digest()
+
+    def get(self, cache_key: Tuple[str, str, str]) -> Optional[Dict]:
+        row = self._connection().execute(
+            "SELECT result FROM translations WHERE key = ?", (self._key(cache_key),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, cache_key: Tuple[str, str, str], result: Dict):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO translations (key, result, created) VALUES (?, ?, ?)",
+                (self._key(cache_key), json.dumps(result, ensure_ascii=False), time.time())
+            )
+        self._puts += 1
+        if self._puts % TRANSLATION_DB_PRUNE_EVERY == 0:
+            self._prune()
+
+    def _prune(self):
+        with self._connection() as conn:
+            conn.execute(
+                "DELETE FROM translations WHERE key IN (SELECT key FROM translations "
+                "ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (TRANSLATION_DB_MAX_ROWS,)
+            )
 
 
 class TranslationHandler:
-    """Translation handler using googletrans with graceful fallback."""
+    """Async translation handler backed by the Google Translate web endpoint."""
 
-    SUPPORTED_LANGUAGES = {
+    # Read-only, so it can be handed out without copying
+    SUPPORTED_LANGUAGES: Mapping[str, str] = MappingProxyType({
         'en': 'English',
         'hi': 'Hindi',
         'es': 'Spanish',
@@ -46,148 +331,355 @@ class TranslationHandler:
         'te': 'Telugu',
         'ta': 'Tamil',
         'bn': 'Bengali',
-    }
-
-    def __init__(self):
-        # If the top-level import failed earlier, try importing dynamically now
-        if GT_Translator is None:
-            try:
-                from googletrans import Translator as GT_Translator_local, LANGUAGES as GT_LANGUAGES_local
-                try:
-                    self.translator = GT_Translator_local()
-                    # update module-level references for any future handlers
-                    globals()['GT_Translator'] = GT_Translator_local
-                    globals()['GT_LANGUAGES'] = GT_LANGUAGES_local
-                    logger.info("🌍 googletrans Translator dynamically initialized")
-                except Exception as e:
-                    logger.error(f"❌ Failed to instantiate googletrans Translator after dynamic import: {e}")
-                    self.translator = None
-            except Exception as dyn_exc:
-                # googletrans import failed; try a lightweight fallback (deep_translator)
-                logger.debug(f"googletrans dynamic import failed: {dyn_exc}")
-                try:
-                    from deep_translator import GoogleTranslator as DeepGoogleTranslator
-                    try:
-                        # We'll use deep-translator for translations (no httpx/httpcore dependency)
-                        self.translator = DeepGoogleTranslator(source='auto', target='en')
-                        globals()['GT_Translator'] = None
-                        globals()['GT_LANGUAGES'] = {}
-                        # mark that we are using deep-translator (handle in translate_text)
-                        self._use_deep_translator = True
-                        logger.info("🌍 deep-translator GoogleTranslator initialized as fallback")
-                    except Exception as e2:
-                        logger.error(f"❌ Failed to initialize deep_translator: {e2}")
-                        self.translator = None
-                        self._use_deep_translator = False
-                except Exception as e3:
-                    logger.warning(f"⚠️ Translator imports failed at runtime: {dyn_exc}; {e3}. Translator disabled. Install `googletrans==4.0.0-rc1` or `deep-translator` in the backend venv to enable.")
-                    self.translator = None
-                    self._use_deep_translator = False
-        else:
-            try:
-                self.translator = GT_Translator()
-                logger.info("🌍 googletrans Translator initialized")
-            except Exception as e:
-                logger.error(f"❌ Failed to initialize googletrans translator: {e}")
-                self.translator = None
-        # Ensure flag exists
-        if not hasattr(self, '_use_deep_translator'):
-            self._use_deep_translator = False
-
-    def detect_language(self, text: str) -> Dict:
+    })
+
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            http_client: Shared client to send requests through (the caller
+                keeps ownership and closes it); by default the handler
+                creates and closes its own pool
+        """
+        # One pooled keep-alive client shared by every translation (the
+        # handler is a process-wide singleton)
+        self._owns_client = http_client is None
+        self.client = http_client or httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60),
+            timeout=TRANSLATE_TIMEOUT
+        )
+        self._semaphore = asyncio.Semaphore(TRANSLATE_MAX_CONCURRENCY)
+        self._rate_limiter = _AsyncTokenBucket(TRANSLATE_RATE_PER_SEC, TRANSLATE_BURST)
+
+        # Successful results only; failures are retried on the next call
+        self._translation_cache = _LRUCache(TRANSLATION_CACHE_SIZE)
+        self._detection_cache = _LRUCache(DETECTION_CACHE_SIZE)
+        try:
+            self._disk_cache = _DiskTranslationCache(TRANSLATION_DB_PATH)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"⚠️ Persistent translation cache disabled: {e}")
+            self._disk_cache = None
+
+        # Local language ID when fasttext and the model file are available
+        self._lid_model = _get_lid_model()
+
+        logger.info("🌍 Translator initialized (Google Translate endpoint)")
+
+    async def aclose(self):
+        """Close the pooled HTTP connections (unless the client was passed in)."""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def _request(self, text: str, target_lang: str, source_lang: Optional[str]) -> Tuple[str, str, float]:
+        """
+        Translate text of any length.
+
+        Text over REQUEST_MAX_CHARS is split on sentence boundaries and the
+        chunks are sent concurrently (still through the rate limiter and
+        semaphore); the source language reported is the first chunk's.
+
+        Returns:
+            (translated text, source language - detected when not given,
+            detection confidence - 1.0 when the source was given)
+        """
+        if len(text) <= REQUEST_MAX_CHARS:
+            return await self._request_one(text, target_lang, source_lang)
+
+        chunks = _chunk_text(text)
+        translations = await asyncio.gather(*[
+            self._request_one(chunk, target_lang, source_lang) for chunk, _ in chunks
+        ])
+        translated = ''.join(
+            translation + sep for (translation, _, _), (_, sep) in zip(translations, chunks)
+        )
+        _, source, confidence = translations[0]
+        return translated, source, confidence
+
+    async def _request_one(self, text: str, target_lang: str, source_lang: Optional[str]) -> Tuple[str, str, float]:
+        """
+        One translation round-trip.
+
+        Returns:
+            (translated text, source language - detected when not given,
+            detection confidence - 1.0 when the source was given)
+        """
+        source = source_lang if source_lang and source_lang != 'auto' else 'auto'
+        await self._rate_limiter.acquire()
+        async with self._semaphore:
+            response = await self.client.post(
+                TRANSLATE_URL,
+                params={'client': 'gtx', 'sl': source, 'tl': target_lang, 'dt': 't', 'dj': '1'},
+                data={'q': text},
+                timeout=TRANSLATE_TIMEOUT
+            )
+        response.raise_for_status()
+        payload = response.json()
+
+        translated = ''.join(sentence.get('trans', '') for sentence in payload.get('sentences', []))
+        if source == 'auto':
+            detected = normalize_language_code(payload.get('src')) or 'auto'
+            confidence = float(payload.get('confidence', 0.0))
+            return translated, detected, confidence
+        return translated, source, 1.0
+
+    def _detect_local(self, text: str) -> Optional[Tuple[str, float]]:
+        """
+        (language, confidence) without a request - the English stopword
+        check, then the fastText model; None when neither is sure.
+        """
+        if _looks_english(text):
+            return 'en', EN_STOPWORD_CONFIDENCE
+        if self._lid_model is None:
+            return None
+        try:
+            # predict() rejects newlines
+            labels, probs = self._lid_model.predict(text.replace('\n', ' '), k=1)
+        except ValueError as e:
+            # e.g. fasttext builds that predate numpy 2
+            logger.warning(f"⚠️ fastText language ID failed, using the translate endpoint: {e}")
+            self._lid_model = None
+            return None
+        confidence = float(probs[0])
+        if confidence < LID_MIN_CONFIDENCE:
+            return None
+        return labels[0].replace('__label__', ''), confidence
+
+    async def _cached_translation(self, cache_key: Tuple[str, str, str]) -> Optional[Dict]:
+        """Cached result for `cache_key`: memory first, then the SQLite cache."""
+        cached = self._translation_cache.get(cache_key)
+        if cached is not None or self._disk_cache is None:
+            return cached
+        try:
+            cached = await asyncio.to_thread(self._disk_cache.get, cache_key)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Translation cache read failed: {e}")
+            return None
+        if cached is not None:
+            self._translation_cache.put(cache_key, cached)
+        return cached
+
+    async def _store_translation(self, cache_key: Tuple[str, str, str], result: Dict):
+        """Remember a successful translation in memory and in the SQLite cache."""
+        self._translation_cache.put(cache_key, result)
+        if self._disk_cache is None:
+            return
+        try:
+            await asyncio.to_thread(self._disk_cache.put, cache_key, result)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Translation cache write failed: {e}")
+
+    async def detect_language(self, text: str) -> Dict:
         if not text:
             return {'language': 'en', 'confidence': 0.0, 'language_name': 'English', 'success': False, 'error': 'No text provided'}
 
-        if not self.translator:
-            return {'language': 'en', 'confidence': 0.0, 'language_name': 'English', 'success': False, 'error': 'Translator not available'}
+        cache_key = _text_key(text)
+        cached = self._detection_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        local = self._detect_local(text)
+        if local is not None:
+            lang, conf = local
+            result = {'language': lang, 'confidence': conf, 'language_name': self.SUPPORTED_LANGUAGES.get(lang, lang), 'success': True}
+            self._detection_cache.put(cache_key, result)
+            return dict(result)
 
         try:
-            detection = self.translator.detect(text)
-            lang = getattr(detection, 'lang', None) or (detection[0].lang if isinstance(detection, (list, tuple)) else None)
-            conf = getattr(detection, 'confidence', None) or (detection[0].confidence if isinstance(detection, (list, tuple)) else 0.0)
-            language_name = self.SUPPORTED_LANGUAGES.get(lang, GT_LANGUAGES.get(lang, lang))
-
-            return {'language': lang, 'confidence': conf, 'language_name': language_name, 'success': True}
-        except Exception as e:
-            logger.error(f"❌ googletrans detect failed: {e}")
+            # Detection rides on a translation to English (the endpoint
+            # reports the source language it detected)
+            translated_text, lang, conf = await self._request(text, 'en', None)
+            language_name = self.SUPPORTED_LANGUAGES.get(lang, lang)
+            result = {'language': lang, 'confidence': conf, 'language_name': language_name, 'success': True}
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"❌ Language detection failed: {e}")
             return {'language': 'en', 'confidence': 0.0, 'language_name': 'English', 'success': False, 'error': str(e)}
 
-    def translate_text(self, text: str, target_lang: str = 'en', source_lang: Optional[str] = None) -> Dict:
+        self._detection_cache.put(cache_key, result)
+        if lang != 'en':
+            # The usual next step (translating the text to English) is
+            # already done: keep it so that call is a cache hit
+            self._translation_cache.put(
+                (cache_key, lang, 'en'),
+                {'text': translated_text, 'source_lang': lang, 'target_lang': 'en', 'translated': True, 'original_text': text, 'confidence': 1.0, 'success': True}
+            )
+        return dict(result)
+
+    async def translate_text(self, text: str, target_lang: str = 'en', source_lang: Optional[str] = None) -> Dict:
+        target_lang = normalize_language_code(target_lang)
+        source_lang = normalize_language_code(source_lang)
         if not text:
             return {'text': '', 'source_lang': 'unknown', 'target_lang': target_lang, 'translated': False, 'original_text': '', 'error': 'Empty text provided', 'success': False}
 
-        if not self.translator:
-            logger.warning("⚠️ Translator not available; returning original text")
-            return {'text': text, 'source_lang': source_lang or 'unknown', 'target_lang': target_lang, 'translated': False, 'original_text': text, 'error': 'Translator not available', 'success': False}
+        if source_lang == target_lang:
+            return self._untranslated(text, target_lang)
+
+        if not _is_translatable(text):
+            return {'text': text, 'source_lang': source_lang or 'unknown', 'target_lang': target_lang, 'translated': False, 'original_text': text, 'note': 'non-translatable', 'success': True}
+
+        cache_key = (_text_key(text), source_lang or 'auto', target_lang)
+        cached = await self._cached_translation(cache_key)
+        if cached is not None:
+            return {**cached, 'original_text': text}
+
+        if source_lang is None or source_lang == 'auto':
+            # Text already in the target language needs no request
+            local = self._detect_local(text)
+            if local is not None and local[0] == target_lang:
+                return self._untranslated(text, target_lang, local[1])
 
         try:
-            # Auto-detect if needed
-            if source_lang is None or source_lang == 'auto':
-                det = self.detect_language(text)
-                source_lang = det.get('language', 'auto')
-                confidence = det.get('confidence', 0.0)
-            else:
-                confidence = 1.0
+            # With no source language the endpoint detects it in the same request
+            translated_text, source_lang, confidence = await self._request(text, target_lang, source_lang)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"❌ Translation failed: {e}")
+            return {'text': text, 'source_lang': source_lang or 'unknown', 'target_lang': target_lang, 'translated': False, 'original_text': text, 'error': str(e), 'success': False}
+
+        if source_lang == target_lang:
+            result = self._untranslated(text, target_lang, confidence)
+        else:
+            result = {'text': translated_text, 'source_lang': source_lang, 'target_lang': target_lang, 'translated': True, 'original_text': text, 'confidence': confidence, 'success': True}
+
+        await self._store_translation(cache_key, result)
+        return dict(result)
+
+    async def translate_batch(self, texts: List[str], target_lang: str = 'en', source_lang: Optional[str] = None) -> List[Dict]:
+        """
+        Translate several texts in one request.
 
-            if source_lang == target_lang:
-                return {'text': text, 'source_lang': source_lang, 'target_lang': target_lang, 'translated': False, 'original_text': text, 'confidence': confidence, 'note': 'Source and target languages match', 'success': True}
+        Repeated texts are translated once. Uncached texts are joined around
+        BATCH_SEPARATOR, translated in a single round-trip and split again. If the split doesn't give back
+        one part per text (the translator mangled a separator) or the packed
+        text would be too long, the texts are translated individually
+        (concurrently) instead.
 
-            # If we're using googletrans (GT_Translator) -> use its API
-            if not self._use_deep_translator and getattr(self, 'translator', None) is not None:
-                # googletrans.translate(text, dest='en', src='auto')
-                trans = self.translator.translate(text, dest=target_lang, src=source_lang if source_lang and source_lang != 'auto' else 'auto')
-                translated_text = getattr(trans, 'text', None) or (trans[0].text if isinstance(trans, (list, tuple)) else str(trans))
+        Returns:
+            One translate_text()-style result per input text, in order
+        """
+        target_lang = normalize_language_code(target_lang)
+        source_lang = normalize_language_code(source_lang)
+        if source_lang == target_lang:
+            # translate_text answers these without a request
+            return [await self.translate_text(text, target_lang, source_lang) for text in texts]
+
+        unique = list(dict.fromkeys(texts))
+        results: List[Optional[Dict]] = [None] * len(unique)
+        pending = []
+        for i, text in enumerate(unique):
+            if not text or not _is_translatable(text):
+                # translate_text answers these without a request
+                results[i] = await self.translate_text(text, target_lang, source_lang)
+                continue
+            cached = await self._cached_translation((_text_key(text), source_lang or 'auto', target_lang))
+            if cached is not None:
+                results[i] = {**cached, 'original_text': text}
             else:
-                # Fallback: use deep-translator (requests-based) which doesn't provide detection
-                try:
-                    # If source_lang is not provided, attempt language detection via langdetect
-                    if source_lang is None or source_lang == 'auto':
-                        try:
-                            from langdetect import detect
-                            detected = detect(text)
-                            source_lang = detected
-                        except Exception:
-                            source_lang = 'auto'
-
-                    # deep_translator's GoogleTranslator supports init with source & target
-                    from deep_translator import GoogleTranslator as DeepGoogleTranslator
-                    dt = DeepGoogleTranslator(source=source_lang if source_lang and source_lang != 'auto' else 'auto', target=target_lang)
-                    translated_text = dt.translate(text)
-                except Exception as e:
-                    logger.error(f"❌ deep-translator translate failed: {e}")
-                    return {'text': text, 'source_lang': source_lang or 'unknown', 'target_lang': target_lang, 'translated': False, 'original_text': text, 'error': str(e), 'success': False}
-
-            return {'text': translated_text, 'source_lang': source_lang, 'target_lang': target_lang, 'translated': True, 'original_text': text, 'confidence': confidence, 'success': True}
-
-        except Exception as e:
-            logger.error(f"❌ googletrans translate failed: {e}")
-            return {'text': text, 'source_lang': source_lang or 'unknown', 'target_lang': target_lang, 'translated': False, 'original_text': text, 'error': str(e), 'success': False}
+                pending.append(i)
+
+        if len(pending) > 1:
+            packed = await self._translate_packed([unique[i] for i in pending], target_lang, source_lang)
+            if packed is not None:
+                for i, result in zip(pending, packed):
+                    results[i] = result
+                pending = []
 
-    def translate_query_to_english(self, query: str, user_language: str = 'en') -> Dict:
+        singles = await asyncio.gather(*[
+            self.translate_text(unique[i], target_lang, source_lang) for i in pending
+        ])
+        for i, result in zip(pending, singles):
+            results[i] = result
+
+        if len(unique) == len(texts):
+            return results
+        by_text = dict(zip(unique, results))
+        return [dict(by_text[text]) for text in texts]
+
+    async def _translate_packed(self, texts: List[str], target_lang: str, source_lang: Optional[str]) -> Optional[List[Dict]]:
+        """Single-request translation of `texts`; None when it must fall back to per-text calls."""
+        joined = BATCH_SEPARATOR.join(texts)
+        if len(joined) > BATCH_MAX_CHARS:
+            return None
+        cache_source = source_lang or 'auto'  # cache key uses the language as requested
+
+        try:
+            translated, source_lang, confidence = await self._request(joined, target_lang, source_lang)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"⚠️ Batch translation failed, translating texts one by one: {e}")
+            return None
+        if source_lang == target_lang:
+            return None  # already in the target language; translate_text reports that per text
+
+        parts = [part.strip() for part in translated.split(BATCH_SEPARATOR.strip())]
+        if len(parts) != len(texts):
+            logger.warning(f"⚠️ Batch translation returned {len(parts)} parts for {len(texts)} texts; translating one by one")
+            return None
+
+        results = []
+        for text, part in zip(texts, parts):
+            result = {'text': part, 'source_lang': source_lang, 'target_lang': target_lang, 'translated': True, 'original_text': text, 'confidence': confidence, 'success': True}
+            await self._store_translation((_text_key(text), cache_source, target_lang), result)
+            results.append(dict(result))
+        return results
+
+    @staticmethod
+    def _untranslated(text: str, language: str, confidence: float = 1.0) -> Dict:
+        """Result for text already in the target language (no request made)."""
+        return {'text': text, 'source_lang': language, 'target_lang': language, 'translated': False, 'original_text': text, 'confidence': confidence, 'note': 'Source and target languages match', 'success': True}
+
+    async def translate_query_to_english(self, query: Union[str, List[str]], user_language: str = 'en') -> Union[Dict, List[Dict]]:
+        user_language = normalize_language_code(user_language) or 'en'
+        if user_language == 'en':
+            # English users never touch the network
+            return await self.translate_batch(query, 'en', 'en') if isinstance(query, list) else await self.translate_text(query, 'en', 'en')
         logger.info(f"📝 Translating query to English (from {user_language})")
-        return self.translate_text(text=query, target_lang='en', source_lang=user_language)
+        if isinstance(query, list):
+            return await self.translate_batch(query, target_lang='en', source_lang=user_language)
+        return await self.translate_text(text=query, target_lang='en', source_lang=user_language)
 
-    def translate_answer_to_user_language(self, answer: str, user_language: str = 'en') -> Dict:
+    async def translate_answer_to_user_language(self, answer: Union[str, List[str]], user_language: str = 'en') -> Union[Dict, List[Dict]]:
+        user_language = normalize_language_code(user_language) or 'en'
+        if user_language == 'en':
+            return await self.translate_batch(answer, 'en', 'en') if isinstance(answer, list) else await self.translate_text(answer, 'en', 'en')
         logger.info(f"📝 Translating answer from English to {user_language}")
-        return self.translate_text(text=answer, target_lang=user_language, source_lang='en')
+        if isinstance(answer, list):
+            return await self.translate_batch(answer, target_lang=user_language, source_lang='en')
+        return await self.translate_text(text=answer, target_lang=user_language, source_lang='en')
 
-    def get_supported_languages(self) -> Dict[str, str]:
-        return self.SUPPORTED_LANGUAGES.copy()
+    def get_supported_languages(self) -> Mapping[str, str]:
+        """Read-only code → name mapping (use dict() on it for a mutable copy)."""
+        return self.SUPPORTED_LANGUAGES
 
     def is_language_supported(self, language_code: str) -> bool:
-        return language_code in self.SUPPORTED_LANGUAGES
+        return normalize_language_code(language_code) in self.SUPPORTED_LANGUAGES
 
     def get_language_name(self, language_code: str) -> str:
-        return self.SUPPORTED_LANGUAGES.get(language_code, GT_LANGUAGES.get(language_code, 'Unknown'))
+        return self.SUPPORTED_LANGUAGES.get(normalize_language_code(language_code), 'Unknown')
+
+    def cache_info(self) -> Dict[str, Dict]:
+        """Hit/miss counters and sizes of the translation and detection caches."""
+        return {
+            'translation': self._translation_cache.cache_info(),
+            'detection': self._detection_cache.cache_info(),
+        }
 
 
 # Global translator instance
 _translator_instance = None
+_translator_lock = threading.Lock()
 
 
 def get_translator() -> TranslationHandler:
     global _translator_instance
     if _translator_instance is None:
-        logger.info("🔄 Initializing global translator instance (googletrans)...")
-        _translator_instance = TranslationHandler()
+        # Double-checked so concurrent first requests build one handler
+        # (one HTTP pool, one SQLite cache, one language-ID model)
+        with _translator_lock:
+            if _translator_instance is None:
+                logger.info("🔄 Initializing global translator instance...")
+                _translator_instance = TranslationHandler(http_client=get_http_client())
     return _translator_instance
+
+
+async def close_translator():
+    """Close the global translator's connections (app shutdown)."""
+    if _translator_instance is not None:
+        await _translator_instance.aclose()
@@ -1 +1,34 @@
 # Misc helper functions
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+# Other spellings of the language codes used across the app (ISO 639-1,
+# lowercase). Region suffixes are dropped unless listed here.
+LANGUAGE_ALIASES: Mapping[str, str] = MappingProxyType({
+    'eng': 'en',
+    'iw': 'he',       # Google's legacy code for Hebrew
+    'jw': 'jv',       # ... and for Javanese
+    'zh-cn': 'zh',
+    'zh-hans': 'zh',
+    'zh-sg': 'zh',
+    'zh-tw': 'zh-TW',  # Traditional Chinese keeps its region
+    'zh-hant': 'zh-TW',
+    'zh-hk': 'zh-TW',
+})
+
+
+@lru_cache(maxsize=256)
+def normalize_language_code(lang: Optional[str]) -> Optional[str]:
+    """
+    Canonical language code: 'EN', 'en-US', 'en_GB' and 'eng' all give 'en'.
+
+    Empty values and 'auto' are returned unchanged.
+    """
+    if not lang:
+        return lang
+    code = lang.strip().lower().replace('_', '-')
+    if code in LANGUAGE_ALIASES:
+        return LANGUAGE_ALIASES[code]
+    base = code.split('-', 1)[0]
+    return LANGUAGE_ALIASES.get(base, base)
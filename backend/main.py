@@ -5,18 +5,37 @@ Includes RAG chat, feedback, and analytics endpoints.
 
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import ENCODERS_BY_TYPE
+from fastapi.responses import JSONResponse, ORJSONResponse
+from bson import ObjectId
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
+import time
 
 # Core configuration
 from backend.core.config import settings
 from backend.core.database import Database, get_database
 from backend.core.crud import QueryLogCRUD, FeedbackCRUD
 from backend.core.retriever import preload_retrievers
+from backend.core.embeddings import preload_embedding_model
+from backend.core.llm_handler import close_llm_handler
+from backend.core.speech_to_text import close_stt_handler
+from backend.core.translator import get_translator, close_translator
+from backend.core.http_client import close_http_client
 
 # Routers
 from backend.routers import chat, feedback
 
+# orjson serializes responses (datetimes included) in C; ORJSONResponse
+# needs it installed, so fall back to the stdlib-backed JSONResponse
+try:
+    import orjson  # noqa: F401
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
 # ====================== Logging Configuration ======================
 
 logging.basicConfig(
@@ -34,14 +53,30 @@ async def lifespan(app: FastAPI):
     try:
         # Startup
         logger.info(f"🚀 Starting {settings.PROJECT_NAME}...")
+        # Blocking work (FAISS search, gTTS, DB reads) runs via asyncio.to_thread;
+        # size its pool explicitly rather than relying on the CPU-count default
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=settings.THREAD_POOL_WORKERS, thread_name_prefix="lexivoice")
+        )
         Database.connect_db()
         logger.info("✅ Database connected successfully")
+        # Load + warm up the embedding model before the first request
+        try:
+            preload_embedding_model()
+        except Exception as e:
+            logger.warning(f"Could not preload embedding model: {e}")
         # Preload FAISS retrievers (loads indexes in background)
         try:
             preload_retrievers()
             logger.info("✅ FAISS retrievers scheduled for background loading")
         except Exception as e:
             logger.warning(f"Could not preload FAISS retrievers: {e}")
+        # Build the translator (HTTP pool, translation cache, language ID)
+        # now rather than on the first non-English request
+        try:
+            get_translator()
+        except Exception as e:
+            logger.warning(f"Could not initialize translator: {e}")
         logger.info("✅ Application started successfully")
         yield
     except Exception as e:
@@ -50,17 +85,26 @@ async def lifespan(app: FastAPI):
     finally:
         # Shutdown
         logger.info("🔄 Shutting down application...")
+        QueryLogCRUD.flush()
+        await close_llm_handler()
+        await close_stt_handler()
+        await close_translator()
+        await close_http_client()
         Database.close_db()
         logger.info("👋 Application stopped")
 
 
 # ====================== FastAPI App Setup ======================
 
+# Serialize raw MongoDB documents (CRUD reads return ObjectId `_id`s)
+ENCODERS_BY_TYPE[ObjectId] = str
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="AI-Powered Multilingual Legal Assistant with RAG (MVP)",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=DefaultResponse
 )
 
 # CORS Configuration
@@ -75,10 +119,31 @@ app.add_middleware(
 
 # ====================== Root & Health Endpoints ======================
 
+# /health answers from the last DB ping and refreshes it in the background
+# once it's older than this, so frequent probes don't each hit MongoDB
+HEALTH_CHECK_TTL = 2.0
+_db_health = {"ok": False, "checked_at": None}
+_db_health_refresh = None  # in-flight refresh task
+
+
+async def _refresh_db_health():
+    _db_health["ok"] = await asyncio.to_thread(Database.health_check)
+    _db_health["checked_at"] = time.monotonic()
+
+
 @app.get("/health")
-def health_check():
-    """Health check endpoint with database status."""
-    db_healthy = Database.health_check()
+async def health_check():
+    """Health check endpoint with (cached) database status."""
+    global _db_health_refresh
+    
+    if _db_health["checked_at"] is None:
+        # First probe: nothing cached yet, so check inline
+        await _refresh_db_health()
+    elif time.monotonic() - _db_health["checked_at"] > HEALTH_CHECK_TTL:
+        if _db_health_refresh is None or _db_health_refresh.done():
+            _db_health_refresh = asyncio.create_task(_refresh_db_health())
+    
+    db_healthy = _db_health["ok"]
     return {
         "status": "healthy" if db_healthy else "degraded",
         "service": settings.PROJECT_NAME,
@@ -107,28 +172,19 @@ def root():
 # ====================== Statistics Endpoint ======================
 
 @app.get(f"{settings.API_V1_PREFIX}/stats")
-def get_stats(db=Depends(get_database)):
+async def get_stats(db=Depends(get_database)):
     """Fetch overall system statistics and analytics."""
     try:
-        # Total queries
-        total_queries = db.query_logs.count_documents({})
-
-        # Country-wise breakdown
-        country_pipeline = [
-            {"$group": {"_id": "$country", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]
-        country_stats = list(db.query_logs.aggregate(country_pipeline))
-
-        # Feedback statistics
-        feedback_stats = FeedbackCRUD.get_feedback_stats(db)
+        # Query and feedback stats are one aggregation each; run them
+        # side by side so the endpoint waits for a single round-trip
+        query_stats, feedback_stats = await asyncio.gather(
+            asyncio.to_thread(QueryLogCRUD.get_query_stats, db),
+            asyncio.to_thread(FeedbackCRUD.get_feedback_stats, db)
+        )
 
         return {
-            "total_queries": total_queries,
-            "queries_by_country": [
-                {"country": item["_id"], "count": item["count"]}
-                for item in country_stats
-            ],
+            "total_queries": query_stats["total_queries"],
+            "queries_by_country": query_stats["queries_by_country"],
             "feedback": feedback_stats
         }
     except Exception as e:
@@ -136,6 +192,12 @@ def get_stats(db=Depends(get_database)):
         return {"error": "Failed to fetch statistics"}
 
 
+@app.get(f"{settings.API_V1_PREFIX}/cache-stats")
+def get_cache_stats():
+    """Hit/miss statistics of the in-process translation caches."""
+    return {"translator": get_translator().cache_info()}
+
+
 # ====================== Include Routers ======================
 
 # Main RAG chat endpoint
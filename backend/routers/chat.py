@@ -2,25 +2,109 @@
 Chat router - Main RAG endpoint with optional TTS & voice support.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from pymongo.database import Database
-from datetime import datetime
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterator, Dict, Any, List, Tuple
+from collections import OrderedDict, deque
+import asyncio
+import copy
+import re
+import threading
+import json
+import os
 import time
 import logging
 
-from backend.core.schemas import ChatRequest, ChatResponse, SourceDocument
+from backend.core.config import settings
+from backend.core.schemas import ChatRequest, ChatResponse, CountryEnum
 from backend.core.database import get_database
 from backend.core.retriever import get_retriever
 from backend.core.llm_handler import get_llm_handler
 from backend.core.text_to_speech import get_tts_handler   # ← TTS handler used by text endpoint
+from backend.core.speech_to_text import get_stt_handler
 from backend.core.translator import get_translator   # ← Translation handler for multilingual support
 from backend.core.crud import QueryLogCRUD
+from backend.core.utils import normalize_language_code
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Retrieval results cache: repeated questions skip the embedding + FAISS search
+RETRIEVAL_CACHE_SIZE = 2048
+RETRIEVAL_CACHE_TTL = 900  # seconds; an index rebuild is picked up after this
+_RE_WHITESPACE = re.compile(r'\s+')
+
+# Streamed non-English answers are translated in pieces of at least this
+# many characters, cut at sentence ends, while the LLM is still writing
+STREAM_TRANSLATE_MIN_CHARS = 200
+_RE_SENTENCE_END = re.compile(r'[.!?]\s')
+
+
+class _RetrievalCache:
+    """Thread-safe LRU of search results whose entries expire after a TTL."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value: List[Dict]):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        with self._lock:
+            cleared = len(self._entries)
+            self._entries.clear()
+            return cleared
+
+    def cache_info(self) -> Dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries),
+                    'max_size': self.max_size, 'ttl': self.ttl}
+
+
+_retrieval_cache = _RetrievalCache(RETRIEVAL_CACHE_SIZE, RETRIEVAL_CACHE_TTL)
+
+
+def _retrieve_cached(country: str, query: str, top_k: int = 3) -> List[Dict]:
+    """
+    retriever.search() behind the retrieval cache.
+
+    Queries are keyed case- and whitespace-insensitively. Callers get their own
+    copy of the chunks, so mutating them never touches the cached entry.
+    """
+    key = (country, _RE_WHITESPACE.sub(' ', query.strip().lower()), top_k)
+    results = _retrieval_cache.get(key)
+    if results is None:
+        results = get_retriever(country).search(query, top_k=top_k)
+        # Empty results are not cached, so a freshly built index is used at once
+        if results:
+            _retrieval_cache.put(key, copy.deepcopy(results))
+        return results
+    return copy.deepcopy(results)
+
 
 @router.post("/", response_model=ChatResponse, status_code=status.HTTP_200_OK)
 async def chat(
@@ -31,223 +115,502 @@ async def chat(
     Main chat endpoint - Complete RAG pipeline with optional TTS.
 
     Flow:
-    1. Retrieve documents (FAISS)
-    2. Generate answer (Groq)
-    3. Convert to TTS (optional)
-    4. Save to DB
-    5. Return structured response
+    0. Translate the query to English and check the response cache
+    1-5. Shared RAG pipeline (see `_run_rag_pipeline`)
     """
     start_time = time.time()
 
     logger.info("📝 New chat request:")
-    logger.info(f"   Country: {request.country}")
-    logger.info(f"   Language: {request.user_language}")
-    logger.info(f"   Query: {request.query}")
-    logger.info(f"   Include audio: {getattr(request, 'include_audio', False)}")
-    logger.info(f"   Session: {request.session_id}")
-
+    logger.info("   Country: %s", request.country)
+    logger.info("   Language: %s", request.user_language)
+    logger.info("   Query: %s", request.query)
+    logger.info("   Include audio: %s", request.include_audio)
+    logger.info("   Session: %s", request.session_id)
+
+    country = request.country.value
+    translation_task = None
     try:
         # ------------------------------------------------------------
-        # STEP 0 — TRANSLATE QUERY TO ENGLISH (if needed)
+        # STEP 0 — TRANSLATE QUERY TO ENGLISH (if needed), started now
+        # so it overlaps the response-cache lookup below
         # ------------------------------------------------------------
         query_for_rag = request.query
-        original_query = request.query
-        
+        query_translated = True
+
         if request.user_language != 'en':
-            logger.info(f"🌍 Step 0: Translating query to English ({request.user_language} → en)...")
-            try:
-                translator = get_translator()
-                translation_result = translator.translate_query_to_english(
-                    query=request.query,
-                    user_language=request.user_language
-                )
-                
-                if translation_result.get('success'):
-                    query_for_rag = translation_result['text']
-                    logger.info(f"✅ Query translated: '{query_for_rag}'")
-                else:
-                    logger.warning(f"⚠️ Translation failed, using original query: {translation_result.get('error')}")
-                    
-            except Exception as e:
-                logger.warning(f"⚠️ Translation service error (non-critical): {e}")
-                query_for_rag = request.query
+            logger.info("🌍 Step 0: Translating query to English (%s → en)...", request.user_language)
+            translation_task = asyncio.create_task(
+                _translate_text(request.query, 'en', request.user_language)
+            )
         else:
             logger.info("ℹ️ Query already in English, skipping translation")
-        
+
         # ------------------------------------------------------------
-        # STEP 1 — DOCUMENT RETRIEVAL
+        # CACHE — REUSE THE RESPONSE OF AN IDENTICAL EARLIER QUERY
         # ------------------------------------------------------------
-        logger.info("📚 Step 1: Retrieving documents...")
-
         try:
-            retriever = get_retriever(request.country.value)
-            retrieved_chunks = retriever.search(query_for_rag, top_k=3)
+            cached = await asyncio.to_thread(
+                QueryLogCRUD.find_cached_response,
+                db,
+                query=request.query,
+                country=country,
+                user_language=request.user_language
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Response cache lookup failed (non-critical): {e}")
+            cached = None
+
+        if cached and request.include_audio and not _cached_audio_usable(cached, request.audio_inline):
+            # Audio missing, in the other form, or evicted from the TTS
+            # cache: re-synthesize it for the stored answer
+            audio_base64, audio_url, audio_format = await _synthesize_audio(
+                cached.get("answer", ""), country, request.user_language, request.audio_inline
+            )
+            if audio_base64 or audio_url:
+                cached = {**cached, "audio_base64": audio_base64, "audio_url": audio_url, "audio_format": audio_format}
+            else:
+                cached = None
 
-            if not retrieved_chunks:
-                logger.warning("⚠️ No relevant documents found")
-                return _create_no_results_response(request, db, start_time)
+        if cached:
+            logger.info("⚡ Serving cached response for repeated query")
+            return _create_cached_response(request, db, cached, start_time)
 
-            logger.info(f"✅ Retrieved {len(retrieved_chunks)} documents")
+        if translation_task is not None:
+            query_for_rag, query_translated = await translation_task
+            if query_for_rag != request.query:
+                logger.info("✅ Query translated: '%s'", query_for_rag)
 
-        except Exception as e:
-            logger.error(f"❌ Retrieval failed: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Document retrieval failed: {str(e)}"
-            )
+        # Answers built on an untranslated query are served but not reused
+        return await _run_rag_pipeline(request, query_for_rag, db, start_time, cacheable=query_translated)
 
-        # ------------------------------------------------------------
-        # STEP 2 — LLM ANSWER GENERATION
-        # ------------------------------------------------------------
-        logger.info("🤖 Step 2: Generating answer...")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Unexpected error: {e}")
+        raise HTTPException(500, f"Unexpected error: {str(e)}")
+    finally:
+        # No-op once awaited; drops the translation on cache hits and errors
+        if translation_task is not None:
+            translation_task.cancel()
 
-        try:
-            llm = get_llm_handler()
-            answer_dict = llm.generate_answer(
-                query=query_for_rag,
-                retrieved_chunks=retrieved_chunks,
-                country=request.country.value
-            )
 
-            if "error" in answer_dict:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"LLM Error: {answer_dict['error']}"
-                )
+@router.post("/stream", status_code=status.HTTP_200_OK)
+async def chat_stream(
+    request: ChatRequest,
+    db: Database = Depends(get_database)
+) -> StreamingResponse:
+    """
+    Streaming chat endpoint - Server-Sent Events.
 
-            logger.info("✅ Answer generated successfully")
+    Events:
+    - token: {"text": ...} pieces of the answer as the LLM writes them
+      (other languages get translated runs of whole sentences, each one
+      translated while the LLM carries on generating)
+    - done:  the complete ChatResponse
+    - error: {"detail": ...}
 
-        except Exception as e:
-            logger.error(f"❌ LLM generation failed: {e}")
-            raise HTTPException(500, f"Answer generation failed: {str(e)}")
+    Audio is not generated on this endpoint.
+    """
+    start_time = time.time()
 
-        # ------------------------------------------------------------
-        # STEP 3.5 — TRANSLATE ANSWER TO USER LANGUAGE (if needed)
-        # ------------------------------------------------------------
-        answer_text = answer_dict.get("answer", "No answer generated")
-        reasoning_text = answer_dict.get("reasoning", "No reasoning provided")
-        
-        if request.user_language != 'en':
-            logger.info(f"🌍 Step 3.5: Translating answer to user language (en → {request.user_language})...")
-            try:
-                translator = get_translator()
-                
-                # Translate answer
-                answer_translation = translator.translate_answer_to_user_language(
-                    answer=answer_text,
-                    user_language=request.user_language
-                )
-                
-                if answer_translation.get('success'):
-                    answer_text = answer_translation['text']
-                    logger.info(f"✅ Answer translated")
-                else:
-                    logger.warning(f"⚠️ Answer translation failed: {answer_translation.get('error')}")
-                
-                # Translate reasoning
-                reasoning_translation = translator.translate_answer_to_user_language(
-                    answer=reasoning_text,
-                    user_language=request.user_language
-                )
-                
-                if reasoning_translation.get('success'):
-                    reasoning_text = reasoning_translation['text']
-                    logger.info(f"✅ Reasoning translated")
-                else:
-                    logger.warning(f"⚠️ Reasoning translation failed: {reasoning_translation.get('error')}")
-                    
-            except Exception as e:
-                logger.warning(f"⚠️ Translation service error (non-critical): {e}")
-        else:
-            logger.info("ℹ️ Answer already in English, skipping translation")
-        
-        # ------------------------------------------------------------
-        # STEP 4 — OPTIONAL TEXT-TO-SPEECH (TTS)
-        # ------------------------------------------------------------
-        audio_base64 = None
-        audio_format = None
+    logger.info("📝 New streaming chat request:")
+    logger.info(f"   Country: {request.country}")
+    logger.info(f"   Language: {request.user_language}")
+    logger.info(f"   Query: {request.query}")
 
-        if getattr(request, "include_audio", False):
-            logger.info("🔊 Step 4: Converting answer to audio...")
-            try:
-                tts = get_tts_handler()
-                tts_result = tts.convert_answer_to_audio(
-                    answer_text=answer_text,
-                    country=request.country.value,
-                    include_reasoning=False,
-                    language=request.user_language
-                )
+    # Translation and retrieval happen before the stream opens, so their
+    # failures surface as normal HTTP errors
+    country = request.country.value
+    query_for_rag, query_translated = await _translate_text(request.query, 'en', request.user_language)
 
-                if "audio_base64" in tts_result:
-                    audio_base64 = tts_result["audio_base64"]
-                    audio_format = tts_result.get("format", "mp3")
-                    logger.info("✅ Audio generated successfully")
-                else:
-                    logger.warning(f"⚠️ Audio generation returned no audio: {tts_result}")
+    try:
+        retrieved_chunks = await asyncio.to_thread(_retrieve_cached, country, query_for_rag, 3)
+    except Exception as e:
+        logger.error(f"❌ Retrieval failed: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Document retrieval failed: {str(e)}"
+        )
 
-            except Exception as e:
-                logger.error(f"⚠️ TTS failed (non-critical): {e}")
+    async def events() -> AsyncIterator[str]:
+        if not retrieved_chunks:
+            logger.warning("⚠️ No relevant documents found")
+            response = _create_no_results_response(request, db, start_time)
+            yield _sse("done", response.model_dump_json())
+            return
+
+        translate_stream = request.user_language != 'en'
+        streamed = []      # answer text as generated (English)
+        translated = []    # translated pieces already sent
+        translation_ok = query_translated
+        pending = deque()  # translation tasks, in answer order
+        buffer = ""
+
+        answer_dict = None
+        try:
+            async for event in get_llm_handler().generate_answer_stream(
+                query=query_for_rag,
+                retrieved_chunks=retrieved_chunks,
+                country=country
+            ):
+                if event["type"] != "token":
+                    answer_dict = event["answer"]
+                    continue
+                if not translate_stream:
+                    yield _sse("token", json.dumps({"text": event["text"]}))
+                    continue
+
+                streamed.append(event["text"])
+                buffer += event["text"]
+                cut = _last_sentence_end(buffer)
+                if cut >= STREAM_TRANSLATE_MIN_CHARS:
+                    pending.append(asyncio.create_task(
+                        _translate_piece(buffer[:cut], request.user_language)
+                    ))
+                    buffer = buffer[cut:]
+                # Send finished translations without waiting on later ones
+                while pending and pending[0].done():
+                    text, ok = pending.popleft().result()
+                    translated.append(text)
+                    translation_ok = translation_ok and ok
+                    yield _sse("token", json.dumps({"text": text}))
+
+            if answer_dict is None or "error" in answer_dict:
+                error = answer_dict.get("error") if answer_dict else "no answer produced"
+                logger.error(f"❌ LLM generation failed: {error}")
+                yield _sse("error", json.dumps({"detail": f"Answer generation failed: {error}"}))
+                return
+
+            answer_text = answer_dict.get("answer", "No answer generated")
+            reasoning_text = answer_dict.get("reasoning", "No reasoning provided")
+
+            if translate_stream and streamed and "".join(streamed) == answer_text:
+                if buffer:
+                    pending.append(asyncio.create_task(
+                        _translate_piece(buffer, request.user_language)
+                    ))
+                reasoning_task = asyncio.create_task(
+                    _translate_text(reasoning_text, request.user_language, 'en')
+                )
+                while pending:
+                    text, ok = await pending.popleft()
+                    translated.append(text)
+                    translation_ok = translation_ok and ok
+                    yield _sse("token", json.dumps({"text": text}))
+                answer_text = "".join(translated)
+                reasoning_text, ok = await reasoning_task
+                translation_ok = translation_ok and ok
+            else:
+                # Cached answers arrive without tokens (and a malformed
+                # stream may not match the parsed answer): translate whole
+                (answer_text, reasoning_text), ok = await _translate_answer_parts(
+                    [answer_text, reasoning_text], request.user_language
+                )
+                translation_ok = translation_ok and ok
+        finally:
+            # Client disconnects and errors drop in-flight translations
+            for task in pending:
+                task.cancel()
 
-        # ------------------------------------------------------------
-        # STEP 5 — FORMAT SOURCES
-        # ------------------------------------------------------------
-        logger.info("📋 Step 5: Formatting sources...")
         sources = _format_sources(retrieved_chunks, answer_dict.get("sources", []))
-
-        # ------------------------------------------------------------
-        # STEP 6 — BUILD RESPONSE
-        # ------------------------------------------------------------
         processing_time = (time.time() - start_time) * 1000
 
         response_data = {
             "answer": answer_text,
             "reasoning": reasoning_text,
             "sources": sources,
-            "country": request.country.value,
+            "country": country,
             "user_language": request.user_language,
-            "timestamp": datetime.utcnow(),
+            "timestamp": datetime.now(timezone.utc),
             "confidence_score": _map_confidence_to_score(answer_dict.get("confidence", "medium")),
-            "audio_base64": audio_base64,
-            "audio_format": audio_format
+            "audio_base64": None,
+            "audio_format": None
         }
 
-        # ------------------------------------------------------------
-        # STEP 7 — SAVE TO DATABASE
-        # ------------------------------------------------------------
-        logger.info("💾 Step 6: Saving to database...")
-
-        # convert Pydantic objects to dicts for storage if necessary
-        response_data["sources"] = [
-            s.model_dump() if hasattr(s, "model_dump") else s
-            for s in response_data["sources"]
-        ]
-
         try:
-            query_id = QueryLogCRUD.create_query_log(
+            response_data["query_id"] = QueryLogCRUD.create_query_log(
                 db=db,
                 session_id=request.session_id,
-                country=request.country.value,
+                country=country,
                 user_language=request.user_language,
-                query=original_query,
+                query=request.query,
                 response=response_data,
-                processing_time_ms=processing_time
+                processing_time_ms=processing_time,
+                cacheable=translation_ok
             )
-            response_data["query_id"] = query_id
-            logger.info(f"✅ Saved to database with ID: {query_id}")
-
         except Exception as e:
             logger.error(f"⚠️ DB save failed: {e}")
             response_data["query_id"] = "unsaved"
 
-        # ------------------------------------------------------------
-        # STEP 8 — RETURN RESPONSE
-        # ------------------------------------------------------------
-        logger.info(f"✅ Request completed in {processing_time:.0f}ms")
-        return ChatResponse(**response_data)
+        logger.info(f"✅ Streaming request completed in {processing_time:.0f}ms")
+        yield _sse("done", ChatResponse(**response_data).model_dump_json())
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _last_sentence_end(text: str) -> int:
+    """Index just past the last sentence end (punctuation + whitespace) in text, or 0."""
+    end = 0
+    for match in _RE_SENTENCE_END.finditer(text):
+        end = match.end()
+    return end
+
+
+async def _translate_piece(text: str, user_language: str) -> Tuple[str, bool]:
+    """Translate one streamed piece of the answer, keeping its trailing whitespace."""
+    body = text.rstrip()
+    translated, ok = await _translate_text(body, user_language, 'en')
+    return translated + text[len(body):], ok
+
+
+def _sse(event: str, data: str) -> str:
+    """Format one Server-Sent Event (`data` must be a single line)."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def _translate_text(text: str, target_language: str, source_language: str) -> Tuple[str, bool]:
+    """
+    Translate between English and the user's language.
+
+    Returns:
+        (text, succeeded) - the original text when translation failed
+    """
+    if target_language == source_language:
+        return text, True
+
+    try:
+        translator = get_translator()
+        if target_language == 'en':
+            result = await translator.translate_query_to_english(query=text, user_language=source_language)
+        else:
+            result = await translator.translate_answer_to_user_language(answer=text, user_language=target_language)
+
+        if result.get('success'):
+            return result['text'], True
+        logger.warning(f"⚠️ Translation failed, using original text: {result.get('error')}")
 
     except Exception as e:
-        logger.error(f"❌ Unexpected error: {e}")
-        raise HTTPException(500, f"Unexpected error: {str(e)}")
+        logger.warning(f"⚠️ Translation service error (non-critical): {e}")
+
+    return text, False
+
+
+async def _translate_answer_parts(texts: List[str], user_language: str) -> Tuple[List[str], bool]:
+    """
+    Translate English answer parts in one request, keeping any part that fails.
+
+    Returns:
+        (texts, all parts succeeded)
+    """
+    if user_language == 'en':
+        return texts, True
+
+    try:
+        results = await get_translator().translate_answer_to_user_language(answer=texts, user_language=user_language)
+        translated, ok = [], True
+        for text, result in zip(texts, results):
+            if result.get('success'):
+                translated.append(result['text'])
+            else:
+                logger.warning(f"⚠️ Translation failed, using original text: {result.get('error')}")
+                translated.append(text)
+                ok = False
+        return translated, ok
+
+    except Exception as e:
+        logger.warning(f"⚠️ Translation service error (non-critical): {e}")
+
+    return texts, False
+
+
+async def _run_rag_pipeline(
+    request: ChatRequest,
+    query_for_rag: str,
+    db: Database,
+    start_time: float,
+    reasoning_prefix: str = "",
+    cacheable: bool = True
+) -> ChatResponse:
+    """
+    Steps shared by the text and voice endpoints, once the English query is ready.
+
+    Flow:
+    1. Retrieve documents (FAISS)
+    2. Generate answer (Groq)
+    3. Translate answer + reasoning to the user's language
+    4. Convert to TTS (optional)
+    5. Save to DB and build the response
+
+    `reasoning_prefix` is prepended to the reasoning (the voice endpoint uses it
+    to echo the transcription); `request.query` is what gets logged to the DB.
+    The answer is offered to the response cache only if `cacheable` and every
+    translation succeeded.
+    """
+    country = request.country.value
+    user_language = request.user_language
+
+    # ------------------------------------------------------------
+    # STEP 1 — DOCUMENT RETRIEVAL
+    # ------------------------------------------------------------
+    logger.info("📚 Step 1: Retrieving documents...")
+
+    try:
+        retrieved_chunks = await asyncio.to_thread(_retrieve_cached, country, query_for_rag, 3)
+    except Exception as e:
+        logger.error("❌ Retrieval failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Document retrieval failed: {str(e)}"
+        )
+
+    if not retrieved_chunks:
+        logger.warning("⚠️ No relevant documents found")
+        response = _create_no_results_response(request, db, start_time)
+        response.reasoning = reasoning_prefix + response.reasoning
+        return response
+
+    logger.info("✅ Retrieved %d documents", len(retrieved_chunks))
+
+    # ------------------------------------------------------------
+    # STEP 2 — LLM ANSWER GENERATION
+    # ------------------------------------------------------------
+    logger.info("🤖 Step 2: Generating answer...")
+
+    try:
+        answer_dict = await get_llm_handler().generate_answer(
+            query=query_for_rag,
+            retrieved_chunks=retrieved_chunks,
+            country=country
+        )
+    except Exception as e:
+        logger.error("❌ LLM generation failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Answer generation failed: {str(e)}"
+        )
+
+    if "error" in answer_dict:
+        logger.error("❌ LLM generation failed: %s", answer_dict["error"])
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Answer generation failed: {answer_dict['error']}"
+        )
+
+    logger.info("✅ Answer generated successfully")
+
+    # ------------------------------------------------------------
+    # STEP 3 — TRANSLATE ANSWER TO USER LANGUAGE (if needed)
+    # ------------------------------------------------------------
+    if user_language != 'en':
+        logger.info("🌍 Step 3: Translating answer to user language (en → %s)...", user_language)
+    (answer_text, reasoning_text), translated = await _translate_answer_parts(
+        [answer_dict.get("answer", "No answer generated"),
+         answer_dict.get("reasoning", "No reasoning provided")],
+        user_language
+    )
+
+    # ------------------------------------------------------------
+    # STEP 4 — OPTIONAL TEXT-TO-SPEECH (TTS)
+    # ------------------------------------------------------------
+    audio_base64 = audio_url = audio_format = None
+
+    if request.include_audio:
+        logger.info("🔊 Step 4: Converting answer to audio...")
+        audio_base64, audio_url, audio_format = await _synthesize_audio(
+            answer_text, country, user_language, request.audio_inline
+        )
+
+    # ------------------------------------------------------------
+    # STEP 5 — BUILD RESPONSE AND SAVE TO DATABASE
+    # ------------------------------------------------------------
+    sources = _format_sources(retrieved_chunks, answer_dict.get("sources", []))
+    processing_time = (time.time() - start_time) * 1000
+
+    response_data = {
+        "answer": answer_text,
+        "reasoning": reasoning_prefix + reasoning_text,
+        "sources": sources,
+        "country": country,
+        "user_language": user_language,
+        "timestamp": datetime.now(timezone.utc),
+        "confidence_score": _map_confidence_to_score(answer_dict.get("confidence", "medium")),
+        "audio_base64": audio_base64,
+        "audio_url": audio_url,
+        "audio_format": audio_format
+    }
+
+    logger.info("💾 Step 5: Saving to database...")
+    try:
+        response_data["query_id"] = QueryLogCRUD.create_query_log(
+            db=db,
+            session_id=request.session_id,
+            country=country,
+            user_language=user_language,
+            query=request.query,
+            response=response_data,
+            processing_time_ms=processing_time,
+            cacheable=cacheable and translated
+        )
+        logger.info("✅ Saved to database with ID: %s", response_data["query_id"])
+    except Exception as e:
+        logger.error("⚠️ DB save failed: %s", e)
+        response_data["query_id"] = "unsaved"
+
+    logger.info("✅ Request completed in %.0fms", processing_time)
+    return ChatResponse(**response_data)
+
+
+AUDIO_URL_PREFIX = f"{settings.API_V1_PREFIX}/chat/audio/"
+
+
+async def _synthesize_audio(
+    answer_text: str,
+    country: str,
+    user_language: str,
+    inline: bool
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Text-to-speech for an answer (non-critical: failures give no audio).
+
+    By default the response only links to the audio file, which the client
+    streams from /audio/{audio_id}; `inline` embeds it as base64 instead.
+
+    Returns:
+        (audio_base64, audio_url, audio_format)
+    """
+    try:
+        tts_result = await get_tts_handler().aconvert_answer_to_audio(
+            answer_text=answer_text,
+            country=country,
+            include_reasoning=False,
+            language=user_language,
+            return_format='base64' if inline else 'path'
+        )
+    except Exception as e:
+        logger.error("⚠️ TTS failed (non-critical): %s", e)
+        return None, None, None
+
+    if not (tts_result.get("audio_base64") or tts_result.get("audio_id")):
+        logger.warning("⚠️ Audio generation returned no audio: %s", tts_result)
+        return None, None, None
+
+    logger.info("✅ Audio generated successfully")
+    audio_url = AUDIO_URL_PREFIX + tts_result["audio_id"] if tts_result.get("audio_id") else None
+    return tts_result.get("audio_base64"), audio_url, tts_result.get("format", "mp3")
+
+
+def _cached_audio_usable(cached: Dict[str, Any], inline: bool) -> bool:
+    """Whether a stored response has audio in the requested form that can still be served."""
+    if inline:
+        return bool(cached.get("audio_base64"))
+    audio_url = cached.get("audio_url")
+    # The TTS cache evicts files, so the stored URL may point at nothing
+    return bool(audio_url) and audio_url.startswith(AUDIO_URL_PREFIX) and \
+        get_tts_handler().get_cached_audio_path(audio_url[len(AUDIO_URL_PREFIX):]) is not None
 
 
 # ------------------------------------------------------------------
@@ -260,6 +623,7 @@ async def chat_voice(
     user_language: str = Form("en", description="User's preferred language (ISO 639-1 code)"),
     session_id: Optional[str] = Form(None, description="Session ID for tracking"),
     include_audio: bool = Form(False, description="Include TTS audio in response"),
+    audio_inline: bool = Form(False, description="Embed the audio as base64 instead of an audio_url"),
     db: Database = Depends(get_database)
 ) -> ChatResponse:
     """
@@ -282,15 +646,24 @@ async def chat_voice(
     Returns:
         ChatResponse with transcription and answer
     """
-    from backend.core.speech_to_text import get_stt_handler
-
     start_time = time.time()
+    # Same normalization ChatRequest applies, for the checks made before it exists
+    user_language = normalize_language_code(user_language) or 'en'
 
-    logger.info(f"🎤 New voice chat request:")
-    logger.info(f"   File: {audio_file.filename}")
-    logger.info(f"   Country: {country}")
-    logger.info(f"   Language: {user_language}")
-    logger.info(f"   Include audio response: {include_audio}")
+    logger.info("🎤 New voice chat request:")
+    logger.info("   File: %s", audio_file.filename)
+    logger.info("   Country: %s", country)
+    logger.info("   Language: %s", user_language)
+    logger.info("   Include audio response: %s", include_audio)
+
+    # Reject unknown countries before paying for a transcription
+    try:
+        country_enum = CountryEnum(country)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid country code: {country}"
+        )
 
     try:
         # Step 1: Transcribe audio to text
@@ -300,7 +673,7 @@ async def chat_voice(
             stt_handler = get_stt_handler()
 
             # Transcribe with user language hint (if provided), falling back to country hints
-            transcription_result = stt_handler.transcribe_with_fallback(
+            transcription_result = await stt_handler.transcribe_with_fallback(
                 audio_file,
                 country=country,
                 user_language=user_language
@@ -340,7 +713,7 @@ async def chat_voice(
         # Step 2: If necessary, detect language of the transcription and translate to English for RAG
         try:
             translator = get_translator()
-            detection = translator.detect_language(query_text)
+            detection = await translator.detect_language(query_text)
             detected_lang = detection.get('language', 'en')
             logger.info(f"🎤 Detected transcription language: {detected_lang} (confidence: {detection.get('confidence')})")
         except Exception as e:
@@ -352,7 +725,7 @@ async def chat_voice(
         if detected_lang and detected_lang != 'en':
             logger.info(f"🌍 Translating transcribed query to English for retrieval ({detected_lang} → en)...")
             try:
-                trans_to_en = translator.translate_query_to_english(query=query_text, user_language=detected_lang)
+                trans_to_en = await translator.translate_query_to_english(query=query_text, user_language=detected_lang)
                 if trans_to_en.get('success'):
                     query_for_rag = trans_to_en['text']
                     logger.info(f"✅ Translated transcribed query for RAG: '{query_for_rag}'")
@@ -363,14 +736,13 @@ async def chat_voice(
 
         # Step 3: Create ChatRequest from transcribed text
         try:
-            from backend.core.schemas import CountryEnum
-
             chat_request = ChatRequest(
-                country=CountryEnum(country),
+                country=country_enum,
                 query=query_text,
                 user_language=user_language,
                 session_id=session_id,
-                include_audio=include_audio
+                include_audio=include_audio,
+                audio_inline=audio_inline
             )
 
         except ValueError as e:
@@ -379,10 +751,7 @@ async def chat_voice(
                 detail=f"Invalid country code: {country}"
             )
 
-        # Step 3-7: Process through normal RAG pipeline
-        # (Reuse the logic from the text chat endpoint)
-
-        logger.info("📚 Step 2: Retrieving documents...")
+        # Step 4+: Process through the shared RAG pipeline
 
         # Ensure query_for_rag is set. Prefer the detected-language translation if available.
         if not query_for_rag:
@@ -394,7 +763,7 @@ async def chat_voice(
             logger.info(f"🌍 Translating query to English ({user_language} → en)...")
             try:
                 translator = get_translator()
-                translation_result = translator.translate_query_to_english(
+                translation_result = await translator.translate_query_to_english(
                     query=chat_request.query,
                     user_language=user_language
                 )
@@ -406,159 +775,19 @@ async def chat_voice(
             except Exception as e:
                 logger.warning(f"⚠️ Translation error: {e}")
 
-        try:
-            retriever = get_retriever(chat_request.country.value)
-            retrieved_chunks = retriever.search(query_for_rag, top_k=3)
-
-            if not retrieved_chunks:
-                logger.warning("⚠️ No relevant documents found")
-                response = _create_no_results_response(chat_request, db, start_time)
-                # Add transcription info
-                # Prepend voice transcription to reasoning then return
-                response.reasoning = f"[Voice Query: '{query_text}'] " + response.reasoning
-                return response
-
-            logger.info(f"✅ Retrieved {len(retrieved_chunks)} documents")
-
-        except Exception as e:
-            logger.error(f"❌ Retrieval failed: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Document retrieval failed: {str(e)}"
-            )
-
-        logger.info("🤖 Step 3: Generating answer...")
-
-        try:
-            llm_handler = get_llm_handler()
-            answer_dict = llm_handler.generate_answer(
-                query=query_for_rag,
-                retrieved_chunks=retrieved_chunks,
-                country=chat_request.country.value
-            )
-
-            if 'error' in answer_dict:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Answer generation failed: {answer_dict['error']}"
-                )
-
-            logger.info("✅ Answer generated successfully")
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"❌ LLM generation failed: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Answer generation failed: {str(e)}"
-            )
-
-        # Step 4: Convert to audio if requested
-        audio_base64 = None
-        audio_format = None
-        
-        # Translate answer to user language if needed
-        answer_text = answer_dict.get('answer', 'No answer generated')
-        reasoning_text = answer_dict.get('reasoning', 'No reasoning provided')
-        
-        if user_language != 'en':
-            logger.info(f"🌍 Translating answer to user language (en → {user_language})...")
-            try:
-                translator = get_translator()
-                
-                answer_translation = translator.translate_answer_to_user_language(
-                    answer=answer_text,
-                    user_language=user_language
-                )
-                if answer_translation.get('success'):
-                    answer_text = answer_translation['text']
-                    logger.info(f"✅ Answer translated")
-                else:
-                    logger.warning(f"⚠️ Answer translation failed: {answer_translation.get('error')}")
-                
-                reasoning_translation = translator.translate_answer_to_user_language(
-                    answer=reasoning_text,
-                    user_language=user_language
-                )
-                if reasoning_translation.get('success'):
-                    reasoning_text = reasoning_translation['text']
-                    logger.info(f"✅ Reasoning translated")
-                else:
-                    logger.warning(f"⚠️ Reasoning translation failed")
-            except Exception as e:
-                logger.warning(f"⚠️ Translation error: {e}")
-
-        if include_audio:
-            logger.info("🔊 Step 5: Converting answer to audio (TTS)...")
-
-            try:
-                from backend.core.text_to_speech import get_tts_handler
-
-                tts_handler = get_tts_handler()
-                audio_result = tts_handler.convert_answer_to_audio(
-                    answer_text=answer_text,
-                    country=chat_request.country.value,
-                    include_reasoning=False,
-                    language=user_language
-                )
-
-                if 'audio_base64' in audio_result:
-                    audio_base64 = audio_result['audio_base64']
-                    audio_format = audio_result.get('format', 'mp3')
-                    logger.info(f"✅ Audio generated")
-
-            except Exception as e:
-                logger.error(f"⚠️ TTS failed (non-critical): {e}")
-
-        # Step 5: Format response
-        sources = _format_sources(retrieved_chunks, answer_dict.get('sources', []))
-        processing_time = (time.time() - start_time) * 1000
-
-        response_data = {
-            'answer': answer_text,
-            'reasoning': f"[Voice Query Transcription: '{query_text}']\n\n" + reasoning_text,
-            'sources': sources,
-            'country': chat_request.country.value,
-            'user_language': user_language,
-            'timestamp': datetime.utcnow(),
-            'confidence_score': _map_confidence_to_score(answer_dict.get('confidence', 'medium')),
-            'audio_base64': audio_base64,
-            'audio_format': audio_format
-        }
-
-        # Step 6: Save to database
-        logger.info("💾 Step 6: Saving to database...")
-
-        # convert Pydantic objects to dicts for storage if necessary
-        response_data["sources"] = [
-            s.model_dump() if hasattr(s, "model_dump") else s
-            for s in response_data["sources"]
-        ]
-
-        try:
-            query_id = QueryLogCRUD.create_query_log(
-                db=db,
-                session_id=session_id,
-                country=chat_request.country.value,
-                user_language=user_language,
-                query=query_text,  # Save transcribed text
-                response=response_data,
-                processing_time_ms=processing_time
-            )
-
-            response_data['query_id'] = query_id
-            logger.info(f"✅ Saved to database with ID: {query_id}")
-
-        except Exception as e:
-            logger.error(f"⚠️ Database save failed: {e}")
-            response_data['query_id'] = "unsaved"
-
-        logger.info(f"✅ Voice request completed in {processing_time:.0f}ms")
-        logger.info(f"   Transcribed: '{query_text}'")
-        logger.info(f"   Audio response: {'Yes' if audio_base64 else 'No'}")
+        response = await _run_rag_pipeline(
+            chat_request,
+            query_for_rag,
+            db,
+            start_time,
+            reasoning_prefix=f"[Voice Query Transcription: '{query_text}']\n\n",
+            # The transcription marker makes it unfit to answer text queries
+            cacheable=False
+        )
 
-        return ChatResponse(**response_data)
+        logger.info("   Transcribed: '%s'", query_text)
+        logger.info("   Audio response: %s", 'Yes' if (response.audio_base64 or response.audio_url) else 'No')
+        return response
 
     except HTTPException:
         raise
@@ -574,23 +803,26 @@ async def chat_voice(
 # Helper Functions
 # ------------------------------------------------------------------
 def _format_sources(retrieved_chunks: list, llm_sources: list) -> list:
-    """Convert FAISS chunks → SourceDocument list."""
-    sources, seen = [], set()
+    """
+    Convert FAISS chunks → SourceDocument-shaped dicts, one per title.
 
+    Plain dicts go straight into the query log, and ChatResponse validates
+    them once when the response is built.
+    """
+    by_title = {}
     for chunk in retrieved_chunks[:3]:
-        title = chunk.get("title", "Unknown")
-        if title not in seen:
-            sources.append(
-                SourceDocument(
-                    title=title,
-                    section=chunk.get("section"),
-                    url=chunk.get("source_url"),
-                    relevance_score=chunk.get("similarity_score")
-                )
-            )
-            seen.add(title)
-
-    return sources
+        # Chunks arrive best-first, so the first chunk of a title wins
+        by_title.setdefault(chunk.get("title", "Unknown"), chunk)
+
+    return [
+        {
+            "title": title,
+            "section": chunk.get("section"),
+            "url": chunk.get("source_url"),
+            "relevance_score": chunk.get("similarity_score")
+        }
+        for title, chunk in by_title.items()
+    ]
 
 
 def _map_confidence_to_score(confidence: str) -> float:
@@ -598,6 +830,44 @@ def _map_confidence_to_score(confidence: str) -> float:
     return mapping.get(confidence.lower(), 0.7)
 
 
+def _create_cached_response(
+    request: ChatRequest,
+    db: Database,
+    cached: Dict[str, Any],
+    start: float
+) -> ChatResponse:
+    """Answer from a previously stored response (logged as a new query)."""
+    processing_time = (time.time() - start) * 1000
+
+    response = {
+        "answer": cached.get("answer", ""),
+        "reasoning": cached.get("reasoning", ""),
+        "sources": cached.get("sources", []),
+        "country": request.country.value,
+        "user_language": request.user_language,
+        "timestamp": datetime.now(timezone.utc),
+        "confidence_score": cached.get("confidence_score"),
+        "audio_base64": cached.get("audio_base64") if request.include_audio and request.audio_inline else None,
+        "audio_url": cached.get("audio_url") if request.include_audio and not request.audio_inline else None,
+        "audio_format": cached.get("audio_format") if request.include_audio else None
+    }
+
+    try:
+        response["query_id"] = QueryLogCRUD.create_query_log(
+            db=db,
+            session_id=request.session_id,
+            country=request.country.value,
+            user_language=request.user_language,
+            query=request.query,
+            response=response,
+            processing_time_ms=processing_time
+        )
+    except Exception:
+        response["query_id"] = "unsaved"
+
+    return ChatResponse(**response)
+
+
 def _create_no_results_response(request: ChatRequest, db: Database, start: float) -> ChatResponse:
     """Handle case where FAISS returns no documents."""
     processing_time = (time.time() - start) * 1000
@@ -608,7 +878,7 @@ def _create_no_results_response(request: ChatRequest, db: Database, start: float
         "sources": [],
         "country": request.country.value,
         "user_language": request.user_language,
-        "timestamp": datetime.utcnow(),
+        "timestamp": datetime.now(timezone.utc),
         "confidence_score": 0.0,
         "audio_base64": None,
         "audio_format": None
@@ -632,6 +902,8 @@ def _create_no_results_response(request: ChatRequest, db: Database, start: float
 
 @router.get("/health")
 async def health_check():
+    translator_cache = get_translator().cache_info()
+    logger.info(f"🌍 Translator cache: {translator_cache}")
     return {
         "service": "chat",
         "status": "healthy",
@@ -640,5 +912,50 @@ async def health_check():
             "llm": "ready",
             "tts": "ready",   # ← NEW
             "database": "ready"
-        }
+        },
+        "translator_cache": translator_cache,
+        "retrieval_cache": _retrieval_cache.cache_info()
     }
+
+
+@router.get("/audio/{audio_id}")
+async def get_audio(audio_id: str):
+    """Stream a generated answer's audio (the `audio_url` of a chat response)."""
+    audio_path = get_tts_handler().get_cached_audio_path(audio_id)
+    try:
+        if audio_path is None:
+            raise FileNotFoundError(audio_id)
+        # Opened here, so a file evicted since the index check is a 404
+        # rather than an error mid-response
+        audio_file = await asyncio.to_thread(open, audio_path, 'rb')
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Audio not found or expired")
+
+    # File names are content hashes, so a given URL always has the same audio
+    return StreamingResponse(
+        _read_chunks(audio_file),
+        media_type="audio/mpeg",
+        headers={
+            "Cache-Control": "public, max-age=86400, immutable",
+            "Content-Length": str(os.fstat(audio_file.fileno()).st_size)
+        }
+    )
+
+
+def _read_chunks(f, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield a file's bytes in chunks, closing it at the end (runs in the threadpool)."""
+    with f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+@router.post("/cache/clear")
+async def clear_caches(db: Database = Depends(get_database)):
+    """Drop cached retrieval results and stored responses (e.g. after rebuilding an index)."""
+    cleared = _retrieval_cache.clear()
+    responses = await asyncio.to_thread(QueryLogCRUD.clear_response_cache, db)
+    logger.info(f"🧹 Cleared {cleared} cached retrieval results and {responses} cached responses")
+    return {"cleared": cleared, "responses_cleared": responses}
@@ -75,13 +75,13 @@ async def submit_feedback(
         logger.info(f"✅ Feedback saved with ID: {feedback_id}")
         
         # Step 4: Return response
-        from datetime import datetime
+        from datetime import datetime, timezone
         return FeedbackResponse(
             id=feedback_id,
             query_id=feedback.query_id,
             rating=feedback.rating,
             comment=feedback.comment,
-            created_at=datetime.utcnow()
+            created_at=datetime.now(timezone.utc)
         )
         
     except HTTPException:
@@ -0,0 +1,23 @@
+"""
+Compile the document chunker to a C extension with mypyc.
+
+Run this from the project root (requires `pip install mypy`):
+    python backend/scripts/compile_chunker.py
+
+Python picks up the compiled module (backend/core/chunker.*.so)
+automatically. Delete the .so file to go back to the pure-Python version.
+"""
+import subprocess
+import sys
+
+
+def main():
+    subprocess.run(
+        [sys.executable, "-m", "mypyc", "backend/core/chunker.py"],
+        check=True
+    )
+    print("✅ backend/core/chunker.py compiled with mypyc")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,12 +15,13 @@ from backend.core.llm_handler import get_llm_handler
 from backend.core.retriever import get_retriever
 import logging
 import json
+import asyncio
 
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
 
-def test_llm_with_retrieval(country: str, query: str):
+async def test_llm_with_retrieval(country: str, query: str):
     """
     Test complete RAG flow: Retrieval + LLM Generation.
     
@@ -48,7 +49,7 @@ def test_llm_with_retrieval(country: str, query: str):
     logger.info(f"\n🤖 Step 2: Generating answer with Groq LLM...")
     llm_handler = get_llm_handler()
     
-    answer_dict = llm_handler.generate_answer(
+    answer_dict = await llm_handler.generate_answer(
         query=query,
         retrieved_chunks=retrieved_chunks,
         country=country
@@ -94,7 +95,7 @@ def test_llm_with_retrieval(country: str, query: str):
     return answer_dict
 
 
-def main():
+async def main():
     """Run comprehensive LLM tests."""
     
     test_cases = [
@@ -142,7 +143,7 @@ def main():
         logger.info(f"{'='*70}")
         
         try:
-            result = test_llm_with_retrieval(
+            result = await test_llm_with_retrieval(
                 country=test_case['country'],
                 query=test_case['query']
             )
@@ -177,4 +178,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -12,6 +12,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.core.speech_to_text import get_stt_handler
+import asyncio
 import logging
 from typing import Optional
 
@@ -64,7 +65,7 @@ def create_sample_audio():
 # ============================================================
 # TEST 1 — Basic Transcription
 # ============================================================
-def test_basic_transcription():
+async def test_basic_transcription():
     logger.info(f"\n{'='*70}")
     logger.info("TEST 1: Basic Audio Transcription")
     logger.info(f"{'='*70}\n")
@@ -75,7 +76,7 @@ def test_basic_transcription():
         stt_handler = get_stt_handler()
 
         logger.info("Transcribing audio...")
-        result = stt_handler.transcribe_audio(audio_path, language='en')
+        result = await stt_handler.transcribe_audio(audio_path, language='en')
 
         if result['success']:
             logger.info(f"\n✅ Transcription successful!")
@@ -117,7 +118,7 @@ def test_format_validation():
 # ============================================================
 # TEST 3 — Country-Specific Transcription
 # ============================================================
-def test_country_specific():
+async def test_country_specific():
     logger.info(f"\n{'='*70}")
     logger.info("TEST 3: Country-Specific Transcription")
     logger.info(f"{'='*70}\n")
@@ -146,7 +147,7 @@ def test_country_specific():
         gTTS(text=tc['text'], lang='en').save(path)
 
         try:
-            result = stt_handler.transcribe_with_fallback(path, country=tc['country'])
+            result = await stt_handler.transcribe_with_fallback(path, country=tc['country'])
 
             if result['success']:
                 logger.info("✅ Success!")
@@ -173,7 +174,7 @@ def _calculate_similarity(a: str, b: str) -> float:
 # ============================================================
 # TEST 4 — Error Handling
 # ============================================================
-def test_error_handling():
+async def test_error_handling():
     logger.info(f"\n{'='*70}")
     logger.info("TEST 4: Error Handling")
     logger.info(f"{'='*70}\n")
@@ -182,7 +183,7 @@ def test_error_handling():
 
     # Non-existent file
     logger.info("Test 4.1: Non-existent file")
-    result = stt_handler.transcribe_audio("no_file.mp3")
+    result = await stt_handler.transcribe_audio("no_file.mp3")
     logger.info(f"   {'✅ Correct' if not result['success'] else '⚠️ Incorrect'}\n")
 
     # Invalid format
@@ -191,7 +192,7 @@ def test_error_handling():
     bad.write("NOT AUDIO")
     bad.close()
 
-    result = stt_handler.transcribe_audio(bad.name)
+    result = await stt_handler.transcribe_audio(bad.name)
     logger.info(f"   {'✅ Correct' if not result['success'] else '⚠️ Incorrect'}\n")
 
     _safe_delete(bad.name)
@@ -200,17 +201,17 @@ def test_error_handling():
 # ============================================================
 # MAIN
 # ============================================================
-def main():
+async def main():
     logger.info(f"\n{'#'*70}")
     logger.info("# Speech-to-Text (STT) Test Suite")
     logger.info("# Using Groq Whisper (FAST + FREE)")
     logger.info(f"{'#'*70}\n")
 
     try:
-        test_basic_transcription()
+        await test_basic_transcription()
         test_format_validation()
-        test_country_specific()
-        test_error_handling()
+        await test_country_specific()
+        await test_error_handling()
 
         logger.info("\n🎉 ALL TESTS PASSED!")
         logger.info("STT is fully working.\n")
@@ -220,4 +221,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
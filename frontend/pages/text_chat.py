@@ -99,11 +99,9 @@ def show():
                                 st.markdown(f"[View Document]({source['url']})")
                 
                 # Audio response
-                if response.get('audio_base64'):
+                if response.get('audio_base64') or response.get('audio_url'):
                     st.markdown("🔊 **Audio Response:**")
-                    audio_bytes = st.session_state.api_client.decode_audio(
-                        response['audio_base64']
-                    )
+                    audio_bytes = st.session_state.api_client.get_audio(response)
                     st.audio(audio_bytes, format='audio/mp3')
                 
                 # Feedback
@@ -194,8 +194,8 @@ def show():
                             </div>
                         """, unsafe_allow_html=True)
 
-            if response.get('audio_base64'):
-                audio_bytes = st.session_state.api_client.decode_audio(response['audio_base64'])
+            if response.get('audio_base64') or response.get('audio_url'):
+                audio_bytes = st.session_state.api_client.get_audio(response)
                 st.audio(audio_bytes, format="audio/mp3")
 
             st.markdown("<br>", unsafe_allow_html=True)
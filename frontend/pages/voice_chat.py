@@ -86,14 +86,12 @@ def show():
                                 """)
                     
                     # Audio response
-                    if response.get('audio_base64'):
+                    if response.get('audio_base64') or response.get('audio_url'):
                         st.markdown("---")
                         st.markdown("### 🔊 Audio Response")
                         st.markdown("**AI speaks:**")
                         
-                        audio_bytes = st.session_state.api_client.decode_audio(
-                            response['audio_base64']
-                        )
+                        audio_bytes = st.session_state.api_client.get_audio(response)
                         
                         # Auto-play audio
                         st.audio(audio_bytes, format='audio/mp3', autoplay=True)
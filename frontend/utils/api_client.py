@@ -11,6 +11,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Answer audio files kept in memory per client
+AUDIO_CACHE_SIZE = 32
+
 
 class LexiVoiceAPI:
     """
@@ -32,6 +35,9 @@ class LexiVoiceAPI:
         """
         self.base_url = base_url
         self.api_v1 = f"{base_url}/api/v1"
+        # Downloaded answer audio by URL (Streamlit re-renders the chat
+        # history on every interaction; audio URLs never change content)
+        self._audio_cache: Dict[str, bytes] = {}
         
     def health_check(self) -> Dict:
         """
@@ -209,4 +215,32 @@ class LexiVoiceAPI:
             return base64.b64decode(audio_base64)
         except Exception as e:
             logger.error(f"Audio decoding failed: {e}")
+            return b""
+    
+    def get_audio(self, response: Dict) -> bytes:
+        """
+        Get the audio of a chat response.
+        
+        Args:
+            response: Chat response with `audio_base64` or `audio_url`
+            
+        Returns:
+            Audio bytes (empty if the response has no audio)
+        """
+        if response.get('audio_base64'):
+            return self.decode_audio(response['audio_base64'])
+        audio_url = response.get('audio_url')
+        if not audio_url:
+            return b""
+        if audio_url in self._audio_cache:
+            return self._audio_cache[audio_url]
+        try:
+            audio = requests.get(f"{self.base_url}{audio_url}", timeout=30)
+            audio.raise_for_status()
+            if len(self._audio_cache) >= AUDIO_CACHE_SIZE:
+                self._audio_cache.pop(next(iter(self._audio_cache)))
+            self._audio_cache[audio_url] = audio.content
+            return audio.content
+        except Exception as e:
+            logger.error(f"Audio download failed: {e}")
             return b""
\ No newline at end of file